@@ -2,6 +2,8 @@
 import sqlite3
 import json
 import os
+import result_key_index
+import entity_cache
 
 def apply_club_aliases(db_file="gym_data.db", confirmed_json="club_aliases.json", potential_json="potential_club_aliases.json"):
     """
@@ -81,6 +83,12 @@ def apply_club_aliases(db_file="gym_data.db", confirmed_json="club_aliases.json"
     conn.commit()
     conn.close()
     print(f"Applied {aliases_applied} aliases to DB and merged {records_merged} club records.")
+    if aliases_applied or records_merged:
+        # Cached name -> id mappings may now point at merged or re-aliased rows
+        entity_cache.invalidate_snapshot(db_file)
+    if records_merged:
+        # Results were re-pointed to other athlete_ids; the loader's key snapshot is stale
+        result_key_index.invalidate_snapshot(db_file)
 
 if __name__ == "__main__":
     apply_club_aliases()
@@ -0,0 +1,206 @@
+# benchmark_loader.py
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+
+import synthetic_corpus
+import result_key_index
+import entity_cache
+import load_orchestrator
+import extraction_library
+from load_orchestrator import (
+    reader_worker,
+    write_to_db,
+    refresh_gold_tables,
+    find_input_files,
+    load_manifest,
+    GroupCommitter
+)
+from etl_functions import setup_database, load_club_aliases, mark_file_processed, KSCORE_LEVEL_ALIASES
+
+# ==============================================================================
+#  LOAD PIPELINE BENCHMARK
+#  Generates a synthetic corpus at each scale (1x = --meets meets per format),
+#  then times the three pipeline stages on a fresh DB:
+#    extract -> extraction_library via reader_worker (serial, in-process)
+#    write   -> write_to_db + batch flush + ProcessedFiles mark, one group commit
+#    gold    -> refresh_gold_tables without the Supabase export subprocesses
+#  and compares files/s and rows/s with a stored baseline JSON.
+# ==============================================================================
+
+BASELINE_FILE = "benchmark_baseline.json"
+STAGES = ('extract', 'write', 'gold')
+
+def _quiet():
+    """Silences the per-file prints of the extractors and ETL helpers while timing."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def _prepare_db(db_path):
+    with _quiet():
+        setup_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        # Production DBs carry session_id (dedup key + Gold grouping); setup_database does not create it
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(Results)")}
+        if 'session_id' not in cols:
+            conn.execute("ALTER TABLE Results ADD COLUMN session_id TEXT")
+        # Same duplicate-check index load_orchestrator.main() creates before writing
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_dup_check 
+            ON Results(meet_db_id, athlete_id, apparatus_id, session, level, session_id)
+        """)
+
+def _rate(count, seconds):
+    return round(count / seconds, 2) if seconds > 0 else None
+
+def run_scale(root, db_path, meets, athletes_per_session, sessions, event_mix, seed):
+    """Generates one corpus and returns {stage: {seconds, files, rows, files_per_s, rows_per_s}}."""
+    synthetic_corpus.generate_corpus(root, meets=meets, athletes_per_session=athletes_per_session,
+                                     sessions=sessions, event_mix=event_mix, seed=seed)
+    manifests = {stype: load_manifest(stype, os.path.join(root, synthetic_corpus.MANIFESTS[stype]))
+                 for stype in synthetic_corpus.FORMATS}
+    files = find_input_files(manifests, KSCORE_LEVEL_ALIASES, root=root)
+    club_aliases = load_club_aliases()
+    extraction_library.set_plan_cache_dir(os.path.join(root, "extraction_plans"))  # Keep plans with the corpus, not in the cwd
+    stats = {}
+
+    # --- Extraction ---
+    packages = []
+    start = time.perf_counter()
+    with _quiet():
+        for stype, fpath, manifest, aliases in files:
+            packages.append((stype, fpath, reader_worker(stype, fpath, dict(manifest), aliases)))
+    seconds = time.perf_counter() - start
+    extracted_rows = sum(len(a['apparatus_results']) for _, _, p in packages if p and 'error' not in p for a in p['results'])
+    stats['extract'] = {'seconds': seconds, 'files': len(files), 'rows': extracted_rows}
+
+    # --- write_to_db ---
+    _prepare_db(db_path)
+    inserted = 0
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        caches = entity_cache.new_entity_caches(load_orchestrator.LRU_CACHE_SIZE)
+        caches['apparatus'] = {(row[1], row[2]): row[0] for row in conn.execute("SELECT apparatus_id, name, discipline_id FROM Apparatus")}
+        caches['meet'] = {}
+        existing_results = result_key_index.ResultKeyIndex.load(conn, db_path)
+        existing_results.attach(conn)
+        pending_inserts = []
+        committer = GroupCommitter(conn, pending_inserts, existing_results, max_files=0, max_seconds=3600)
+        start = time.perf_counter()
+        with _quiet():
+            for stype, fpath, package in packages:
+                if not package: continue
+                committer.begin_file(stype)
+                inserted += write_to_db(conn, package, caches, club_aliases, existing_results, pending_inserts) or 0
+                if len(pending_inserts) >= load_orchestrator.BATCH_INSERT_SIZE:
+                    load_orchestrator.flush_pending_inserts(conn.cursor(), pending_inserts)
+                    existing_results.mark_flushed()
+                mark_file_processed(conn, fpath, f"bench:{fpath}")
+                committer.end_file(stype)
+            committer.commit()
+        stats['write'] = {'seconds': time.perf_counter() - start, 'files': len(packages), 'rows': inserted}
+
+        # --- Gold refresh ---
+        results_rows = conn.execute("SELECT COUNT(*) FROM Results").fetchone()[0]
+        start = time.perf_counter()
+        refresh_gold_tables(conn, db_path, exports=False)
+        stats['gold'] = {'seconds': time.perf_counter() - start, 'files': 0, 'rows': results_rows}
+
+    for stage in stats.values():
+        stage['files_per_s'] = _rate(stage['files'], stage['seconds']) if stage['files'] else None
+        stage['rows_per_s'] = _rate(stage['rows'], stage['seconds'])
+        stage['seconds'] = round(stage['seconds'], 4)
+    return stats
+
+def compare(results, baseline, tolerance):
+    """Returns [(scale, stage, current, baseline)] where rows/s fell more than `tolerance` below the baseline."""
+    regressions = []
+    for scale, stages in results.items():
+        for stage, current in stages.items():
+            base = baseline.get(scale, {}).get(stage)
+            if not base or not base.get('rows_per_s') or current['rows_per_s'] is None:
+                continue
+            if current['rows_per_s'] < base['rows_per_s'] * (1 - tolerance):
+                regressions.append((scale, stage, current['rows_per_s'], base['rows_per_s']))
+    return regressions
+
+def print_report(results, baseline):
+    print(f"{'scale':>6} {'stage':>8} {'files':>7} {'rows':>8} {'seconds':>9} {'files/s':>9} {'rows/s':>10} {'vs base':>8}")
+    for scale, stages in results.items():
+        for stage in STAGES:
+            s = stages[stage]
+            base = baseline.get(scale, {}).get(stage, {}).get('rows_per_s')
+            delta = f"{(s['rows_per_s'] / base - 1) * 100:+.0f}%" if base and s['rows_per_s'] else '-'
+            files_rate = f"{s['files_per_s']:.1f}" if s['files_per_s'] else '-'
+            print(f"{scale:>6} {stage:>8} {s['files']:>7} {s['rows']:>8} {s['seconds']:>9.3f} {files_rate:>9} {s['rows_per_s'] or 0:>10.0f} {delta:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction, write_to_db and Gold refresh on a synthetic corpus")
+    parser.add_argument("--scales", type=str, default="1,10,100", help="Comma-separated corpus multipliers")
+    parser.add_argument("--meets", type=int, default=2, help="Meets per format at 1x")
+    parser.add_argument("--athletes-per-session", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=2)
+    parser.add_argument("--event-mix", choices=synthetic_corpus.EVENT_MIXES, default='mixed')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=str, default=BASELINE_FILE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed rows/s drop before a stage counts as a regression")
+    parser.add_argument("--output", type=str, default=None, help="Also write this run's results to a JSON file")
+    parser.add_argument("--workdir", type=str, default=None, help="Keep generated corpora/DBs here instead of a temp dir")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="gym_bench_")
+    config = {'meets': args.meets, 'athletes_per_session': args.athletes_per_session, 'sessions': args.sessions,
+              'event_mix': args.event_mix, 'seed': args.seed}
+
+    results = {}
+    try:
+        for scale in [int(s) for s in args.scales.split(',') if s.strip()]:
+            root = os.path.join(workdir, f"scale_{scale}")
+            shutil.rmtree(root, ignore_errors=True)
+            os.makedirs(root)
+            print(f"--- {scale}x: {args.meets * scale} meets per format ---")
+            results[f"{scale}x"] = run_scale(root, os.path.join(root, "bench.db"), args.meets * scale,
+                                             args.athletes_per_session, args.sessions, args.event_mix, args.seed)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            stored = json.load(f)
+        if stored.get('config') != config:
+            print(f"Warning: baseline was recorded with {stored.get('config')}; comparison may be meaningless.")
+        baseline = stored.get('results', {})
+
+    print_report(results, baseline)
+    run = {'config': config, 'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                                         'cpus': os.cpu_count()}, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for scale, stage, current, base in regressions:
+        print(f"REGRESSION {scale} {stage}: {current:.0f} rows/s vs baseline {base:.0f} rows/s")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+# db_writer.py
+
+import os
+import sys
+import time
+import queue
+import sqlite3
+import logging
+import argparse
+import threading
+from contextlib import contextmanager, nullcontext
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+# ==============================================================================
+#  SINGLE-WRITER DATABASE SERVICE
+#  One process owns the only write connection to gym_data.db and serializes
+#  every write from cooperating tools through a FIFO queue:
+#    batch -> a list of statements executed atomically on the service connection,
+#             acknowledged with rowcounts (or the error) once committed
+#    lease -> exclusive write turn for a client that must write on its own
+#             connection (SAVEPOINTs, temp tables, read-your-writes); held until
+#             the client releases it or disconnects
+#  Readers keep using their own connections and WAL snapshots.
+#  Clients fall back to writing directly when no service is listening.
+# ==============================================================================
+
+AUTHKEY = b'gymtendency-writer'
+BUSY_TIMEOUT_MS = 60000  # Non-cooperating writers: let SQLite wait instead of sleeping in Python
+
+def socket_path(db_path):
+    return f"{os.path.abspath(db_path)}.writer.sock"
+
+class _Item:
+    """A queued batch or lease request; the handler thread waits on its events."""
+
+    def __init__(self, kind, statements=None):
+        self.kind = kind
+        self.statements = statements
+        self.reply = None
+        self.done = threading.Event()       # batch executed / lease granted
+        self.released = threading.Event()   # lease released (or client gone)
+
+class WriterService:
+    def __init__(self, db_path, address=None):
+        self.db_path = db_path
+        self.address = address or socket_path(db_path)
+        self.queue = queue.Queue()
+        self.stats = {'batches': 0, 'statements': 0, 'errors': 0, 'leases': 0, 'clients': 0, 'max_queue': 0}
+        self._stop = threading.Event()
+        self._listener = None
+
+    # --- Writer thread (the only code that writes through the service connection) ---
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        return conn
+
+    def _execute_batch(self, conn, statements):
+        rowcounts = []
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for kind, sql, params in statements:
+                if kind == 'executemany':
+                    cursor.executemany(sql, params)
+                else:
+                    cursor.execute(sql, params or ())
+                rowcounts.append(cursor.rowcount)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        return {'ok': True, 'rowcounts': rowcounts, 'lastrowid': cursor.lastrowid}
+
+    def _writer_loop(self):
+        conn = self._open()
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                if item.kind == 'lease':
+                    if item.released.is_set():  # Client left before its turn
+                        continue
+                    self.stats['leases'] += 1
+                    item.done.set()
+                    item.released.wait()
+                    continue
+                try:
+                    item.reply = self._execute_batch(conn, item.statements)
+                    self.stats['batches'] += 1
+                    self.stats['statements'] += len(item.statements)
+                except sqlite3.Error as e:
+                    self.stats['errors'] += 1
+                    item.reply = {'ok': False, 'type': type(e).__name__, 'error': str(e)}
+                item.done.set()
+        finally:
+            conn.close()
+
+    # --- Client handling ---
+
+    def _enqueue(self, item):
+        self.queue.put(item)
+        self.stats['max_queue'] = max(self.stats['max_queue'], self.queue.qsize())
+
+    def _handle_client(self, client):
+        self.stats['clients'] += 1
+        lease = None
+        try:
+            while True:
+                try:
+                    msg = client.recv()
+                except (EOFError, OSError):
+                    break
+                op = msg.get('op')
+                if op == 'batch':
+                    item = _Item('batch', msg['statements'])
+                    self._enqueue(item)
+                    item.done.wait()
+                    client.send(item.reply)
+                elif op == 'lease':
+                    lease = _Item('lease')
+                    self._enqueue(lease)
+                    lease.done.wait()
+                    client.send({'ok': True})
+                elif op == 'release':
+                    if lease is not None:
+                        lease.released.set()
+                        lease = None
+                    client.send({'ok': True})
+                elif op == 'ping':
+                    client.send({'ok': True, 'queued': self.queue.qsize(), 'stats': dict(self.stats)})
+                elif op == 'shutdown':
+                    client.send({'ok': True})
+                    self.shutdown()
+                    break
+                else:
+                    client.send({'ok': False, 'type': 'ProgrammingError', 'error': f"Unknown op {op!r}"})
+        finally:
+            if lease is not None:
+                lease.released.set()
+            client.close()
+
+    def serve_forever(self):
+        """Listens on the Unix socket until shutdown() (or a 'shutdown' request)."""
+        if os.path.exists(self.address):
+            os.remove(self.address)  # Stale socket from a crashed service
+        writer = threading.Thread(target=self._writer_loop, daemon=True)
+        writer.start()
+        self._listener = Listener(self.address, family='AF_UNIX', authkey=AUTHKEY)
+        logging.info(f"DB writer service listening on {self.address} for {self.db_path}")
+        try:
+            while not self._stop.is_set():
+                try:
+                    client = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    if self._stop.is_set():
+                        break
+                    continue
+                threading.Thread(target=self._handle_client, args=(client,), daemon=True).start()
+        finally:
+            self._listener.close()
+            self.queue.put(None)
+            writer.join()  # Drains queued batches (and waits out a held lease) before exiting
+            if os.path.exists(self.address):
+                os.remove(self.address)
+            logging.info(f"DB writer service stopped: {self.stats}")
+
+    def shutdown(self):
+        self._stop.set()
+        # accept() does not return when the listener is closed from another thread; wake it with a connection
+        try:
+            Client(self.address, family='AF_UNIX', authkey=AUTHKEY).close()
+        except (OSError, EOFError):
+            pass
+
+# ==============================================================================
+#  CLIENT
+# ==============================================================================
+
+class WriterClient:
+    """Connection to a running WriterService. Not thread-safe; use one per thread."""
+
+    def __init__(self, address):
+        self.address = address
+        self._conn = Client(address, family='AF_UNIX', authkey=AUTHKEY)
+        self._leased = False
+        self.lease_wait = 0.0  # Seconds spent waiting for write turns
+
+    def _call(self, msg):
+        self._conn.send(msg)
+        reply = self._conn.recv()
+        if not reply.get('ok'):
+            raise getattr(sqlite3, reply.get('type', ''), sqlite3.DatabaseError)(reply.get('error'))
+        return reply
+
+    def batch(self, statements):
+        """
+        Executes [(sql, params)] or [('executemany', sql, seq_of_params)] atomically.
+        Returns the rowcount of each statement once the batch is committed.
+        """
+        normalized = []
+        for stmt in statements:
+            if len(stmt) == 3:
+                normalized.append(tuple(stmt))
+            else:
+                sql, params = stmt
+                normalized.append(('execute', sql, params))
+        return self._call({'op': 'batch', 'statements': normalized})['rowcounts']
+
+    def execute(self, sql, params=()):
+        return self.batch([(sql, params)])[0]
+
+    def acquire(self):
+        """Blocks until this client holds the write lease."""
+        if not self._leased:
+            start = time.perf_counter()
+            self._call({'op': 'lease'})
+            self.lease_wait += time.perf_counter() - start
+            self._leased = True
+
+    def release(self):
+        if self._leased:
+            self._call({'op': 'release'})
+            self._leased = False
+
+    @contextmanager
+    def lease(self):
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def ping(self):
+        return self._call({'op': 'ping'})
+
+    def shutdown(self):
+        self._call({'op': 'shutdown'})
+
+    def close(self):
+        self._conn.close()
+
+def connect(db_path, address=None):
+    """WriterClient for the service owning db_path, or None if none is running (callers write directly)."""
+    address = address or socket_path(db_path)
+    if not os.path.exists(address):
+        return None
+    try:
+        return WriterClient(address)
+    except (OSError, EOFError) as e:
+        logging.warning(f"DB writer service at {address} not reachable, writing directly: {e}")
+        return None
+
+def lease(client):
+    """client.lease() when a service is in use, otherwise a no-op context."""
+    return client.lease() if client is not None else nullcontext()
+
+def table_replace_statements(df, table_name):
+    """Batch statements equivalent to df.to_sql(table_name, if_exists='replace', index=False)."""
+    import pandas as pd
+    columns = ', '.join(f'"{c}"' for c in df.columns)
+    placeholders = ', '.join('?' for _ in df.columns)
+    rows = df.astype(object).where(df.notna(), None).values.tolist()
+    return [
+        ('execute', f'DROP TABLE IF EXISTS "{table_name}"', ()),
+        ('execute', pd.io.sql.get_schema(df, table_name), ()),
+        ('executemany', f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})', rows),
+    ]
+
+# ==============================================================================
+#  MAIN EXECUTION
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Single-writer service for the SQLite database")
+    parser.add_argument("--db-file", type=str, default="gym_data.db", help="Path to SQLite database file")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path (default: <db-file>.writer.sock)")
+    parser.add_argument("--status", action="store_true", help="Print the running service's queue and counters")
+    parser.add_argument("--stop", action="store_true", help="Ask the running service to shut down")
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        client = connect(args.db_file, args.socket)
+        if client is None:
+            print("No DB writer service running.")
+            return 1
+        if args.stop:
+            client.shutdown()
+            print("DB writer service stopping.")
+        else:
+            print(client.ping())
+        client.close()
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    service = WriterService(args.db_file, args.socket)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        service.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# entity_cache.py
+
+import os
+import pickle
+import hashlib
+import logging
+from collections import OrderedDict
+
+# ==============================================================================
+#  BOUNDED ENTITY CACHES (Person / Club / Athlete)
+#  Size-bounded LRU maps used by the parallel loader and the standalone loaders
+#  in place of unbounded dicts / whole-table preloads. Each cache counts hits,
+#  misses and evictions. The set can be snapshotted next to the DB and reloaded
+#  on the next run (warm start); the snapshot is only trusted if the entity
+#  tables and alias files are exactly as they were when it was written.
+# ==============================================================================
+
+DEFAULT_CACHE_SIZE = 10000
+SNAPSHOT_VERSION = 1
+ENTITY_CACHES = ('person', 'club', 'athlete')
+
+# Tables whose contents decide which ids the cached names map to
+_FINGERPRINT_TABLES = ('Persons', 'PersonAliases', 'Clubs', 'ClubAliases', 'Athletes')
+# Manual alias files read by etl_functions at import; editing one remaps names without touching the tables
+_FINGERPRINT_FILES = ('person_aliases.json', 'club_aliases.json')
+
+class LRUCache:
+    """
+    Dict-like LRU map with a fixed capacity (maxsize <= 0 means unbounded).
+    `key in cache` records a hit or miss and refreshes the entry, so the usual
+    `if key in cache: return cache[key]` pattern counts once per lookup.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, name=''):
+        self.maxsize = maxsize
+        self.name = name
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return True
+        self.misses += 1
+        return False
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize > 0:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self._data[key]
+        return default
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def update(self, items):
+        for key, value in dict(items).items():
+            self[key] = value
+
+    def items(self):
+        return self._data.items()
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data), 'maxsize': self.maxsize,
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None
+        }
+
+def new_entity_caches(maxsize=DEFAULT_CACHE_SIZE):
+    """{'person': LRUCache, 'club': LRUCache, 'athlete': LRUCache}"""
+    return {name: LRUCache(maxsize, name) for name in ENTITY_CACHES}
+
+def cache_stats(caches):
+    """{name: stats} for the entity caches present in `caches`."""
+    return {name: caches[name].stats() for name in ENTITY_CACHES if isinstance(caches.get(name), LRUCache)}
+
+# ==============================================================================
+#  WARM-START SNAPSHOTS
+# ==============================================================================
+
+def snapshot_path(db_path):
+    return f"{db_path}.entity_cache.pkl"
+
+def invalidate_snapshot(db_path):
+    """Deletes the on-disk snapshot. Call after merging or deleting Persons / Clubs / Athletes."""
+    path = snapshot_path(db_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+def _file_digest(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def _db_fingerprint(conn):
+    """
+    Row counts and AUTOINCREMENT marks of the entity tables plus the content hash of the manual
+    alias files; any write to the tables or edit of the files changes it.
+    """
+    sequences = dict(conn.execute("SELECT name, seq FROM sqlite_sequence"))
+    fingerprint = {table: (conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], sequences.get(table))
+                   for table in _FINGERPRINT_TABLES}
+    fingerprint['alias_files'] = {path: _file_digest(path) for path in _FINGERPRINT_FILES}
+    return fingerprint
+
+def save_snapshot(caches, conn, db_path):
+    """Writes the entity caches (most recently used last) atomically next to db_path. Call after the final commit."""
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'fingerprint': _db_fingerprint(conn),
+        'entries': {name: list(caches[name].items()) for name in ENTITY_CACHES if name in caches}
+    }
+    path = snapshot_path(db_path)
+    with open(path + ".tmp", 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+    return path
+
+def load_snapshot(caches, conn, db_path):
+    """
+    Fills the entity caches from the snapshot if the entity tables are unchanged since it was written.
+    Returns the number of entries loaded (0 if there is no usable snapshot).
+    """
+    path = snapshot_path(db_path)
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+        logging.warning(f"Entity cache snapshot unreadable, starting cold: {e}")
+        return 0
+    if data.get('version') != SNAPSHOT_VERSION or data.get('fingerprint') != _db_fingerprint(conn):
+        logging.info("Entity cache snapshot is stale (entity tables or alias files changed), starting cold.")
+        return 0
+    loaded = 0
+    for name, entries in data.get('entries', {}).items():
+        if name in caches:
+            for key, value in entries:
+                caches[name][key] = value
+            loaded += len(entries)
+    return loaded
+
+def open_entity_caches(conn, db_path, maxsize=DEFAULT_CACHE_SIZE, warm_start=False):
+    """New bounded entity caches, pre-filled from the snapshot when warm_start is set."""
+    caches = new_entity_caches(maxsize)
+    if warm_start:
+        loaded = load_snapshot(caches, conn, db_path)
+        if loaded:
+            logging.info(f"Entity caches: warm start with {loaded} entries from {snapshot_path(db_path)}")
+    return caches
@@ -2,6 +2,7 @@
 
 import sqlite3
 import pandas as pd
+import numpy as np
 import os
 import json
 import traceback
@@ -9,13 +10,21 @@ import re
 import hashlib
 import time
 import random
+import string
+import bisect
 from datetime import datetime as dt
+from collections import Counter
+from functools import lru_cache
+
+import event_registry
 
 # ==============================================================================
 #  DATE NORMALIZATION
 #  Handles date ranges and various text formats, normalizes to ISO (YYYY-MM-DD)
 # ==============================================================================
 
+DATE_CACHE_SIZE = 65536  # Distinct manifest/export date strings kept parsed
+
 def parse_date_to_iso(date_str):
     """
     Parse various date formats and return ISO format (YYYY-MM-DD).
@@ -23,10 +32,14 @@ def parse_date_to_iso(date_str):
     - Already valid ISO dates: "2025-01-26"
     - Date ranges: "Jan 24, 2025 - Jan 26, 2025" (uses the last date)
     - Single text dates: "Jan 26, 2025"
+    Memoized: each distinct string is parsed once per process.
     """
     if not date_str or not isinstance(date_str, str):
         return date_str
-    
+    return _parse_date_text(date_str)
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_text(date_str):
     date_str = date_str.strip()
     
     # Already in ISO format (YYYY-MM-DD)
@@ -59,6 +72,36 @@ def parse_date_to_iso(date_str):
     # Return original if we can't parse it
     return date_str
 
+def clean_year(raw_year):
+    """Manifest year as a string without a trailing .0 ("2025.0" -> "2025"), or None if empty."""
+    if pd.notnull(raw_year) and str(raw_year).strip() != '':
+        try:
+            return str(int(float(raw_year)))
+        except (ValueError, TypeError, OverflowError):
+            return str(raw_year).strip()
+    return None
+
+def _map_distinct(values, func, keep_nulls=True):
+    """Applies func once per distinct non-null value and maps the results back over the column."""
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = pd.factorize(series)
+    results = np.empty(len(uniques) + 1, dtype=object)
+    results[:-1] = [func(u) for u in uniques]
+    results[-1] = None  # code -1: null input
+    mapped = results[codes]
+    if keep_nulls:
+        nulls = codes < 0
+        mapped[nulls] = series.to_numpy(dtype=object)[nulls]
+    return pd.Series(mapped, index=series.index, dtype=object)
+
+def normalize_dates(values):
+    """Vectorized parse_date_to_iso over a column (Series or list); nulls are kept as they are."""
+    return _map_distinct(values, parse_date_to_iso)
+
+def normalize_years(values):
+    """Vectorized clean_year over a column (Series or list); nulls become None."""
+    return _map_distinct(values, clean_year, keep_nulls=False)
+
 # ==============================================================================
 #  DATABASE UTILS
 # ==============================================================================
@@ -103,6 +146,9 @@ TT_EXCLUSION_PATTERNS = [
     r'\bsynchro\s*tramp',       # synchro trampoline
 ]
 
+# One alternation, compiled once: a single scan per name instead of one search per pattern
+TT_EXCLUSION_REGEX = re.compile('|'.join(f'(?:{p})' for p in TT_EXCLUSION_PATTERNS), re.IGNORECASE)
+
 def is_tt_meet(meet_name):
     """
     Check if a meet name indicates a Trampoline & Tumbling meet.
@@ -110,11 +156,7 @@ def is_tt_meet(meet_name):
     """
     if not meet_name:
         return False
-    name_lower = meet_name.lower()
-    for pattern in TT_EXCLUSION_PATTERNS:
-        if re.search(pattern, name_lower, re.IGNORECASE):
-            return True
-    return False
+    return TT_EXCLUSION_REGEX.search(meet_name) is not None
 
 # ==============================================================================
 #  COUNTRY DETECTION
@@ -134,6 +176,10 @@ CANADIAN_PROVINCES = {
     'NOVA SCOTIA', 'ONTARIO', 'PRINCE EDWARD ISLAND', 'QUEBEC', 'SASKATCHEWAN'
 }
 
+_LOCATION_SPLIT_REGEX = re.compile(r'[,\s]+')
+_PROVINCE_NAME_REGEX = re.compile('|'.join(['ONTARIO', 'QUEBEC', 'ALBERTA', 'BRITISH COLUMBIA', 'MANITOBA',
+                                            'SASKATCHEWAN', 'NOVA SCOTIA', 'NEW BRUNSWICK']))
+
 def detect_country(location=None, source=None, meet_name=None):
     """
     Detect the country for a meet based on available information.
@@ -156,7 +202,7 @@ def detect_country(location=None, source=None, meet_name=None):
         loc_upper = location.upper().strip()
         
         # Check for exact state/province code match
-        loc_parts = re.split(r'[,\s]+', loc_upper)
+        loc_parts = _LOCATION_SPLIT_REGEX.split(loc_upper)
         for part in loc_parts:
             part_clean = part.strip()
             if part_clean in US_STATES:
@@ -165,10 +211,8 @@ def detect_country(location=None, source=None, meet_name=None):
                 return 'CAN'
         
         # Check for province names in location string
-        for prov in ['ONTARIO', 'QUEBEC', 'ALBERTA', 'BRITISH COLUMBIA', 'MANITOBA', 
-                     'SASKATCHEWAN', 'NOVA SCOTIA', 'NEW BRUNSWICK']:
-            if prov in loc_upper:
-                return 'CAN'
+        if _PROVINCE_NAME_REGEX.search(loc_upper):
+            return 'CAN'
     
     # 3. Meet name patterns (last resort)
     if meet_name:
@@ -180,6 +224,24 @@ def detect_country(location=None, source=None, meet_name=None):
     
     return None  # Unable to determine
 
+# ==============================================================================
+#  MEET CLASSIFICATION
+#  Country and competition type are computed once per meet and stored on the
+#  Meets row together with the classifier version that produced them.
+#  Bump CLASSIFIER_VERSION when the rules above change: ensure_meet_classification
+#  then re-classifies every meet on the next setup_database().
+# ==============================================================================
+CLASSIFIER_VERSION = 1
+COMPETITION_TT = 'TT'
+COMPETITION_ARTISTIC = 'ARTISTIC'
+
+@lru_cache(maxsize=65536)
+def classify_meet(meet_name=None, location=None, source=None):
+    """(country, competition_type) for a meet; country is None if it cannot be determined."""
+    country = detect_country(location=location, source=source, meet_name=meet_name)
+    is_tt = isinstance(meet_name, str) and is_tt_meet(meet_name)
+    return country, COMPETITION_TT if is_tt else COMPETITION_ARTISTIC
+
 # ==============================================================================
 #  DATABASE SETUP AND DEFINITIONS
 # ==============================================================================
@@ -251,6 +313,62 @@ def load_level_aliases(filepath="level_aliases.json"):
         return {}
 
 LEVEL_ALIASES = load_level_aliases()
+KSCORE_LEVEL_ALIASES = load_level_aliases("kscore_level_aliases.json")
+
+def normalize_level_key(level_str):
+    """Case-, whitespace- and punctuation-insensitive key: 'Provincial 1-D' -> 'provincial 1 d'."""
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', level_str.casefold()).split())
+
+class LevelIndex:
+    """
+    Compiled lookup for standardize_level_name, built once from an alias map.
+    Tiers: exact alias -> case-insensitive alias (the old linear scan) -> normalized key.
+    Results are memoized per raw string; strings that match no alias and are not a known
+    level (alias or canonical of level_aliases.json / kscore_level_aliases.json) are counted in `unmatched`.
+    """
+
+    def __init__(self, alias_map, known_levels=()):
+        self.exact = alias_map
+        self.folded = {}
+        self.normalized = {}
+        for alias, canonical in alias_map.items():
+            self.folded.setdefault(alias.lower().strip(), canonical)
+            self.normalized.setdefault(normalize_level_key(alias), canonical)
+        self.known = {normalize_level_key(level) for level in known_levels}
+        self.known.update(normalize_level_key(level) for level in alias_map.values())
+        self.known.update(self.normalized)
+        self._memo = {}
+        self.unmatched = Counter()
+
+    def lookup(self, level_str):
+        hit = self._memo.get(level_str)
+        if hit is None:
+            canonical = self.exact.get(level_str)
+            if canonical is None:
+                canonical = self.folded.get(level_str.lower().strip())
+            key = normalize_level_key(level_str)
+            if canonical is None:
+                canonical = self.normalized.get(key)
+            matched = canonical is not None or key in self.known
+            hit = self._memo[level_str] = (canonical if canonical is not None else level_str.strip(), matched)
+        if not hit[1]:
+            self.unmatched[level_str] += 1
+        return hit[0]
+
+def _known_levels(*alias_maps):
+    return [level for alias_map in alias_maps for pair in alias_map.items() for level in pair]
+
+LEVEL_INDEX = LevelIndex(LEVEL_ALIASES, known_levels=_known_levels(KSCORE_LEVEL_ALIASES))
+# One compiled index per alias map passed to standardize_level_name: id(map) -> (map, index).
+# The map is held too, so its id cannot be reused by another dict while the entry exists.
+_LEVEL_INDEXES = {id(LEVEL_ALIASES): (LEVEL_ALIASES, LEVEL_INDEX)}
+
+def level_index(alias_map):
+    """The LevelIndex compiled for alias_map (built on first use, then reused with its memo and counts)."""
+    entry = _LEVEL_INDEXES.get(id(alias_map))
+    if entry is None or entry[0] is not alias_map:
+        entry = _LEVEL_INDEXES[id(alias_map)] = (alias_map, LevelIndex(alias_map))
+    return entry[1]
 
 # ==============================================================================
 #  SCHEMA EVOLUTION & METADATA
@@ -313,6 +431,60 @@ def ensure_column_exists(cursor, table_name, column_name, col_type='TEXT'):
             return False
     return True
 
+class SchemaRegistry:
+    """
+    In-memory view of a table's columns for the loader's dynamic metadata.
+    Reads PRAGMA table_info once, applies every column a batch needs in one migration
+    step and answers whitelist/existence questions from memory (same rules as
+    ensure_column_exists). Also counts how often each dynamic column receives a value.
+    """
+
+    def __init__(self, cursor, table_name='Results'):
+        self.table_name = table_name
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        self.columns = {info[1] for info in cursor.fetchall()}
+        self.usage = {}      # column -> values written this run
+        self.rejected = {}   # column -> values routed to details_json (not whitelisted)
+        self._sanitized = {}
+
+    def sanitize(self, raw_col):
+        """Memoized sanitize_column_name."""
+        safe_col = self._sanitized.get(raw_col)
+        if safe_col is None:
+            safe_col = self._sanitized[raw_col] = sanitize_column_name(raw_col)
+        return safe_col
+
+    def is_allowed(self, column_name):
+        if self.table_name == 'Results' and column_name not in METADATA_WHITELIST:
+            return False
+        return column_name in self.columns
+
+    def ensure_columns(self, cursor, column_names, col_type='TEXT'):
+        """Adds every whitelisted column in column_names that the table lacks (one migration step)."""
+        missing = sorted({c for c in column_names
+                          if c not in self.columns and (self.table_name != 'Results' or c in METADATA_WHITELIST)})
+        for column_name in missing:
+            print(f"  -> Schema Evolution: Adding column '{column_name}' to '{self.table_name}'")
+            try:
+                cursor.execute(f'ALTER TABLE {self.table_name} ADD COLUMN "{column_name}" {col_type}')
+                self.columns.add(column_name)
+            except Exception as e:
+                print(f"  -> Error adding column {column_name}: {e}")
+        return missing
+
+    def record(self, column_name, accepted=True):
+        counts = self.usage if accepted else self.rejected
+        counts[column_name] = counts.get(column_name, 0) + 1
+
+    def table_usage(self, cursor, columns=None):
+        """Non-null counts per column from a single table scan: {column: count}."""
+        columns = sorted(columns if columns is not None else self.columns)
+        if not columns:
+            return {}
+        exprs = ', '.join(f'COUNT("{c}")' for c in columns)
+        cursor.execute(f"SELECT {exprs} FROM {self.table_name}")
+        return dict(zip(columns, cursor.fetchone()))
+
 @retry_on_lock()
 def setup_database(db_file):
     """
@@ -326,6 +498,8 @@ def setup_database(db_file):
             try:
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Disciplines';")
                 if cursor.fetchone():
+                    ensure_meet_name_key(conn) # Migrates DBs created before Meets.name_key
+                    ensure_meet_classification(conn)
                     return True # Already setup
             except sqlite3.OperationalError:
                 pass # Proceed to setup if we can't check
@@ -348,6 +522,7 @@ def setup_database(db_file):
                 "CREATE TABLE IF NOT EXISTS Meets (meet_db_id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL, source_meet_id TEXT NOT NULL, name TEXT, start_date_iso TEXT, comp_year INTEGER, location TEXT, country TEXT, competition_type TEXT, UNIQUE(source, source_meet_id));",
                 "CREATE TABLE IF NOT EXISTS Results (result_id INTEGER PRIMARY KEY AUTOINCREMENT, meet_db_id INTEGER NOT NULL, athlete_id INTEGER NOT NULL, apparatus_id INTEGER NOT NULL, gender TEXT, level TEXT, age REAL, province TEXT, score_d REAL, score_final REAL, score_text TEXT, rank_numeric INTEGER, rank_text TEXT, details_json TEXT, age_group TEXT, meet TEXT, \"group\" TEXT, state TEXT, session TEXT, num TEXT, bonus REAL, execution_bonus REAL, score_sv REAL, score_e REAL, penalty REAL, FOREIGN KEY (meet_db_id) REFERENCES Meets (meet_db_id), FOREIGN KEY (athlete_id) REFERENCES Athletes (athlete_id), FOREIGN KEY (apparatus_id) REFERENCES Apparatus (apparatus_id));",
                 "CREATE TABLE IF NOT EXISTS ProcessedFiles (file_path TEXT PRIMARY KEY, file_hash TEXT, last_processed TIMESTAMP);",
+                "CREATE TABLE IF NOT EXISTS FileFingerprints (file_path TEXT PRIMARY KEY, file_size INTEGER, mtime_ns INTEGER, inode INTEGER, file_hash TEXT);",
                 "CREATE TABLE IF NOT EXISTS ScrapeErrors (error_id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL, source_meet_id TEXT, error_message TEXT, error_timestamp TEXT DEFAULT CURRENT_TIMESTAMP);",
                 "CREATE TABLE IF NOT EXISTS ScoringStandards (standard_id INTEGER PRIMARY KEY AUTOINCREMENT, country TEXT NOT NULL, level_system TEXT NOT NULL, level_name TEXT NOT NULL, max_score REAL, has_d_score BOOLEAN DEFAULT 0, UNIQUE(country, level_system, level_name));"
             ]
@@ -383,15 +558,13 @@ def setup_database(db_file):
             disciplines = [(1, 'WAG'), (2, 'MAG'), (99, 'Other')]
             cursor.executemany("INSERT OR IGNORE INTO Disciplines (discipline_id, discipline_name) VALUES (?, ?)", disciplines)
             
-            WAG_EVENTS = {'Vault': 1, 'Uneven Bars': 2, 'Beam': 3, 'Floor': 4, 'All Around': 99}
-            MAG_EVENTS = {'Floor': 1, 'Pommel Horse': 2, 'Rings': 3, 'Vault': 4, 'Parallel Bars': 5, 'High Bar': 6, 'All Around': 99}
-            OTHER_EVENTS = {'All Around': 99}
             all_apparatus = []
-            for name, order in WAG_EVENTS.items(): all_apparatus.append((name, 1, order))
-            for name, order in MAG_EVENTS.items(): all_apparatus.append((name, 2, order))
-            for name, order in OTHER_EVENTS.items(): all_apparatus.append((name, 99, order))
+            for discipline_id, events in event_registry.DISCIPLINE_EVENTS.items():
+                for name, order in events.items(): all_apparatus.append((name, discipline_id, order))
             cursor.executemany("INSERT OR IGNORE INTO Apparatus (name, discipline_id, sort_order) VALUES (?, ?, ?)", all_apparatus)
             
+            ensure_meet_name_key(conn)
+            ensure_meet_classification(conn)
             conn.commit()
             print("Database setup complete.")
             return True
@@ -417,21 +590,11 @@ def standardize_club_name(club_str, alias_map):
 
 def standardize_level_name(level_str, alias_map=LEVEL_ALIASES):
     """
-    Standardize level names.
+    Standardize level names (O(1) via the LevelIndex compiled once per alias map; LEVEL_INDEX
+    for the default one).
     """
     if not level_str or not isinstance(level_str, str): return level_str
-    
-    # 1. Exact match
-    if level_str in alias_map:
-        return alias_map[level_str]
-        
-    # 2. Case-insensitive match
-    l_lower = level_str.lower().strip()
-    for alias, canonical in alias_map.items():
-        if alias.lower().strip() == l_lower:
-            return canonical
-            
-    return level_str.strip()
+    return level_index(alias_map).lookup(level_str)
 
 def standardize_athlete_name(name_str, remove_middle_initial=True):
     """
@@ -484,15 +647,17 @@ def standardize_athlete_name(name_str, remove_middle_initial=True):
     
     return ' '.join(words)
 
+def standardize_athlete_names(names, remove_middle_initial=True):
+    """
+    Batch standardize_athlete_name over a pandas Series or list of raw names.
+    Each distinct value is normalized once and the results are mapped back, so the cost is
+    O(unique names); returns a Series (same index as a Series input) with None for rejected names.
+    """
+    return _map_distinct(names, lambda name: standardize_athlete_name(name, remove_middle_initial), keep_nulls=False)
+
 
 def detect_discipline(df):
-    column_names = set(df.columns)
-    MAG_INDICATORS = {'Pommel_Horse', 'PommelHorse', 'Rings', 'Parallel_Bars', 'ParallelBars', 'High_Bar', 'HighBar'}
-    WAG_INDICATORS = {'Uneven_Bars', 'UnevenBars', 'Beam'}
-    for col in column_names:
-        if any(indicator in col for indicator in MAG_INDICATORS): return 2, 'MAG', 'M'
-        if any(indicator in col for indicator in WAG_INDICATORS): return 1, 'WAG', 'F'
-    return 99, 'Other', 'Unknown'
+    return event_registry.header_discipline(tuple(set(df.columns)))
     
 def parse_rank(rank_str):
     """
@@ -611,8 +776,406 @@ def get_or_create_athlete_link(conn, person_id, club_id, cache):
     cache[athlete_key] = athlete_id
     return athlete_id
 
+NAME_INDEX_SCAN_BATCH = 50000
+NAME_INDEX_MERGE_THRESHOLD = 50000  # Fold names added this run into the sorted arrays past this size
+
+def _name_hashes(names):
+    """
+    Two 64-bit halves of a 128-bit blake2b per name: the first orders the index, the second
+    confirms a match, so a hit is exact for any practical number of names.
+    """
+    if not names:
+        empty = np.empty(0, dtype=np.uint64)
+        return empty, empty
+    digests = b''.join(hashlib.blake2b(str(name).encode('utf-8', 'surrogatepass'), digest_size=16).digest() for name in names)
+    pairs = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+class _NameIdIndex:
+    """
+    name -> id map stored as sorted uint64 name hashes with a uint64 check hash and an int64 id
+    per entry (24 bytes/name instead of a dict of strings). Names added this run stay in a dict
+    until NAME_INDEX_MERGE_THRESHOLD of them are folded into the arrays.
+    """
+
+    def __init__(self, hashes, checks, ids):
+        self.hashes, self.checks, self.ids = hashes, checks, ids
+        self.recent = {}
+
+    @classmethod
+    def load(cls, cursor):
+        """Builds the index from a cursor of (name, id) rows."""
+        hashes, checks, ids = [], [], []
+        while True:
+            rows = cursor.fetchmany(NAME_INDEX_SCAN_BATCH)
+            if not rows:
+                break
+            h, c = _name_hashes([row[0] for row in rows])
+            hashes.append(h)
+            checks.append(c)
+            ids.append(np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows)))
+        index = cls(np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64))
+        if hashes:
+            index._fold(np.concatenate(hashes), np.concatenate(checks), np.concatenate(ids))
+        return index
+
+    def __len__(self):
+        return len(self.hashes) + len(self.recent)
+
+    def get_many(self, names):
+        """{name: id} for the names present in the index."""
+        found = {}
+        rest = []
+        for name in names:
+            if name in self.recent:
+                found[name] = self.recent[name]
+            else:
+                rest.append(name)
+        if not rest or not len(self.hashes):
+            return found
+        h, c = _name_hashes(rest)
+        pos = np.minimum(np.searchsorted(self.hashes, h), len(self.hashes) - 1)
+        same_hash = self.hashes[pos] == h
+        hit = same_hash & (self.checks[pos] == c)
+        for i in np.flatnonzero(hit):
+            found[rest[i]] = int(self.ids[pos[i]])
+        # Equal first halves with another name sort next to each other: scan the run
+        for i in np.flatnonzero(same_hash & ~hit):
+            p = pos[i] + 1
+            while p < len(self.hashes) and self.hashes[p] == h[i]:
+                if self.checks[p] == c[i]:
+                    found[rest[i]] = int(self.ids[p])
+                    break
+                p += 1
+        return found
+
+    def add(self, name, id_):
+        self.recent[name] = id_
+        if len(self.recent) >= NAME_INDEX_MERGE_THRESHOLD:
+            names = list(self.recent)
+            h, c = _name_hashes(names)
+            self._fold(h, c, np.fromiter((self.recent[n] for n in names), dtype=np.int64, count=len(names)))
+            self.recent = {}
+
+    def _fold(self, hashes, checks, ids):
+        hashes = np.concatenate([self.hashes, hashes])
+        checks = np.concatenate([self.checks, checks])
+        ids = np.concatenate([self.ids, ids])
+        order = np.lexsort((checks, hashes))
+        self.hashes, self.checks, self.ids = hashes[order], checks[order], ids[order]
+
+class PersonResolver:
+    """
+    Compact index over PersonAliases and Persons, loaded once per run (see _NameIdIndex).
+    resolve() follows get_or_create_person (manual alias -> PersonAliases -> Persons -> create) without
+    per-name round trips: unseen names of a batch are inserted with one executemany and their ids are
+    back-filled by name. INSERT OR IGNORE plus that lookup also covers names another writer created
+    since the index was loaded. The bounded person cache sits in front of it for the hot names.
+    stats counts alias-index hits, misses and new persons.
+    """
+
+    LOOKUP_CHUNK = 500  # Names per IN (...) query
+
+    def __init__(self, conn):
+        self.aliases = _NameIdIndex.load(conn.execute("SELECT alias_name, canonical_person_id FROM PersonAliases"))
+        self.persons = _NameIdIndex.load(conn.execute("SELECT full_name, person_id FROM Persons"))
+        self.stats = {'hits': 0, 'misses': 0, 'new': 0}
+
+    def _lookup(self, cursor, sql, keys):
+        """{key: id} for the keys found by sql (an IN ({}) query), in chunks of LOOKUP_CHUNK."""
+        found = {}
+        for start in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[start:start + self.LOOKUP_CHUNK]
+            cursor.execute(sql.format(', '.join('?' * len(chunk))), chunk)
+            found.update(cursor.fetchall())
+        return found
+
+    def resolve(self, conn, names):
+        """
+        names: {person_name: gender} (standardized names, first gender seen wins).
+        Returns {person_name: person_id}. Caller owns the transaction.
+        """
+        wanted = list(dict.fromkeys(PERSON_ALIASES.get(name, name) for name in names))
+        aliases = self.aliases.get_many(wanted)
+        persons = self.persons.get_many([resolved for resolved in wanted if resolved not in aliases])
+
+        person_ids = {}
+        new_persons = {}  # resolved name -> gender, in first-seen order
+        new_aliases = []
+        for name, gender in names.items():
+            resolved = PERSON_ALIASES.get(name, name)
+            person_id = aliases.get(resolved)
+            if person_id is not None:
+                self.stats['hits'] += 1
+                person_ids[name] = person_id
+                continue
+            self.stats['misses'] += 1
+            person_id = persons.get(resolved)
+            if person_id is not None:
+                # Direct match: register the name as an alias for faster lookup next time
+                aliases[resolved] = person_id
+                self.aliases.add(resolved, person_id)
+                new_aliases.append((resolved, person_id))
+                person_ids[name] = person_id
+                continue
+            new_persons.setdefault(resolved, gender)
+
+        cursor = conn.cursor()
+        if new_persons:
+            # OR IGNORE: a name created by another writer since the index was loaded is fetched below
+            cursor.executemany("INSERT OR IGNORE INTO Persons (full_name, gender) VALUES (?, ?)", list(new_persons.items()))
+            self.stats['new'] += cursor.rowcount
+            created = self._lookup(cursor, "SELECT full_name, person_id FROM Persons WHERE full_name IN ({})", list(new_persons))
+            for full_name, person_id in created.items():
+                persons[full_name] = person_id
+                self.persons.add(full_name, person_id)
+                self.aliases.add(full_name, person_id)
+                new_aliases.append((full_name, person_id))
+        for name in names:
+            if name not in person_ids:
+                person_ids[name] = persons[PERSON_ALIASES.get(name, name)]
+
+        if new_aliases:
+            new_aliases.sort(key=lambda alias: alias[1])
+            cursor.executemany("INSERT OR IGNORE INTO PersonAliases (alias_name, canonical_person_id) VALUES (?, ?)", new_aliases)
+        return person_ids
+
 @retry_on_lock()
-def get_or_create_meet(conn, source, source_meet_id, meet_details, cache):
+def resolve_entities_bulk(conn, entries, caches):
+    """
+    Set-based counterpart of get_or_create_person / get_or_create_club / get_or_create_athlete_link.
+    Takes every (person_name, gender, club_name) of a data package (names already standardized),
+    stages the cache misses in temp tables and resolves or creates Persons, PersonAliases, Clubs,
+    ClubAliases and Athletes with a handful of statements instead of per-row round trips.
+    Returns (person_map, club_map, athlete_map) where athlete_map is keyed by (person_name, club_name).
+    The maps are built locally, so bounded caches may evict entries mid-package.
+    Caller owns the transaction.
+    """
+    person_cache, club_cache, athlete_cache = caches['person'], caches['club'], caches['athlete']
+    cursor = conn.cursor()
+
+    # Distinct names, first gender seen wins (same as the per-row path)
+    entries = list(entries)
+    person_gender = {}
+    club_names = {}
+    for person_name, gender, club_name in entries:
+        person_gender.setdefault(person_name, gender)
+        if club_name is not None:
+            club_names.setdefault(club_name, None)
+
+    # --- 1. Persons (bounded cache in front of the run's compact name index; new names inserted in bulk) ---
+    person_map = {}
+    person_misses = {}
+    for n, g in person_gender.items():
+        if n in person_cache:
+            person_map[n] = person_cache[n]
+        else:
+            person_misses[n] = g
+    if person_misses:
+        resolver = caches.get('person_resolver')
+        if resolver is None:
+            resolver = caches['person_resolver'] = PersonResolver(conn)
+        resolved = resolver.resolve(conn, person_misses)
+        person_map.update(resolved)
+        person_cache.update(resolved)
+
+    # --- 2. Clubs ---
+    club_map = {None: None}
+    club_misses = []
+    for c in club_names:
+        if c in club_cache:
+            club_map[c] = club_cache[c]
+        else:
+            club_misses.append(c)
+    if club_misses:
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS stage_clubs (name TEXT, resolved TEXT)")
+        cursor.execute("DELETE FROM stage_clubs")
+        staged = []
+        for c in club_misses:
+            normalized_name = c.strip().title()
+            staged.append((c, CLUB_ALIASES.get(normalized_name, c)))
+        cursor.executemany("INSERT INTO stage_clubs (name, resolved) VALUES (?, ?)", staged)
+
+        cursor.execute("SELECT COALESCE(MAX(club_id), 0) FROM Clubs")
+        max_club_before = cursor.fetchone()[0]
+        cursor.execute("""
+            INSERT INTO Clubs (name)
+            SELECT s.resolved FROM stage_clubs s
+            WHERE NOT EXISTS (SELECT 1 FROM ClubAliases ca WHERE ca.club_alias_name = s.resolved)
+              AND NOT EXISTS (SELECT 1 FROM Clubs c WHERE c.name = s.resolved)
+            GROUP BY s.resolved
+            ORDER BY MIN(s.rowid)
+        """)
+        # Only newly created clubs get a self-alias (matches get_or_create_club)
+        cursor.execute("""
+            INSERT OR IGNORE INTO ClubAliases (club_alias_name, canonical_club_id)
+            SELECT name, club_id FROM Clubs WHERE club_id > ?
+        """, (max_club_before,))
+        cursor.execute("""
+            SELECT s.name, COALESCE(
+                (SELECT ca.canonical_club_id FROM ClubAliases ca WHERE ca.club_alias_name = s.resolved),
+                (SELECT c.club_id FROM Clubs c WHERE c.name = s.resolved)
+            ) FROM stage_clubs s
+        """)
+        for name, club_id in cursor.fetchall():
+            club_map[name] = club_id
+            club_cache[name] = club_id
+
+    # --- 3. Athlete links ---
+    pairs = list(dict.fromkeys((person_name, club_name) for person_name, _, club_name in entries))
+    id_pairs = dict.fromkeys((person_map[p], club_map[c]) for p, c in pairs)
+    athlete_ids = {}
+    link_misses = []
+    for k in id_pairs:
+        if k in athlete_cache:
+            athlete_ids[k] = athlete_cache[k]
+        else:
+            link_misses.append(k)
+    if link_misses:
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS stage_athletes (person_id INTEGER, club_id INTEGER)")
+        cursor.execute("DELETE FROM stage_athletes")
+        cursor.executemany("INSERT INTO stage_athletes (person_id, club_id) VALUES (?, ?)", link_misses)
+        # "IS" so NULL clubs match (UNIQUE(person_id, club_id) does not dedupe NULLs)
+        cursor.execute("""
+            INSERT INTO Athletes (person_id, club_id)
+            SELECT s.person_id, s.club_id FROM stage_athletes s
+            WHERE NOT EXISTS (SELECT 1 FROM Athletes a WHERE a.person_id = s.person_id AND a.club_id IS s.club_id)
+            ORDER BY s.rowid
+        """)
+        cursor.execute("""
+            SELECT s.person_id, s.club_id,
+                   (SELECT MIN(a.athlete_id) FROM Athletes a WHERE a.person_id = s.person_id AND a.club_id IS s.club_id)
+            FROM stage_athletes s
+        """)
+        for person_id, club_id, athlete_id in cursor.fetchall():
+            athlete_ids[(person_id, club_id)] = athlete_id
+            athlete_cache[(person_id, club_id)] = athlete_id
+
+    athlete_map = {(p, c): athlete_ids[(person_map[p], club_map[c])] for p, c in pairs}
+    return person_map, club_map, athlete_map
+
+# ==============================================================================
+#  MEET NAME KEY (cross-source meet matching)
+#  Meets.name_key = LOWER(TRIM(name)), indexed with comp_year. get_or_create_meet
+#  and unify_meets match logical meets on (name_key, comp_year), either through
+#  the index or through a MeetResolver loaded once per run.
+# ==============================================================================
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def normalize_meet_name(name):
+    """Python twin of SQLite LOWER(TRIM(name)): spaces-only trim, ASCII-only lowercasing."""
+    if name is None:
+        return None
+    return str(name).strip(' ').translate(_ASCII_LOWER)
+
+def meet_year_key(comp_year):
+    """comp_year as the INTEGER column compares it ('2024', 2024 and 2024.0 are the same year)."""
+    try:
+        year = float(comp_year)
+    except (TypeError, ValueError):
+        return comp_year
+    return int(year) if year.is_integer() else year
+
+def ensure_meet_name_key(conn):
+    """Adds and backfills Meets.name_key, its (name_key, comp_year) index and the triggers that keep it in sync. Idempotent."""
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(Meets)")}
+    if 'name_key' not in cols:
+        conn.execute("ALTER TABLE Meets ADD COLUMN name_key TEXT")
+        conn.execute("UPDATE Meets SET name_key = LOWER(TRIM(name))")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_meets_name_key ON Meets(name_key, comp_year)")
+    # Writers that do not set name_key (or rename a meet) still get a correct key
+    for event in ("INSERT", "UPDATE OF name"):
+        trigger = "trg_meets_name_key_" + event.split()[0].lower()
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON Meets
+            WHEN NEW.name_key IS NOT LOWER(TRIM(NEW.name))
+            BEGIN
+                UPDATE Meets SET name_key = LOWER(TRIM(NEW.name)) WHERE meet_db_id = NEW.meet_db_id;
+            END
+        """)
+
+def ensure_meet_classification(conn):
+    """
+    Adds Meets.classifier_version and classifies every meet not yet classified by CLASSIFIER_VERSION:
+    competition_type is (re)computed, country only filled in where missing. Renaming or relocating a
+    meet clears its version (trigger), so it is re-classified on the next call. Idempotent.
+    """
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(Meets)")}
+    if 'classifier_version' not in cols:
+        conn.execute("ALTER TABLE Meets ADD COLUMN classifier_version INTEGER")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meets_classification_stale AFTER UPDATE OF name, location ON Meets
+        WHEN NEW.classifier_version IS NOT NULL AND (NEW.name IS NOT OLD.name OR NEW.location IS NOT OLD.location)
+        BEGIN
+            UPDATE Meets SET classifier_version = NULL WHERE meet_db_id = NEW.meet_db_id;
+        END
+    """)
+    stale = conn.execute(
+        "SELECT meet_db_id, source, name, location, country FROM Meets WHERE classifier_version IS NOT ?",
+        (CLASSIFIER_VERSION,)
+    ).fetchall()
+    updates = []
+    for meet_db_id, source, name, location, country in stale:
+        detected_country, competition_type = classify_meet(name, location, source)
+        updates.append((country or detected_country, competition_type, CLASSIFIER_VERSION, meet_db_id))
+    conn.executemany("UPDATE Meets SET country = ?, competition_type = ?, classifier_version = ? WHERE meet_db_id = ?", updates)
+    return len(updates)
+
+def _unifiable_meet_name(name):
+    """unify_meets skips unnamed meets and 'Unnamed:' placeholders (LIKE 'Unnamed:%' is ASCII case-insensitive)."""
+    return name is not None and name != '' and not str(name).translate(_ASCII_LOWER).startswith('unnamed:')
+
+class MeetResolver:
+    """
+    In-memory (name_key, comp_year) -> meet_db_ids over Meets, loaded once and shared by
+    get_or_create_meet (matching a new source_meet_id to an existing logical meet) and
+    unify_meets (finding duplicate groups). add() keeps it current after inserts and renames.
+    """
+
+    def __init__(self, conn):
+        self.ids = {}    # (name_key, year_key) -> sorted meet_db_ids
+        self.keys = {}   # meet_db_id -> (name_key, year_key)
+        self.names = {}  # meet_db_id -> name
+        for meet_db_id, name, comp_year in conn.execute("SELECT meet_db_id, name, comp_year FROM Meets"):
+            self.add(meet_db_id, name, comp_year)
+
+    def add(self, meet_db_id, name, comp_year):
+        self.discard(meet_db_id)
+        key = (normalize_meet_name(name), meet_year_key(comp_year))
+        bisect.insort(self.ids.setdefault(key, []), meet_db_id)
+        self.keys[meet_db_id] = key
+        self.names[meet_db_id] = name
+
+    def discard(self, meet_db_id):
+        key = self.keys.pop(meet_db_id, None)
+        if key is not None:
+            ids = self.ids[key]
+            ids.remove(meet_db_id)
+            if not ids:
+                del self.ids[key]
+            del self.names[meet_db_id]
+
+    def find(self, name, comp_year):
+        """Lowest meet_db_id with the same normalized name and year, or None."""
+        ids = self.ids.get((normalize_meet_name(name), meet_year_key(comp_year)))
+        return ids[0] if ids else None
+
+    def duplicate_groups(self):
+        """[(name, comp_year, canonical_id, all_ids)] for keys shared by more than one named meet."""
+        groups = []
+        for (_, year), ids in self.ids.items():
+            named = [i for i in ids if _unifiable_meet_name(self.names[i])]
+            if len(named) > 1:
+                groups.append((self.names[named[0]], year, named[0], named))
+        return groups
+
+@retry_on_lock()
+def get_or_create_meet(conn, source, source_meet_id, meet_details, cache, resolver=None):
+    """
+    Meet id for (source, source_meet_id). New ids are matched to an existing logical meet by
+    normalized name + year (through `resolver` if given, else the name_key index) before a Meets row is created.
+    """
     meet_key = (source, source_meet_id)
     if meet_key in cache: return cache[meet_key]
     
@@ -628,14 +1191,9 @@ def get_or_create_meet(conn, source, source_meet_id, meet_details, cache):
             year_match = re.search(r'(20\d{2})', str(meet_details.get('name')))
             if year_match: comp_year = int(year_match.group(1))
     
-    # Auto-detect country if not provided
-    country = meet_details.get('country')
-    if not country:
-        country = detect_country(
-            location=meet_details.get('location'),
-            source=source,
-            meet_name=meet_details.get('name')
-        )
+    # Auto-detect country if not provided (classification is memoized per name/location/source)
+    detected_country, competition_type = classify_meet(meet_details.get('name'), meet_details.get('location'), source)
+    country = meet_details.get('country') or detected_country
     
     cursor = conn.cursor()
     
@@ -646,8 +1204,15 @@ def get_or_create_meet(conn, source, source_meet_id, meet_details, cache):
     # 2. IF NOT FOUND: Try to unify based on Name + Year (Prevent logical duplication)
     # This is CRITICAL for an autonomous pipeline.
     if not result and meet_details.get('name') and comp_year and "Unnamed:" not in str(meet_details.get('name')):
-        cursor.execute("SELECT meet_db_id, comp_year, start_date_iso, location, country, name FROM Meets WHERE LOWER(TRIM(name)) = LOWER(TRIM(?)) AND comp_year = ?", (meet_details['name'], comp_year))
-        result = cursor.fetchone()
+        if resolver is not None:
+            match_id = resolver.find(meet_details['name'], comp_year)
+            if match_id is not None:
+                cursor.execute("SELECT meet_db_id, comp_year, start_date_iso, location, country, name FROM Meets WHERE meet_db_id = ?", (match_id,))
+                result = cursor.fetchone()
+        else:
+            cursor.execute("SELECT meet_db_id, comp_year, start_date_iso, location, country, name FROM Meets WHERE name_key = ? AND comp_year = ? ORDER BY meet_db_id LIMIT 1",
+                           (normalize_meet_name(meet_details['name']), comp_year))
+            result = cursor.fetchone()
         if result:
             print(f"  -> Federated Intake: Unified '{source_meet_id}' into existing meet: '{result[5]}' (ID: {result[0]})")
     
@@ -690,17 +1255,23 @@ def get_or_create_meet(conn, source, source_meet_id, meet_details, cache):
              try:
                 cursor.execute(sql, params)
                 print(f"  -> Healed metadata for meet ID {meet_db_id} ({', '.join(updates)})")
+                if resolver is not None:
+                    cursor.execute("SELECT name, comp_year FROM Meets WHERE meet_db_id = ?", (meet_db_id,))
+                    resolver.add(meet_db_id, *cursor.fetchone())
              except Exception as e:
                 print(f"  -> Warning: Failed to update meet metadata: {e}")
 
     else:
         normalized_date = parse_date_to_iso(meet_details.get('start_date_iso'))
         cursor.execute("""INSERT INTO Meets 
-            (source, source_meet_id, name, start_date_iso, comp_year, location, country, competition_type) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (source, source_meet_id, name, start_date_iso, comp_year, location, country, competition_type, classifier_version, name_key) 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (source, source_meet_id, meet_details.get('name'), normalized_date, 
-             comp_year, meet_details.get('location'), country, meet_details.get('competition_type')))
+             comp_year, meet_details.get('location'), country, meet_details.get('competition_type') or competition_type,
+             CLASSIFIER_VERSION, normalize_meet_name(meet_details.get('name'))))
         meet_db_id = cursor.lastrowid
+        if resolver is not None:
+            resolver.add(meet_db_id, meet_details.get('name'), comp_year)
         print(f"  -> New meet intake: '{meet_details.get('name')}' (ID: {meet_db_id}, Year: {comp_year})")
     
     cache[meet_key] = meet_db_id
@@ -829,3 +1400,36 @@ def mark_file_processed(conn, filepath, file_hash):
     from datetime import datetime
     cursor.execute("INSERT OR REPLACE INTO ProcessedFiles (file_path, file_hash, last_processed) VALUES (?, ?, ?)",
                    (filepath, file_hash, datetime.now().isoformat()))
+
+# ==============================================================================
+#  FILE FINGERPRINT INDEX
+#  Remembers the last hash per (path, size, mtime_ns, inode) so unchanged files
+#  are not re-hashed on every loader run.
+# ==============================================================================
+
+def get_file_signature(filepath):
+    """Returns the stat signature (size, mtime_ns, inode) of a file, or None if missing."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+def load_fingerprint_index(conn):
+    """
+    Loads {file_path: ((size, mtime_ns, inode), file_hash)} from FileFingerprints. Read-only: the
+    table is created by setup_database(); a database without it simply has no fingerprints yet.
+    """
+    try:
+        rows = conn.execute("SELECT file_path, file_size, mtime_ns, inode, file_hash FROM FileFingerprints").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {path: ((size, mtime_ns, inode), fhash) for path, size, mtime_ns, inode, fhash in rows}
+
+@retry_on_lock()
+def save_fingerprints(conn, fingerprints):
+    """Upserts (file_path, (size, mtime_ns, inode), file_hash) entries. Caller MUST commit."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO FileFingerprints (file_path, file_size, mtime_ns, inode, file_hash) VALUES (?, ?, ?, ?, ?)",
+        [(path, sig[0], sig[1], sig[2], fhash) for path, sig, fhash in fingerprints]
+    )
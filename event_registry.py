@@ -0,0 +1,130 @@
+# event_registry.py
+
+import re
+from functools import lru_cache
+
+# ==============================================================================
+#  CANONICAL EVENT / APPARATUS REGISTRY
+#  Single source of truth for apparatus names, the raw header tokens each source
+#  uses for them, and the MAG/WAG header indicators. Extractors, the writer,
+#  the standalone loaders and setup_database all read from here.
+# ==============================================================================
+
+# Canonical apparatus per discipline with display sort order (seeded into the Apparatus table)
+WAG_EVENTS = {'Vault': 1, 'Uneven Bars': 2, 'Beam': 3, 'Floor': 4, 'All Around': 99}
+MAG_EVENTS = {'Floor': 1, 'Pommel Horse': 2, 'Rings': 3, 'Vault': 4, 'Parallel Bars': 5, 'High Bar': 6, 'All Around': 99}
+OTHER_EVENTS = {'All Around': 99}
+DISCIPLINE_EVENTS = {1: WAG_EVENTS, 2: MAG_EVENTS, 99: OTHER_EVENTS}
+
+APPARATUS_NAMES = ('Vault', 'Uneven Bars', 'Beam', 'Floor', 'All Around', 'Pommel Horse', 'Rings', 'Parallel Bars', 'High Bar')
+MAG_ONLY_EVENTS = frozenset({'Pommel Horse', 'Rings', 'Parallel Bars', 'High Bar'})
+WAG_ONLY_EVENTS = frozenset({'Uneven Bars', 'Beam'})
+
+# ==============================================================================
+#  RAW TOKENS PER SOURCE
+# ==============================================================================
+
+# MSO column headers -> canonical apparatus
+MSO_EVENT_ALIASES = {
+    'VT': 'Vault', 'VAULT': 'Vault', 'UB': 'Uneven Bars', 'BARS': 'Uneven Bars', 'UNEVEN BARS': 'Uneven Bars',
+    'BB': 'Beam', 'BEAM': 'Beam', 'Balance Beam': 'Beam', 'FX': 'Floor', 'FLR': 'Floor', 'FLOOR': 'Floor',
+    'AA': 'All Around', 'ALL AROUND': 'All Around', 'PH': 'Pommel Horse', 'POMMEL HORSE': 'Pommel Horse', 'POMML': 'Pommel Horse',
+    'SR': 'Rings', 'RINGS': 'Rings', 'PB': 'Parallel Bars', 'PBARS': 'Parallel Bars', 'PARALLEL BARS': 'Parallel Bars',
+    'HB': 'High Bar', 'HIBAR': 'High Bar', 'HIGH BAR': 'High Bar'
+}
+
+# KSIS column prefixes (<prefix>_Total, <prefix>_D, ...) -> canonical apparatus
+KSIS_EVENT_ALIASES = {
+    'mfloor': 'Floor', 'horse': 'Pommel Horse', 'rings': 'Rings', 'mvault': 'Vault',
+    'pbars': 'Parallel Bars', 'hbar': 'High Bar', 'wvault': 'Vault', 'ubars': 'Uneven Bars',
+    'beam': 'Beam', 'wfloor': 'Floor',
+    'vault': 'Vault', 'bars': 'Uneven Bars', 'floor': 'Floor' # Common KSIS variants
+}
+
+# Raw (un-normalized) livemeet headers that open a D/Score/Rnk triplet
+LIVEMEET_EVENT_HEADERS = frozenset({
+    'Vault', 'Uneven_Bars', 'Uneven Bars', 'Beam', 'Floor',
+    'Pommel_Horse', 'Pommel Horse', 'PommelHorse',
+    'Rings', 'Parallel_Bars', 'Parallel Bars', 'ParallelBars',
+    'High_Bar', 'High Bar', 'HighBar',
+    'AllAround', 'All_Around', 'All Around', 'AA'
+})
+
+# raw_event values that denote the all-around (livemeet AA enrichment)
+AA_EVENT_TOKENS = frozenset({'AllAround', 'All Around', 'AA'})
+
+# Header substrings that identify a discipline (kscore also accepts 'Horizontal_Bar')
+MAG_HEADER_INDICATORS = ('Pommel_Horse', 'PommelHorse', 'Rings', 'Parallel_Bars', 'ParallelBars', 'High_Bar', 'HighBar')
+KSCORE_MAG_HEADER_INDICATORS = MAG_HEADER_INDICATORS + ('Horizontal_Bar',)
+WAG_HEADER_INDICATORS = ('Uneven_Bars', 'UnevenBars', 'Beam')
+
+def _alternation(tokens):
+    return re.compile('|'.join(re.escape(t) for t in tokens))
+
+_MAG_RE = _alternation(MAG_HEADER_INDICATORS)
+_KSCORE_MAG_RE = _alternation(KSCORE_MAG_HEADER_INDICATORS)
+_WAG_RE = _alternation(WAG_HEADER_INDICATORS)
+
+# Writer-side renames applied after underscores become spaces
+_EVENT_RENAMES = {'Balance Beam': 'Beam', 'AllAround': 'All Around', 'Horizontal Bar': 'High Bar'}
+
+# ==============================================================================
+#  LOOKUPS (memoized)
+# ==============================================================================
+
+@lru_cache(maxsize=None)
+def canonical_event(raw_event):
+    """Normalizes an extracted raw_event ('Balance_Beam', 'AllAround', ...) to its Apparatus table name."""
+    clean_name = raw_event.replace('_', ' ')
+    return _EVENT_RENAMES.get(clean_name, clean_name)
+
+@lru_cache(maxsize=None)
+def mso_event(column):
+    """Canonical apparatus for an MSO header, or None if the column is not an apparatus."""
+    name = MSO_EVENT_ALIASES.get(column.strip(), column)
+    return name if name in APPARATUS_NAMES else None
+
+def ksis_event(prefix):
+    return KSIS_EVENT_ALIASES.get(prefix, prefix)
+
+@lru_cache(maxsize=4096)
+def header_discipline(columns, kscore=False):
+    """
+    (discipline_id, discipline_name, gender_heuristic) from the first column carrying a MAG or WAG
+    indicator. `columns` must be a tuple (it is the memo key).
+    """
+    mag_re = _KSCORE_MAG_RE if kscore else _MAG_RE
+    for col in columns:
+        if mag_re.search(col): return 2, 'MAG', 'M'
+        if _WAG_RE.search(col): return 1, 'WAG', 'F'
+    return 99, 'Other', 'Unknown'
+
+@lru_cache(maxsize=4096)
+def indicator_counts(columns):
+    """(mag_count, wag_count): how many headers carry a MAG / WAG indicator."""
+    return (sum(1 for col in columns if _MAG_RE.search(col)),
+            sum(1 for col in columns if _WAG_RE.search(col)))
+
+class ApparatusLookup:
+    """
+    Memoized (raw_event, discipline_id) -> apparatus_id over an Apparatus cache {(name, discipline_id): id}.
+    Tries the canonical name, then the raw name, then the canonical name under 'Other' (99).
+    Returns None for events with no Apparatus row.
+    """
+
+    def __init__(self, apparatus_cache):
+        self.apparatus = apparatus_cache
+        self._ids = {}
+
+    def get(self, raw_event, discipline_id):
+        key = (raw_event, discipline_id)
+        if key in self._ids:
+            return self._ids[key]
+        clean_name = canonical_event(raw_event)
+        apparatus_id = self.apparatus.get((clean_name, discipline_id))
+        if apparatus_id is None:
+            apparatus_id = self.apparatus.get((raw_event, discipline_id))
+        if apparatus_id is None:
+            apparatus_id = self.apparatus.get((clean_name, 99))
+        self._ids[key] = apparatus_id
+        return apparatus_id
@@ -1,23 +1,364 @@
 import os
 import re
 import json
+import hashlib
+from array import array
+
+import event_registry
+
+# ==============================================================================
+#  COLUMNAR TRANSPORT
+#  Compact alternative to the nested `results` list of a data package. Parallel
+#  arrays of athlete rows, apparatus rows and metadata pairs index into one
+#  interned value table, so pickling a package across the process pool ships a
+#  few flat buffers instead of thousands of small dicts.
+# ==============================================================================
+
+class ColumnarResults:
+    """
+    Columnar container for extracted athlete results.
+    Behaves like the list of athlete dicts it replaces (len, indexing, iteration),
+    materializing one athlete dict at a time on access.
+    """
+    APPARATUS_FIELDS = ('raw_event', 'score_final', 'score_d', 'score_sv', 'score_e', 'bonus',
+                        'penalty', 'rank_text', 'execution_bonus', 'score_text')
+    FLAG_FIELDS = ('calculated', 'calculated_d')
+
+    def __init__(self):
+        self.values = []            # Interned value table (str / float / ...)
+        self._value_ids = {}        # Build-time only, not pickled
+        self.name = array('i'); self.club = array('i'); self.gender = array('i')
+        self.discipline = array('i')
+        self.meta_end = array('i'); self.meta_key = array('i'); self.meta_val = array('i')
+        self.app_end = array('i'); self.app_flags = array('b')
+        self.app_cols = {}          # Created lazily: fields that are always None cost nothing
+
+    @classmethod
+    def from_results(cls, results):
+        columnar = cls()
+        for athlete_res in results:
+            columnar.append(athlete_res)
+        return columnar
+
+    def _intern(self, value):
+        if value is None:
+            return -1
+        key = (type(value), value)
+        idx = self._value_ids.get(key)
+        if idx is None:
+            idx = len(self.values)
+            self.values.append(value)
+            self._value_ids[key] = idx
+        return idx
+
+    def append(self, athlete_res):
+        self.name.append(self._intern(athlete_res.get('raw_name')))
+        self.club.append(self._intern(athlete_res.get('raw_club')))
+        self.gender.append(self._intern(athlete_res.get('gender_heuristic')))
+        self.discipline.append(athlete_res.get('discipline_id') or 0)
+        for key, val in athlete_res.get('dynamic_metadata', {}).items():
+            self.meta_key.append(self._intern(key))
+            self.meta_val.append(self._intern(val))
+        self.meta_end.append(len(self.meta_key))
+        for app_res in athlete_res.get('apparatus_results', []):
+            row = len(self.app_flags)
+            for field in self.APPARATUS_FIELDS:
+                val = app_res.get(field)
+                col = self.app_cols.get(field)
+                if col is None:
+                    if val is None: continue
+                    col = self.app_cols[field] = array('i', [-1]) * row
+                col.append(self._intern(val))
+            flags = 0
+            for bit, flag in enumerate(self.FLAG_FIELDS):
+                if app_res.get(flag): flags |= 1 << bit
+            self.app_flags.append(flags)
+        self.app_end.append(len(self.app_flags))
+
+    def _value(self, idx):
+        return None if idx < 0 else self.values[idx]
+
+    def metadata_keys(self):
+        """Distinct dynamic metadata keys across all athletes."""
+        return {self.values[k] for k in set(self.meta_key)}
+
+    def identities(self):
+        """(raw_name, raw_club, gender_heuristic) per athlete, without materializing results."""
+        v = self._value
+        return [(v(n), v(c), v(g)) for n, c, g in zip(self.name, self.club, self.gender)]
+
+    def __len__(self):
+        return len(self.name)
+
+    def __getitem__(self, i):
+        v = self._value
+        meta_start = self.meta_end[i - 1] if i > 0 else 0
+        app_start = self.app_end[i - 1] if i > 0 else 0
+        apparatus_results = []
+        for j in range(app_start, self.app_end[i]):
+            app_res = {field: v(col[j]) for field, col in self.app_cols.items()}
+            for bit, flag in enumerate(self.FLAG_FIELDS):
+                if self.app_flags[j] & (1 << bit): app_res[flag] = True
+            apparatus_results.append(app_res)
+        return {
+            'raw_name': v(self.name[i]),
+            'raw_club': v(self.club[i]),
+            'discipline_id': self.discipline[i],
+            'gender_heuristic': v(self.gender[i]),
+            'apparatus_results': apparatus_results,
+            'dynamic_metadata': {v(self.meta_key[k]): v(self.meta_val[k]) for k in range(meta_start, self.meta_end[i])}
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getstate__(self):
+        # Ship indexes as 16-bit when the value table is small enough (the common case)
+        state = self.__dict__.copy()
+        state['_value_ids'] = None
+        if len(self.values) < 32767 and len(self.meta_key) < 32767 and len(self.app_flags) < 32767:
+            for key, val in state.items():
+                if isinstance(val, array) and val.typecode == 'i':
+                    state[key] = array('h', val)
+            state['app_cols'] = {f: array('h', col) for f, col in self.app_cols.items()}
+        return state
+
+def to_columnar(package):
+    """Swaps the nested results list of an extraction package for a ColumnarResults (in place)."""
+    if package and isinstance(package.get('results'), list):
+        package['results'] = ColumnarResults.from_results(package['results'])
+    return package
+
+# ==============================================================================
+#  EXTRACTION PLANS
+#  Everything an extractor derives from a file's header row alone (name/club
+#  columns, discipline, event map, metadata columns, column positions) is kept
+#  as a plan keyed by a hash of that header. Files sharing a layout skip the
+#  detection. Plans are JSON files under PLAN_CACHE_DIR, one per layout, so the
+#  pool workers share them across processes and runs; a plan is only reused by
+#  the same extractor code: each code fingerprint has its own subdirectory, and
+#  prune_stale_plans() deletes those of other fingerprints.
+# ==============================================================================
+
+PLAN_VERSION = 1
+PLAN_CACHE_DIR = "extraction_plans"  # None disables the on-disk store (plans stay per process)
+
+_PLANS = {}
+_plan_stats = {'memory': 0, 'disk': 0, 'built': 0}
+
+def set_plan_cache_dir(path):
+    """Where plans are persisted (None = in-memory only). Call before the worker pool starts."""
+    global PLAN_CACHE_DIR
+    PLAN_CACHE_DIR = path or None
+
+def prune_stale_plans():
+    """
+    Deletes plans written by other extractor code (subdirectories named by another fingerprint,
+    and the flat files of the former one-directory layout). Call once per run, before the pool.
+    """
+    if not PLAN_CACHE_DIR or not os.path.isdir(PLAN_CACHE_DIR):
+        return 0
+    import shutil
+    current = _plan_code_fingerprint()
+    removed = 0
+    for entry in os.listdir(PLAN_CACHE_DIR):
+        name = entry[:-len('.json')] if entry.endswith('.json') else entry
+        if name == current or not re.fullmatch(r'[0-9a-f]{40}', name):
+            continue  # Only what this store wrote is ever deleted
+        path = os.path.join(PLAN_CACHE_DIR, entry)
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"Warning: Could not remove stale extraction plans '{path}'. Error: {e}")
+    return removed
+
+def plan_cache_stats():
+    return dict(_plan_stats, size=len(_PLANS))
+
+_code_fingerprint = None
+
+def _plan_code_fingerprint():
+    """Hash of the extractor and registry source: edited detection code never reuses old plans."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.sha1(str(PLAN_VERSION).encode())
+        for module_file in (__file__, event_registry.__file__):
+            with open(module_file, 'rb') as f:
+                digest.update(f.read())
+        _code_fingerprint = digest.hexdigest()
+    return _code_fingerprint
+
+def _plan_key(kind, header):
+    text = '\x1f'.join([kind] + [str(col) for col in header])
+    return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+def _plan_dir():
+    return os.path.join(PLAN_CACHE_DIR, _plan_code_fingerprint())
+
+def _read_plan(key):
+    if not PLAN_CACHE_DIR:
+        return None
+    try:
+        with open(os.path.join(_plan_dir(), f"{key}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_plan(key, plan):
+    if not PLAN_CACHE_DIR:
+        return
+    path = os.path.join(_plan_dir(), f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"  # Workers may write the same plan at once; each replace is atomic
+    try:
+        os.makedirs(_plan_dir(), exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(plan, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: Could not persist extraction plan to '{path}'. Error: {e}")
+
+def extraction_plan(kind, header, build):
+    """
+    The plan for this header layout: from memory, from PLAN_CACHE_DIR, or build(header) (then stored).
+    Plans round-trip through JSON, so a fresh plan looks exactly like a loaded one (lists, not tuples).
+    """
+    header = [str(col) for col in header]
+    key = _plan_key(kind, header)
+    plan = _PLANS.get(key)
+    if plan is not None:
+        _plan_stats['memory'] += 1
+        return plan
+    plan = _read_plan(key)
+    if plan is not None and plan.get('header') == header:
+        _plan_stats['disk'] += 1
+    else:
+        plan = json.loads(json.dumps(dict(build(header), header=header)))
+        _plan_stats['built'] += 1
+        _write_plan(key, plan)
+    _PLANS[key] = plan
+    return plan
 
 # ==============================================================================
 #  KSCORE EXTRACTION
 # ==============================================================================
 
+def _map_values(values, func):
+    """func over an object array, evaluated once per distinct value (nulls one by one: None and NaN differ)."""
+    import numpy as np
+    import pandas as pd
+    flat = values.ravel()
+    codes, uniques = pd.factorize(flat)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(u) for u in uniques]
+    out = mapped[codes]
+    nulls = np.flatnonzero(codes < 0)
+    if len(nulls):
+        out[nulls] = [func(v) for v in flat[nulls]]
+    return out.reshape(values.shape)
+
+def _column_values(df, name, default=None):
+    """Object array of a column; a missing column reads as `default` (what row.get() returned)."""
+    import numpy as np
+    if name is not None and name in df.columns:
+        return df[name].to_numpy(dtype=object)
+    return np.full(len(df), default, dtype=object)
+
+def _value_flags(values, predicate):
+    """Boolean array of predicate(value), evaluated once per distinct value."""
+    return _map_values(values, predicate).astype(bool)
+
+SCRATCH_MARKERS = ('S', 'DNS', 'SCRATCH', 'SCR', 'WD', 'SC')
+
+def _is_numeric_text(s):
+    try:
+        float(str(s).strip().replace(',', ''))
+        return True
+    except:
+        return False
+
+def _is_scratch_mark(score_val):
+    s_val_upper = str(score_val).strip().upper()
+    return s_val_upper in SCRATCH_MARKERS or s_val_upper.startswith('SCR')
+
+def _read_csv_frames(filepath, chunk_rows=None):
+    """
+    (first_frame, remaining_frames) of a result CSV read as the extractors read it: the whole
+    file at once, or chunk_rows rows per frame. The first frame is read here, so a file that
+    cannot be opened or parsed fails up front exactly like the single read.
+    Chunks use the python parser: the C parser's chunked mode silently truncates an over-long
+    row that starts a chunk, where the single read rejects the file. Short rows are padded
+    with '' as the C parser pads them (the python parser leaves NaN).
+    """
+    import pandas as pd
+    if not chunk_rows:
+        return pd.read_csv(filepath, keep_default_na=False, dtype=str), iter(())
+    reader = pd.read_csv(filepath, keep_default_na=False, dtype=str, chunksize=chunk_rows, engine='python')
+    try:
+        first = next(reader).fillna('')
+    except StopIteration:
+        reader.close()
+        return pd.read_csv(filepath, keep_default_na=False, dtype=str), iter(())
+    except Exception:
+        reader.close()
+        raise
+    return first, _closing_frames(reader)
+
+def _closing_frames(reader):
+    with reader:
+        for frame in reader:
+            yield frame.fillna('')
+
+def _kscore_plan(columns):
+    """Header-only detection for extract_kscore_data (see EXTRACTION PLANS)."""
+    # Detect Discipline
+    discipline = event_registry.header_discipline(tuple(columns), kscore=True)
+
+    # Key Mapping
+    KEY_MAP = {'Gymnast': 'Name', 'Athlete': 'Name', 'Name': 'Name', 'Club': 'Club', 'Team': 'Club', 'Level': 'Level', 'Age': 'Age', 'Prov': 'Prov'}
+    col_map = {col: KEY_MAP.get(col, col) for col in columns}
+    name_col = next((c for c, v in col_map.items() if v == 'Name'), None)
+
+    result_columns = [col for col in columns if col.startswith('Result_')]
+    event_bases = {}
+    for col in result_columns:
+        match = re.search(r'Result_(.*)_(Score|D|Rnk)$', col)
+        if match:
+            event_bases[match.group(1)] = match.group(1)
+
+    ignore_cols = list(event_bases.keys()) + result_columns + [name_col]
+    if 'Club' in columns: ignore_cols.append('Club')
+    
+    dynamic_cols = []
+    for col in columns:
+        if col not in ignore_cols and not col.startswith('Result_'):
+            dynamic_cols.append(col)
+
+    return {'name_col': name_col, 'discipline': discipline, 'events': list(event_bases), 'dynamic_cols': dynamic_cols}
+
 def extract_kscore_data(filepath, meet_details, level_alias_map):
     """
     Extracts data from a single Kscore CSV without DB interaction.
+    Result_<event>_(D|Score|Rnk) columns are processed column-wise; the package matches the
+    former row-by-row extraction (see test_kscore_extraction.py).
     """
-    import pandas as pd
+    return next(iter_kscore_batches(filepath, meet_details, level_alias_map), None)
+
+def iter_kscore_batches(filepath, meet_details, level_alias_map, chunk_rows=None):
+    """extract_kscore_data as packages of at most chunk_rows CSV rows each (one package if chunk_rows is None)."""
+    import numpy as np
+    from itertools import chain
     try:
-        df = pd.read_csv(filepath, keep_default_na=False, dtype=str)
+        df, more_frames = _read_csv_frames(filepath, chunk_rows)
         if df.empty:
-            return None
+            return
     except Exception as e:
         print(f"Warning: Could not read CSV file '{filepath}'. Error: {e}")
-        return None
+        return
 
     filename = os.path.basename(filepath)
     full_source_id = filename.split('_FINAL_')[0]
@@ -30,379 +371,349 @@ def extract_kscore_data(filepath, meet_details, level_alias_map):
         if 'Year' in df.columns and not df.empty:
             meet_details['year'] = df['Year'].iloc[0]
 
-    # Detect Discipline
-    MAG_INDICATORS = {'Pommel_Horse', 'PommelHorse', 'Rings', 'Parallel_Bars', 'ParallelBars', 'High_Bar', 'HighBar', 'Horizontal_Bar'}
-    WAG_INDICATORS = {'Uneven_Bars', 'UnevenBars', 'Beam'}
-    discipline_id = 99
-    discipline_name = 'Other'
-    gender_heuristic = 'Unknown'
-    
-    for col in df.columns:
-        if any(indicator in col for indicator in MAG_INDICATORS):
-            discipline_id = 2
-            discipline_name = 'MAG'
-            gender_heuristic = 'M'
-            break
-        if any(indicator in col for indicator in WAG_INDICATORS):
-            discipline_id = 1
-            discipline_name = 'WAG'
-            gender_heuristic = 'F'
-            break
-
-    # Key Mapping
-    KEY_MAP = {'Gymnast': 'Name', 'Athlete': 'Name', 'Name': 'Name', 'Club': 'Club', 'Team': 'Club', 'Level': 'Level', 'Age': 'Age', 'Prov': 'Prov'}
-    col_map = {col: KEY_MAP.get(col, col) for col in df.columns}
-    name_col = next((c for c, v in col_map.items() if v == 'Name'), None)
+    plan = extraction_plan('kscore', df.columns, _kscore_plan)
+    discipline_id, discipline_name, gender_heuristic = plan['discipline']
+    name_col = plan['name_col']
     
     if not name_col:
-        return None
+        return
 
-    result_columns = [col for col in df.columns if col.startswith('Result_')]
-    event_bases = {}
-    for col in result_columns:
-        match = re.search(r'Result_(.*)_(Score|D|Rnk)$', col)
-        if match:
-            event_bases[match.group(1)] = match.group(1)
+    event_bases = plan['events']
+    dynamic_cols = plan['dynamic_cols']
 
-    ignore_cols = list(event_bases.keys()) + result_columns + [name_col]
-    if 'Club' in df.columns: ignore_cols.append('Club')
-    
-    dynamic_cols = []
-    for col in df.columns:
-        if col not in ignore_cols and not col.startswith('Result_'):
-            dynamic_cols.append(col)
+    for df in chain([df], more_frames):
+        # --- Column-wise extraction: (event x row) matrices instead of df.iterrows() ---
+        # Missing columns read as None and ragged cells as NaN, exactly as row.get() returned them
+        n_rows = len(df)
+        def column(name, default=None):
+            return _column_values(df, name, default)
 
-    extracted_results = []
-    for _, row in df.iterrows():
-        raw_name = row.get(name_col)
-        if not raw_name: continue
-        
-        raw_level = row.get('Level', '')
-        mapped_level = level_alias_map.get(raw_level, raw_level)
-        
-        dynamic_values = {}
-        for col in dynamic_cols:
-            val = row.get(col)
-            if col == 'Level': val = mapped_level
-            if val: dynamic_values[col] = str(val)
+        raw_names = column(name_col)
+        raw_clubs = column('Club', '')
+        mapped_levels = _map_values(column('Level', ''), lambda level: level_alias_map.get(level, level))
+        metadata = [(col, mapped_levels if col == 'Level' else column(col)) for col in dynamic_cols]
 
-        apparatus_results = []
-        for raw_event in event_bases:
-            d_val = row.get(f'Result_{raw_event}_D')
-            score_val = row.get(f'Result_{raw_event}_Score')
-            rank_val = row.get(f'Result_{raw_event}_Rnk')
-            bonus_val = row.get(f'Result_{raw_event}_Bonus')
-            exec_bonus_val = row.get(f'Result_{raw_event}_Exec_Bonus') or row.get(f'Result_{raw_event}_Execution_Bonus')
-            
-            if not score_val and not d_val: continue
+        events = event_bases
+        if events:
+            d_vals = np.array([column(f'Result_{ev}_D') for ev in events])
+            score_vals = np.array([column(f'Result_{ev}_Score') for ev in events])
+            rank_vals = np.array([column(f'Result_{ev}_Rnk') for ev in events])
+            bonus_vals = np.array([column(f'Result_{ev}_Bonus') for ev in events])
+            exec_vals = np.array([column(f'Result_{ev}_Exec_Bonus') for ev in events])
+            exec_alt_vals = np.array([column(f'Result_{ev}_Execution_Bonus') for ev in events])
+            exec_vals = np.where(_value_flags(exec_vals, bool), exec_vals, exec_alt_vals)
 
             # --- Score Swapping / Preference Logic ---
             # For Interclub/Level 1, Kscore often puts numeric score in D and award text in Score.
-            def is_numeric(s):
-                try:
-                    float(str(s).strip().replace(',', ''))
-                    return True
-                except:
-                    return False
-            
-            actual_score = score_val
-            actual_d = d_val
-            actual_rank = rank_val
-            
-            # Define scratch markers
-            scratch_markers = ['S', 'DNS', 'SCRATCH', 'SCR', 'WD', 'SC']
-            s_val_upper = str(score_val).strip().upper()
-            is_scratch = any(marker == s_val_upper for marker in scratch_markers) or s_val_upper.startswith('SCR')
-
-            if is_numeric(d_val) and not is_numeric(score_val) and not is_scratch:
-                # Swap: use numeric D as the actual score
-                actual_score = d_val
-                # If rank is empty, move the non-numeric "Score" (e.g. "Gold") to rank_text
-                if not rank_val or str(rank_val).strip() == '':
-                    actual_rank = score_val
-            elif not is_numeric(score_val) and (score_val and str(score_val).strip() != ''):
-                # If Score is non-numeric (e.g. "Silver") and D is not a trigger,
-                # move the Score to rank_text if rank is empty.
-                if not rank_val or str(rank_val).strip() == '':
-                    actual_rank = score_val
-            
-            apparatus_results.append({
-                'raw_event': raw_event,
-                'score_final': actual_score,
-                'score_d': actual_d,
-                'rank_text': actual_rank,
-                'bonus': bonus_val,
-                'execution_bonus': exec_bonus_val
-            })
+            score_blank = ~_value_flags(score_vals, bool)
+            present = ~(score_blank & ~_value_flags(d_vals, bool))
+            score_numeric = _value_flags(score_vals, _is_numeric_text)
+            swap = _value_flags(d_vals, _is_numeric_text) & ~score_numeric & ~_value_flags(score_vals, _is_scratch_mark)
+            # A non-numeric Score (e.g. "Gold"/"Silver") moves to rank_text when the rank is empty
+            award = swap | (~score_numeric & _value_flags(score_vals, lambda v: bool(v) and str(v).strip() != ''))
+            rank_empty = _value_flags(rank_vals, lambda v: not v or str(v).strip() == '')
+            actual_scores = np.where(swap, d_vals, score_vals)
+            actual_ranks = np.where(award & rank_empty, score_vals, rank_vals)
 
-        extracted_results.append({
-            'raw_name': raw_name,
-            'raw_club': row.get('Club', ''),
-            'discipline_id': discipline_id,
-            'gender_heuristic': gender_heuristic,
-            'apparatus_results': apparatus_results,
-            'dynamic_metadata': dynamic_values
-        })
+            # Row-major (athlete, event) order of the kept cells, split back per athlete
+            present = present.T
+            row_idx, event_idx = np.nonzero(present)
+            cells = (event_idx, row_idx)
+            records = [
+                {'raw_event': events[e], 'score_final': s, 'score_d': d, 'rank_text': r, 'bonus': b, 'execution_bonus': x}
+                for e, s, d, r, b, x in zip(event_idx.tolist(), actual_scores[cells], d_vals[cells], actual_ranks[cells],
+                                            bonus_vals[cells], exec_vals[cells])
+            ]
+            offsets = np.concatenate(([0], np.cumsum(present.sum(axis=1)))).tolist()
+        else:
+            records, offsets = [], [0] * (n_rows + 1)
 
-    return {
-        'source': 'kscore',
-        'source_meet_id': source_meet_id,
-        'meet_details': meet_details,
-        'results': extracted_results
-    }
+        meta_names = [col for col, _ in metadata]
+        meta_rows = zip(*[values for _, values in metadata]) if metadata else [()] * n_rows
+        name_present = _value_flags(raw_names, bool)
+
+        extracted_results = []
+        for i, meta_vals in enumerate(meta_rows):
+            if not name_present[i]: continue
+            extracted_results.append({
+                'raw_name': raw_names[i],
+                'raw_club': raw_clubs[i],
+                'discipline_id': discipline_id,
+                'gender_heuristic': gender_heuristic,
+                'apparatus_results': records[offsets[i]:offsets[i + 1]],
+                'dynamic_metadata': {col: str(val) for col, val in zip(meta_names, meta_vals) if val}
+            })
+
+        yield {
+            'source': 'kscore',
+            'source_meet_id': source_meet_id,
+            'meet_details': meet_details,
+            'results': extracted_results
+        }
 
 # ==============================================================================
 #  LIVEMEET EXTRACTION
 # ==============================================================================
 
+LIVEMEET_HEADER_SCAN_ROWS = 10  # The header row is looked for among the first records only
+LIVEMEET_SESSION_MARKERS = ('Day', 'Session', 'Flight', 'Combined', 'Finals', 'Apparatus Final')
+# Per-event fields, in the order of the precomputed column indexes
+LIVEMEET_EVENT_FIELDS = ('Total', 'Score', 'D', 'SV', 'E', 'Bonus', 'Penalty', 'Rnk', 'Exec_Bonus', 'Execution_Bonus')
+
+def _livemeet_plan(raw_headers):
+    """
+    Header-only detection for extract_livemeet_data (see EXTRACTION PLANS). Column names are the
+    csv-parsed header fields, so a quoted comma stays inside its column name.
+    """
+    headers = [p.strip() for p in raw_headers]
+
+    # Deduplicate headers if Sportzsoft triplet logic is not yet applied
+    seen_counts = {}
+    deduped_headers = []
+    is_normalized = any(h.startswith('Result_') for h in headers)
+
+    if is_normalized:
+        deduped_headers = headers
+    else:
+        for col in headers:
+            base = col.split('.')[0]
+            if base in event_registry.LIVEMEET_EVENT_HEADERS:
+                count = seen_counts.get(base, 0)
+                seen_counts[base] = count + 1
+                triplet_pos = count % 3
+                triplet_num = count // 3
+                suffix = ['D', 'Score', 'Rnk'][triplet_pos]
+                proposed_name = f"Result_{base}_{suffix}" if triplet_num == 0 else f"EXTRA_{base}_{triplet_num}_{suffix}"
+                deduped_headers.append(proposed_name)
+            else:
+                deduped_headers.append(col)
+
+    # Event identification
+    result_columns = [h for h in deduped_headers if h.startswith('Result_')]
+    event_bases = {}
+    for col in result_columns:
+        match = re.search(r'Result_(.*)_(Score|D|E|Rnk|Total)$', col)
+        if match: 
+            base_name = match.group(1)
+            # EXPLICITLY IGNORE PHYSICAL PREPARATION
+            if 'physical' in base_name.lower():
+                continue
+            event_bases[base_name] = base_name
+
+    # Discipline Detection
+    mag_score, wag_score = event_registry.indicator_counts(tuple(deduped_headers))
+
+    discipline_id = 2 if mag_score >= wag_score and mag_score > 0 else 1
+    gender_heuristic = 'M' if discipline_id == 2 else 'F'
+
+    ignore_cols = list(event_bases.keys()) + result_columns + ['Name', 'Club']
+    dynamic_cols = [h for h in deduped_headers if h not in ignore_cols and not h.startswith('Result_')]
+
+    # Column positions are resolved against the file's own header row (last duplicate wins,
+    # as with a dict per row); fields the row does not reach read as None.
+    positions = {col: i for i, col in enumerate(raw_headers)}
+    name_pos = positions.get('Name')
+    club_pos = positions.get('Club')
+    meet_pos = positions.get('Meet')
+    event_positions = [
+        (raw_event, [positions.get(f'Result_{raw_event}_{field}') for field in LIVEMEET_EVENT_FIELDS])
+        for raw_event in event_bases
+    ]
+    # Header-only checks of the dynamic metadata columns, done once per layout
+    dynamic_fields = []
+    for col in dynamic_cols:
+        safe_key = str(col).strip()
+        if "unnamed" in safe_key.lower(): continue
+        if len(safe_key) > 60: continue # Some are long but we need them
+        is_session_col = any(m.lower() in safe_key.lower() for m in LIVEMEET_SESSION_MARKERS)
+        dynamic_fields.append((safe_key, positions.get(col), is_session_col, safe_key.count(' ') > 4))
+
+    return {
+        'discipline_id': discipline_id, 'gender_heuristic': gender_heuristic,
+        'name_pos': name_pos, 'club_pos': club_pos, 'meet_pos': meet_pos,
+        'event_positions': event_positions, 'dynamic_fields': dynamic_fields
+    }
+
 def extract_livemeet_data(filepath, meet_details):
     """
-    Extracts data from a single Livemeet CSV using standard csv module for speed and robustness.
+    Extracts data from a single Livemeet CSV in one streaming pass: the header is found in a
+    bounded prefix, then rows are read positionally from the file handle with csv.reader.
+    """
+    return next(iter_livemeet_batches(filepath, meet_details), None)
+
+def iter_livemeet_batches(filepath, meet_details, chunk_rows=None):
+    """
+    extract_livemeet_data as packages of at most chunk_rows athletes each (one package if
+    chunk_rows is None). The meet name is taken from the first row that carries one, so with
+    chunks it must appear within the first batch (the writer resolves the meet from it).
     """
     import csv
+    from itertools import chain
     
+    batches = 0
     try:
-        # We read the file twice: once to find the header row, then to parse
         with open(filepath, 'r', encoding='utf-8-sig', errors='replace') as f:
-            lines = f.readlines()
-            
-        if not lines:
-            return None
-            
-        # Find header row index
-        header_idx = -1
-        for i, line in enumerate(lines[:10]):
-            parts = [p.strip() for p in line.split(',')]
-            if 'Name' in parts and 'Club' in parts:
-                header_idx = i
-                break
-        
-        if header_idx == -1:
-            # Fallback: assume first line is header if it has 'Name' or '@' (some Sportzsoft)
-            header_idx = 0
-            
-        headers = [p.strip() for p in lines[header_idx].split(',')]
-        
-        # Deduplicate headers if Sportzsoft triplet logic is not yet applied
-        seen_cols = {}
-        seen_counts = {}
-        deduped_headers = []
-        is_normalized = any(h.startswith('Result_') for h in headers)
-        
-        if is_normalized:
-            deduped_headers = headers
-        else:
-            raw_apps = [
-                'Vault', 'Uneven_Bars', 'Uneven Bars', 'Beam', 'Floor', 
-                'Pommel_Horse', 'Pommel Horse', 'PommelHorse', 
-                'Rings', 'Parallel_Bars', 'Parallel Bars', 'ParallelBars', 
-                'High_Bar', 'High Bar', 'HighBar', 
-                'AllAround', 'All_Around', 'All Around', 'AA'
-            ]
-            for col in headers:
-                base = col.split('.')[0]
-                if base in raw_apps:
-                    count = seen_counts.get(base, 0)
-                    seen_counts[base] = count + 1
-                    triplet_pos = count % 3
-                    triplet_num = count // 3
-                    suffix = ['D', 'Score', 'Rnk'][triplet_pos]
-                    proposed_name = f"Result_{base}_{suffix}" if triplet_num == 0 else f"EXTRA_{base}_{triplet_num}_{suffix}"
-                    deduped_headers.append(proposed_name)
-                else:
-                    deduped_headers.append(col)
+            reader = csv.reader(f)
+            prefix = []
+            for record in reader:
+                prefix.append(record)
+                if len(prefix) >= LIVEMEET_HEADER_SCAN_ROWS:
+                    break
 
-        # Parse data rows
-        import io
-        content = "".join(lines[header_idx:])
-        
-        filename = os.path.basename(filepath)
-        source_meet_id = filename.split('_FINAL_')[0]
-        if '_PEREVENT_' in source_meet_id: source_meet_id = source_meet_id.split('_PEREVENT_')[0]
-        if '_BYEVENT_' in source_meet_id: source_meet_id = source_meet_id.split('_BYEVENT_')[0]
-
-        # Fetch basic meet info
-        if not meet_details.get('name'):
-            # Try to get from first data row 'Meet' column
-            pass 
-
-        # Event identification
-        result_columns = [h for h in deduped_headers if h.startswith('Result_')]
-        event_bases = {}
-        for col in result_columns:
-            match = re.search(r'Result_(.*)_(Score|D|E|Rnk|Total)$', col)
-            if match: 
-                base_name = match.group(1)
-                # EXPLICITLY IGNORE PHYSICAL PREPARATION
-                if 'physical' in base_name.lower():
-                    continue
-                event_bases[base_name] = base_name
-
-        # Discipline Detection
-        MAG_INDICATORS = {'Pommel_Horse', 'PommelHorse', 'Rings', 'Parallel_Bars', 'ParallelBars', 'High_Bar', 'HighBar'}
-        WAG_INDICATORS = {'Uneven_Bars', 'UnevenBars', 'Beam'}
-        mag_score = 0; wag_score = 0
-        for col in deduped_headers:
-            if any(ind in col for ind in MAG_INDICATORS): mag_score += 1
-            if any(ind in col for ind in WAG_INDICATORS): wag_score += 1
-        
-        discipline_id = 2 if mag_score >= wag_score and mag_score > 0 else 1
-        gender_heuristic = 'M' if discipline_id == 2 else 'F'
+            if not prefix:
+                return
 
-        ignore_cols = list(event_bases.keys()) + result_columns + ['Name', 'Club']
-        dynamic_cols = [h for h in deduped_headers if h not in ignore_cols and not h.startswith('Result_')]
+            # Find header row index
+            header_idx = -1
+            for i, record in enumerate(prefix):
+                parts = [p.strip() for p in record]
+                if 'Name' in parts and 'Club' in parts:
+                    header_idx = i
+                    break
 
-        extracted_results = []
-        
-        f_stream = io.StringIO(content)
-        reader = csv.DictReader(f_stream)
-        
-        for row in reader:
-            raw_name = row.get('Name')
-            if not raw_name: continue
-            
-            # Basic normalization for meet name if missing
-            if not meet_details.get('name') and row.get('Meet'):
-                meet_details['name'] = row.get('Meet')
-
-            dynamic_values = {}
-            session_markers = ['Day', 'Session', 'Flight', 'Combined', 'Finals', 'Apparatus Final']
-            for col in dynamic_cols:
-                val = row.get(col)
-                if not val or str(val).strip() == '': continue
-                safe_key = str(col).strip()
-                if "unnamed" in safe_key.lower(): continue
-                if len(safe_key) > 60: continue # Some are long but we need them
-                
-                # Heuristic: if column header looks like a session and we don't have one yet
-                if any(m.lower() in safe_key.lower() for m in session_markers):
-                    if 'session' not in dynamic_values:
-                        dynamic_values['session'] = str(val).strip()
-                
-                if safe_key.count(' ') > 4 and safe_key not in dynamic_values.get('session', ''): continue
-                dynamic_values[safe_key] = str(val).strip()
+            if header_idx == -1:
+                # Fallback: assume first line is header if it has 'Name' or '@' (some Sportzsoft)
+                header_idx = 0
 
-            apparatus_results = []
-            for raw_event in event_bases:
-                # Prioritize 'Total' column over 'Score' column if it exists. 
-                # This is crucial for multi-day 'Combined' DETAILED files where 'Score' is often Day 1.
-                score_val = row.get(f'Result_{raw_event}_Total') or row.get(f'Result_{raw_event}_Score')
-                d_val = row.get(f'Result_{raw_event}_D')
-                sv_val = row.get(f'Result_{raw_event}_SV')
-                e_val = row.get(f'Result_{raw_event}_E')
-                bonus_val = row.get(f'Result_{raw_event}_Bonus')
-                penalty_val = row.get(f'Result_{raw_event}_Penalty')
-                rank_val = row.get(f'Result_{raw_event}_Rnk')
-                exec_bonus_val = row.get(f'Result_{raw_event}_Exec_Bonus') or row.get(f'Result_{raw_event}_Execution_Bonus')
-                
-                if (not score_val or str(score_val).strip() == '') and \
-                   (not d_val or str(d_val).strip() == '') and \
-                   (not sv_val or str(sv_val).strip() == ''):
-                    continue
-                
-                # Fallback: SV is often used for Difficulty
-                if (not d_val or str(d_val).strip() == '') and (sv_val and str(sv_val).strip() != ''):
-                    d_val = sv_val
-
-                app_res = {
-                    'raw_event': raw_event,
-                    'score_final': score_val,
-                    'score_d': d_val,
-                    'score_sv': sv_val,
-                    'score_e': e_val,
-                    'bonus': bonus_val,
-                    'penalty': penalty_val,
-                    'rank_text': rank_val,
-                    'execution_bonus': exec_bonus_val
+            plan = extraction_plan('livemeet', prefix[header_idx], _livemeet_plan)
+            discipline_id, gender_heuristic = plan['discipline_id'], plan['gender_heuristic']
+            name_pos, club_pos, meet_pos = plan['name_pos'], plan['club_pos'], plan['meet_pos']
+            event_positions, dynamic_fields = plan['event_positions'], plan['dynamic_fields']
+
+            filename = os.path.basename(filepath)
+            source_meet_id = filename.split('_FINAL_')[0]
+            if '_PEREVENT_' in source_meet_id: source_meet_id = source_meet_id.split('_PEREVENT_')[0]
+            if '_BYEVENT_' in source_meet_id: source_meet_id = source_meet_id.split('_BYEVENT_')[0]
+
+            def package(results):
+                return {
+                    'source': 'livemeet',
+                    'source_meet_id': source_meet_id,
+                    'meet_details': meet_details,
+                    'results': results
                 }
-                
-                # Score Swap Logic (For Level 1/Awards)
-                def is_numeric(s):
-                    try:
-                        if not s: return False
-                        float(str(s).strip().replace(',', ''))
-                        return True
-                    except: return False
-                
-                # Define scratch markers
-                scratch_markers = ['S', 'DNS', 'SCRATCH', 'SCR', 'WD', 'SC']
-                s_val_upper = str(app_res['score_final']).strip().upper()
-                is_scratch = any(marker == s_val_upper for marker in scratch_markers) or s_val_upper.startswith('SCR')
-
-                if is_numeric(app_res['score_d']) and not is_numeric(app_res['score_final']) and not is_scratch:
-                    app_res['score_final'] = app_res['score_d']
-                
-                apparatus_results.append(app_res)
 
-            extracted_results.append({
-                'raw_name': raw_name,
-                'raw_club': row.get('Club', ''),
-                'discipline_id': discipline_id,
-                'gender_heuristic': gender_heuristic,
-                'apparatus_results': apparatus_results,
-                'dynamic_metadata': dynamic_values
-            })
+            def cell(row, pos):
+                return row[pos] if pos is not None and pos < len(row) else None
+
+            # Score Swap Logic (For Level 1/Awards)
+            def is_numeric(s):
+                return bool(s) and _is_numeric_text(s)
+
+            extracted_results = []
+
+            for row in chain(prefix[header_idx + 1:], reader):
+                raw_name = cell(row, name_pos)
+                if not raw_name: continue
+
+                # Basic normalization for meet name if missing
+                if not meet_details.get('name') and cell(row, meet_pos):
+                    meet_details['name'] = cell(row, meet_pos)
+
+                dynamic_values = {}
+                for safe_key, pos, is_session_col, many_spaces in dynamic_fields:
+                    val = cell(row, pos)
+                    if not val or str(val).strip() == '': continue
+
+                    # Heuristic: if column header looks like a session and we don't have one yet
+                    if is_session_col:
+                        if 'session' not in dynamic_values:
+                            dynamic_values['session'] = str(val).strip()
+
+                    if many_spaces and safe_key not in dynamic_values.get('session', ''): continue
+                    dynamic_values[safe_key] = str(val).strip()
 
-            # AA Enrichement
-            aa_record = next((r for r in apparatus_results if r['raw_event'] in ['AllAround', 'All Around', 'AA']), None)
-            valid_sum = 0.0; valid_d_sum = 0.0; valid_app_count = 0
+                apparatus_results = []
+                for raw_event, (total_pos, score_pos, d_pos, sv_pos, e_pos, bonus_pos, penalty_pos, rank_pos,
+                                exec_pos, execution_pos) in event_positions:
+                    # Prioritize 'Total' column over 'Score' column if it exists. 
+                    # This is crucial for multi-day 'Combined' DETAILED files where 'Score' is often Day 1.
+                    score_val = cell(row, total_pos) or cell(row, score_pos)
+                    d_val = cell(row, d_pos)
+                    sv_val = cell(row, sv_pos)
+
+                    if (not score_val or str(score_val).strip() == '') and \
+                       (not d_val or str(d_val).strip() == '') and \
+                       (not sv_val or str(sv_val).strip() == ''):
+                        continue
+
+                    # Fallback: SV is often used for Difficulty
+                    if (not d_val or str(d_val).strip() == '') and (sv_val and str(sv_val).strip() != ''):
+                        d_val = sv_val
+
+                    app_res = {
+                        'raw_event': raw_event,
+                        'score_final': score_val,
+                        'score_d': d_val,
+                        'score_sv': sv_val,
+                        'score_e': cell(row, e_pos),
+                        'bonus': cell(row, bonus_pos),
+                        'penalty': cell(row, penalty_pos),
+                        'rank_text': cell(row, rank_pos),
+                        'execution_bonus': cell(row, exec_pos) or cell(row, execution_pos)
+                    }
+
+                    if is_numeric(d_val) and not is_numeric(score_val) and not _is_scratch_mark(score_val):
+                        app_res['score_final'] = d_val
+
+                    apparatus_results.append(app_res)
+
+                extracted_results.append({
+                    'raw_name': raw_name,
+                    'raw_club': cell(row, club_pos) if club_pos is not None else '',
+                    'discipline_id': discipline_id,
+                    'gender_heuristic': gender_heuristic,
+                    'apparatus_results': apparatus_results,
+                    'dynamic_metadata': dynamic_values
+                })
+
+                # AA Enrichement
+                aa_record = next((r for r in apparatus_results if r['raw_event'] in event_registry.AA_EVENT_TOKENS), None)
+                valid_sum = 0.0; valid_d_sum = 0.0; valid_app_count = 0
             
-            for res in apparatus_results:
-                if res['raw_event'] in ['AllAround', 'All Around', 'AA', 'Team']: continue
-                try:
-                    s = float(str(res['score_final']).replace(',', ''))
-                    valid_sum += s; valid_app_count += 1
-                except: pass
-                try:
-                    d = float(str(res['score_d']).replace(',', ''))
-                    valid_d_sum += d
-                except: pass
+                for res in apparatus_results:
+                    if res['raw_event'] in event_registry.AA_EVENT_TOKENS or res['raw_event'] == 'Team': continue
+                    try:
+                        s = float(str(res['score_final']).replace(',', ''))
+                        valid_sum += s; valid_app_count += 1
+                    except: pass
+                    try:
+                        d = float(str(res['score_d']).replace(',', ''))
+                        valid_d_sum += d
+                    except: pass
             
-            if not aa_record:
-                if valid_app_count > 0:
-                    apparatus_results.append({
-                        'raw_event': 'All Around',
-                        'score_final': f"{valid_sum:.3f}", 
-                        'score_d': f"{valid_d_sum:.3f}" if valid_d_sum > 0 else '',
-                        'calculated': True
-                    })
-            else:
-                if (not aa_record.get('score_d') or str(aa_record['score_d']).strip() == '') and valid_d_sum > 0:
-                    aa_record['score_d'] = f"{valid_d_sum:.3f}"
-                    aa_record['calculated_d'] = True
+                if not aa_record:
+                    if valid_app_count > 0:
+                        apparatus_results.append({
+                            'raw_event': 'All Around',
+                            'score_final': f"{valid_sum:.3f}", 
+                            'score_d': f"{valid_d_sum:.3f}" if valid_d_sum > 0 else '',
+                            'calculated': True
+                        })
+                else:
+                    if (not aa_record.get('score_d') or str(aa_record['score_d']).strip() == '') and valid_d_sum > 0:
+                        aa_record['score_d'] = f"{valid_d_sum:.3f}"
+                        aa_record['calculated_d'] = True
 
-        return {
-            'source': 'livemeet',
-            'source_meet_id': source_meet_id,
-            'meet_details': meet_details,
-            'results': extracted_results
-        }
+                if chunk_rows and len(extracted_results) >= chunk_rows:
+                    batches += 1
+                    yield package(extracted_results)
+                    extracted_results = []
+
+            if extracted_results or not batches:
+                yield package(extracted_results)
     except Exception as e:
+        if batches:
+            raise  # Part of the file was already handed on; the caller must discard it
         print(f"Error in extract_livemeet_data: {e}")
         import traceback
         traceback.print_exc()
-        return None
-
-    return {
-        'source': 'livemeet',
-        'source_meet_id': source_meet_id,
-        'meet_details': meet_details,
-        'results': extracted_results
-    }
+        return
 
 # ==============================================================================
 #  MSO EXTRACTION
 # ==============================================================================
 
-COLUMN_MAP_MSO = {
-    'Gymnast': 'Name', 'Team': 'Club', 'Sess': 'Session', 'Lvl': 'Level', 'Div': 'Age_Group',
-    'VT': 'Vault', 'VAULT': 'Vault', 'UB': 'Uneven Bars', 'BARS': 'Uneven Bars', 'UNEVEN BARS': 'Uneven Bars',
-    'BB': 'Beam', 'BEAM': 'Beam', 'Balance Beam': 'Beam', 'FX': 'Floor', 'FLR': 'Floor', 'FLOOR': 'Floor',
-    'AA': 'All Around', 'ALL AROUND': 'All Around', 'PH': 'Pommel Horse', 'POMMEL HORSE': 'Pommel Horse', 'POMML': 'Pommel Horse',
-    'SR': 'Rings', 'RINGS': 'Rings', 'PB': 'Parallel Bars', 'PBARS': 'Parallel Bars', 'PARALLEL BARS': 'Parallel Bars',
-    'HB': 'High Bar', 'HIBAR': 'High Bar', 'HIGH BAR': 'High Bar'
-}
-
 def parse_mso_cell_value(cell_str):
     if not isinstance(cell_str, str) or not cell_str.strip(): return None, None, None, None, None
     parts = cell_str.split()
@@ -433,25 +744,81 @@ def parse_mso_cell_value(cell_str):
         
     return score_final, d_score, None, rank_text, bonus
 
-def extract_mso_data(filepath, meet_details):
+# Cell shapes parse_mso_cell_value and mso_load_data.parse_cell_value agree on, with plain decimals:
+# "<score>", "<frac> <whole>", "<rank> <frac> <whole>" and "<rank> <frac> <whole> <bonus>"
+# (score = whole + frac / 1000). Any other cell is handed to the scalar parser.
+_MSO_NUMBER = r'[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)'
+MSO_CELL_REGEX = re.compile(
+    rf'^\s*(?:(?P<rank>\S+)\s+(?P<frac>{_MSO_NUMBER})\s+(?P<whole>{_MSO_NUMBER})(?:\s+(?P<bonus>{_MSO_NUMBER}))?'
+    rf'|(?:(?P<pair_frac>{_MSO_NUMBER})\s+)?(?P<pair_whole>{_MSO_NUMBER}))\s*$'
+)
+MSO_CELL_FIELDS = ('score_final', 'score_d', 'rank_numeric', 'rank_text', 'bonus')
+
+def _rank_digits(rank_text):
+    if not isinstance(rank_text, str): return None
+    clean = re.sub(r'\D', '', rank_text)
+    return int(clean) if clean else None
+
+def parse_mso_cells(cells, parse_cell=parse_mso_cell_value):
     """
-    Extracts data from a single MSO CSV without DB interaction.
+    Parses a DataFrame of MSO apparatus cells in one go: MSO_CELL_REGEX is applied with
+    Series.str.extract to the distinct cells of all columns, the rest go through parse_cell.
+    Returns {field: DataFrame shaped like cells} for MSO_CELL_FIELDS (scores and bonus as
+    float, rank_numeric = digits of rank_text), plus boolean frames:
+      'parsed'   -> the cell gave a score (parse_cell would not have returned None, None)
+      'unparsed' -> non-blank cell that did not parse
     """
+    import numpy as np
     import pandas as pd
-    filename = os.path.basename(filepath)
-    source_meet_id = filename.split('_mso.csv')[0]
-    
-    try:
-        df = pd.read_csv(filepath, keep_default_na=False, dtype=str)
-        if df.empty: return None
-    except Exception as e:
-        print(f"Error reading {filepath}: {e}")
-        return None
+    values = cells.to_numpy(dtype=object)
+    codes, uniques = pd.factorize(values.ravel())
+    n = len(uniques)
 
-    if not meet_details.get('name') and 'Meet' in df.columns:
-        meet_details['name'] = df['Meet'].iloc[0]
+    # One slot per distinct cell, plus a trailing all-None slot for nulls (code -1)
+    fields = {field: np.full(n + 1, None, dtype=object) for field in ('score_final', 'score_d', 'rank_text', 'bonus')}
+    fast = np.zeros(n, dtype=bool)
+    texts = pd.Series(uniques, dtype=object)
+    strings = texts.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    if strings.any():
+        parts = texts[strings].str.extract(MSO_CELL_REGEX)
+        whole = parts['whole'].fillna(parts['pair_whole'])
+        frac = parts['frac'].fillna(parts['pair_frac'])
+        matched = whole.notna().to_numpy()
+        idx = np.flatnonzero(strings)[matched]
+        fast[idx] = True
+        fields['score_final'][idx] = [float(w) if f != f else float(w) + float(f) / 1000.0
+                                      for w, f in zip(whole[matched].tolist(), frac[matched].tolist())]
+        fields['rank_text'][idx] = parts['rank'][matched].astype(object).where(parts['rank'][matched].notna(), None).tolist()
+        bonus = parts['bonus'][matched]
+        fields['bonus'][idx] = [None if b != b else float(b) for b in bonus.tolist()]
+    for i in np.flatnonzero(~fast).tolist():
+        score_final, score_d, _, rank_text, bonus = parse_cell(uniques[i])
+        fields['score_final'][i] = score_final; fields['score_d'][i] = score_d
+        fields['rank_text'][i] = rank_text; fields['bonus'][i] = bonus
+
+    parsed_u = np.array([fields['score_final'][i] is not None or fields['score_d'][i] is not None for i in range(n)] + [False])
+    blank_u = np.append(~texts.map(lambda v: isinstance(v, str) and v.strip() != '').to_numpy(dtype=bool), True)
+    rank_numeric = np.array([_rank_digits(r) for r in fields['rank_text']], dtype=object)
 
-    headers = df.columns
+    def frame(slots, dtype):
+        out = pd.DataFrame(slots[codes].reshape(values.shape), index=cells.index, columns=cells.columns, dtype=object)
+        return out if dtype is object else out.astype(dtype)
+    parsed = {
+        'score_final': frame(fields['score_final'], float),
+        'score_d': frame(fields['score_d'], float),
+        'rank_numeric': frame(rank_numeric, object),
+        'rank_text': frame(fields['rank_text'], object),
+        'bonus': frame(fields['bonus'], float),
+        'parsed': frame(parsed_u, bool),
+    }
+    parsed['unparsed'] = ~frame(blank_u, bool) & ~parsed['parsed']
+    return parsed
+
+def _float_or_none(value):
+    return None if value != value else value
+
+def _mso_plan(headers):
+    """Header-only detection for extract_mso_data (see EXTRACTION PLANS)."""
     def find_col_by_fuzzy(candidates):
         for c in headers:
             if str(c).upper().strip() in [cand.upper() for cand in candidates]: return c
@@ -459,25 +826,61 @@ def extract_mso_data(filepath, meet_details):
 
     name_col = find_col_by_fuzzy(['Gymnast', 'Name'])
     club_col = find_col_by_fuzzy(['Team', 'Club'])
-    if not name_col: return None
 
     apparatus_cols = []
     dynamic_metadata_cols = []
-    known_apps = ['Vault', 'Uneven Bars', 'Beam', 'Floor', 'All Around', 'Pommel Horse', 'Rings', 'Parallel Bars', 'High Bar']
     
     for col in headers:
-        norm_key = COLUMN_MAP_MSO.get(col.strip(), col)
-        if norm_key in known_apps: apparatus_cols.append(col)
+        if event_registry.mso_event(col): apparatus_cols.append(col)
         elif col not in [name_col, club_col]: dynamic_metadata_cols.append(col)
 
-    detected_names = [COLUMN_MAP_MSO.get(c.strip(), c) for c in apparatus_cols]
+    detected_names = [event_registry.mso_event(c) for c in apparatus_cols]
+    return {
+        'name_col': name_col, 'club_col': club_col,
+        'apparatus_cols': apparatus_cols, 'apparatus_names': detected_names,
+        'dynamic_metadata_cols': dynamic_metadata_cols,
+        'has_mag_apps': any(x in event_registry.MAG_ONLY_EVENTS for x in detected_names),
+        'has_wag_apps': any(x in event_registry.WAG_ONLY_EVENTS for x in detected_names)
+    }
+
+def extract_mso_data(filepath, meet_details):
+    """
+    Extracts data from a single MSO CSV without DB interaction.
+    All apparatus cells are parsed at once (parse_mso_cells); non-blank cells that did not
+    parse are listed in package['unparsed_cells'] as (raw_name, column, cell).
+    """
+    return next(iter_mso_batches(filepath, meet_details), None)
+
+def iter_mso_batches(filepath, meet_details, chunk_rows=None):
+    """extract_mso_data as packages of at most chunk_rows CSV rows each (one package if chunk_rows is None)."""
+    import numpy as np
+    from itertools import chain
+    filename = os.path.basename(filepath)
+    source_meet_id = filename.split('_mso.csv')[0]
+    
+    try:
+        df, more_frames = _read_csv_frames(filepath, chunk_rows)
+        if df.empty: return
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return
+
+    if not meet_details.get('name') and 'Meet' in df.columns:
+        meet_details['name'] = df['Meet'].iloc[0]
+
+    plan = extraction_plan('mso', df.columns, _mso_plan)
+    name_col, club_col = plan['name_col'], plan['club_col']
+    if not name_col: return
+
+    apparatus_cols = plan['apparatus_cols']
+    dynamic_metadata_cols = plan['dynamic_metadata_cols']
     
     # Heuristic 1: Apparatus names
-    has_mag_apps = any(x in ['Pommel Horse', 'Rings', 'Parallel Bars', 'High Bar'] for x in detected_names)
-    has_wag_apps = any(x in ['Uneven Bars', 'Beam'] for x in detected_names)
+    has_mag_apps = plan['has_mag_apps']
+    has_wag_apps = plan['has_wag_apps']
     
     # Heuristic 2: Level codes (WAG-specific: XS, XG, XP, XB, Xcel, CCP; MAG-specific: P1, P2... PO)
-    # Check FIRST athlete's level as a sample
+    # Check FIRST athlete's level as a sample (first chunk when reading in chunks)
     sample_level = str(df['Lvl'].iloc[0]).upper() if 'Lvl' in df.columns and not df.empty else ""
     
     is_wag_level = any(x in sample_level for x in ['XS', 'XG', 'XP', 'XB', 'XCEL', 'CCP'])
@@ -492,64 +895,87 @@ def extract_mso_data(filepath, meet_details):
     else:
         discipline_id = 1; gender_heuristic = 'F' # Default WAG
 
-    extracted_results = []
-    for _, row in df.iterrows():
-        raw_name = row.get(name_col)
-        if not raw_name: continue
-        
-        dynamic_vals = {col: str(row.get(col)) for col in dynamic_metadata_cols if row.get(col)}
-        
-        apparatus_results = []
-        for raw_app_col in apparatus_cols:
-            cell_value = row.get(raw_app_col)
-            if not cell_value: continue
-            
-            clean_app_name = COLUMN_MAP_MSO.get(raw_app_col.strip(), raw_app_col)
-            score_final, score_d, _, rank_text, bonus = parse_mso_cell_value(cell_value)
-            
-            if score_final is None and score_d is None: continue
-            
-            apparatus_results.append({
-                'raw_event': clean_app_name,
-                'score_final': score_final,
-                'score_d': score_d,
-                'rank_text': rank_text,
-                'bonus': bonus,
-                'score_text': str(cell_value)
-            })
+    for df in chain([df], more_frames):
+        # --- Column-wise extraction: every apparatus cell parsed in one pass instead of df.iterrows() ---
+        raw_names = _column_values(df, name_col)
+        raw_clubs = _column_values(df, club_col, '')
+        metadata = [(col, _column_values(df, col)) for col in dynamic_metadata_cols]
+        clean_app_names = plan['apparatus_names']
 
-        extracted_results.append({
-            'raw_name': raw_name,
-            'raw_club': row.get(club_col, ''),
-            'discipline_id': discipline_id,
-            'gender_heuristic': gender_heuristic,
-            'apparatus_results': apparatus_results,
-            'dynamic_metadata': dynamic_vals
-        })
+        cells = df[apparatus_cols]
+        parsed = parse_mso_cells(cells)
+        named = _value_flags(raw_names, bool)
+        cell_values = cells.to_numpy(dtype=object)
 
-    return {
-        'source': 'mso',
-        'source_meet_id': source_meet_id,
-        'meet_details': meet_details,
-        'results': extracted_results
-    }
+        # Row-major (athlete, apparatus) order of the cells that gave a score, split back per athlete
+        keep = parsed['parsed'].to_numpy(dtype=bool)
+        row_idx, col_idx = np.nonzero(keep)
+        kept = (row_idx, col_idx)
+        records = [
+            {'raw_event': clean_app_names[j], 'score_final': score, 'score_d': _float_or_none(d), 'rank_text': rank,
+             'bonus': _float_or_none(bonus), 'score_text': str(cell)}
+            for j, score, d, rank, bonus, cell in zip(
+                col_idx.tolist(), parsed['score_final'].to_numpy()[kept].tolist(), parsed['score_d'].to_numpy()[kept].tolist(),
+                parsed['rank_text'].to_numpy()[kept], parsed['bonus'].to_numpy()[kept].tolist(), cell_values[kept])
+        ]
+        offsets = np.concatenate(([0], np.cumsum(keep.sum(axis=1)))).tolist()
+
+        unparsed_rows, unparsed_cols = np.nonzero(parsed['unparsed'].to_numpy(dtype=bool) & named[:, None])
+        unparsed_cells = [(raw_names[r], apparatus_cols[c], cell_values[r, c])
+                          for r, c in zip(unparsed_rows.tolist(), unparsed_cols.tolist())]
+
+        meta_names = [col for col, _ in metadata]
+        meta_rows = zip(*[values for _, values in metadata]) if metadata else [()] * len(df)
+
+        extracted_results = []
+        for i, meta_vals in enumerate(meta_rows):
+            if not named[i]: continue
+            extracted_results.append({
+                'raw_name': raw_names[i],
+                'raw_club': raw_clubs[i],
+                'discipline_id': discipline_id,
+                'gender_heuristic': gender_heuristic,
+                'apparatus_results': records[offsets[i]:offsets[i + 1]],
+                'dynamic_metadata': {col: str(val) for col, val in zip(meta_names, meta_vals) if val}
+            })
+
+        yield {
+            'source': 'mso',
+            'source_meet_id': source_meet_id,
+            'meet_details': meet_details,
+            'results': extracted_results,
+            'unparsed_cells': unparsed_cells
+        }
 
 # ==============================================================================
 #  KSIS EXTRACTION
 # ==============================================================================
 
+def _ksis_plan(columns):
+    """Header-only detection for extract_ksis_data (see EXTRACTION PLANS)."""
+    app_bases = []
+    for col in columns:
+        if col.endswith('_Total') and col != 'AA_Total':
+            app_base = col.replace('_Total', '')
+            if app_base not in app_bases: app_bases.append(app_base)
+    return {'app_bases': app_bases, 'apparatus_names': [event_registry.ksis_event(b) for b in app_bases]}
+
 def extract_ksis_data(filepath, meet_details):
     """
     Extracts data from a KSIS CSV.
     """
-    import pandas as pd
+    return next(iter_ksis_batches(filepath, meet_details), None)
+
+def iter_ksis_batches(filepath, meet_details, chunk_rows=None):
+    """extract_ksis_data as packages of at most chunk_rows CSV rows each (one package if chunk_rows is None)."""
+    from itertools import chain
     try:
-        df = pd.read_csv(filepath, keep_default_na=False, dtype=str)
+        df, more_frames = _read_csv_frames(filepath, chunk_rows)
         if df.empty or 'Name' not in df.columns:
-            return None
+            return
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
-        return None
+        return
 
     # Derive IDs
     source_meet_id = str(df['MeetID'].iloc[0])
@@ -574,81 +1000,91 @@ def extract_ksis_data(filepath, meet_details):
     gender_heuristic = 'M' if discipline_id == 2 else 'F'
 
     # Identify apparatus columns
-    app_bases = set()
-    for col in df.columns:
-        if col.endswith('_Total') and col != 'AA_Total':
-            app_bases.add(col.replace('_Total', ''))
-
-    # Apparatus mapping
-    APP_MAP = {
-        'mfloor': 'Floor', 'horse': 'Pommel Horse', 'rings': 'Rings', 'mvault': 'Vault', 
-        'pbars': 'Parallel Bars', 'hbar': 'High Bar', 'wvault': 'Vault', 'ubars': 'Uneven Bars', 
-        'beam': 'Beam', 'wfloor': 'Floor',
-        'vault': 'Vault', 'bars': 'Uneven Bars', 'floor': 'Floor' # Common KSIS variants
-    }
+    plan = extraction_plan('ksis', df.columns, _ksis_plan)
+    app_bases = plan['app_bases']
 
-    extracted_results = []
+    for df in chain([df], more_frames):
+        extracted_results = []
     
-    for _, row in df.iterrows():
-        raw_name = row['Name']
-        if not raw_name: continue
+        for _, row in df.iterrows():
+            raw_name = row['Name']
+            if not raw_name: continue
         
-        level = row.get('Session', '')
-        dynamic_vals = {'level': level}
+            level = row.get('Session', '')
+            dynamic_vals = {'level': level}
         
-        apparatus_results = []
+            apparatus_results = []
         
-        # AA Special Case
-        aa_score_str = row.get('AA_Score')
-        if aa_score_str:
-            aa_rank = row.get('Place', '')
-            apparatus_results.append({
-                'raw_event': 'All Around',
-                'score_final': aa_score_str,
-                'rank_text': aa_rank
-            })
+            # AA Special Case
+            aa_score_str = row.get('AA_Score')
+            if aa_score_str:
+                aa_rank = row.get('Place', '')
+                apparatus_results.append({
+                    'raw_event': 'All Around',
+                    'score_final': aa_score_str,
+                    'rank_text': aa_rank
+                })
 
-        # Individual Apps
-        for app_base in app_bases:
-            std_app_name = APP_MAP.get(app_base, app_base)
+            # Individual Apps
+            for app_base, std_app_name in zip(app_bases, plan['apparatus_names']):
             
-            total_str = row.get(f"{app_base}_Total")
-            d_str = row.get(f"{app_base}_D")
-            e_str = row.get(f"{app_base}_E")
-            bonus_str = row.get(f"{app_base}_Bonus")
-            nd_str = row.get(f"{app_base}_ND")
+                total_str = row.get(f"{app_base}_Total")
+                d_str = row.get(f"{app_base}_D")
+                e_str = row.get(f"{app_base}_E")
+                bonus_str = row.get(f"{app_base}_Bonus")
+                nd_str = row.get(f"{app_base}_ND")
             
-            # Helper to parse "12.150(5)" -> 12.150, rank 5
-            score_final = total_str
-            rank = ""
-            if total_str:
-                match = re.search(r'([\d\.]+)\((\d+)\)', total_str)
-                if match:
-                    score_final = match.group(1)
-                    rank = match.group(2)
+                # Helper to parse "12.150(5)" -> 12.150, rank 5
+                score_final = total_str
+                rank = ""
+                if total_str:
+                    match = re.search(r'([\d\.]+)\((\d+)\)', total_str)
+                    if match:
+                        score_final = match.group(1)
+                        rank = match.group(2)
             
-            apparatus_results.append({
-                'raw_event': std_app_name,
-                'score_final': score_final,
-                'score_d': d_str,
-                'score_e': e_str,
-                'rank_text': rank,
-                'bonus': bonus_str,
-                'penalty': nd_str
+                apparatus_results.append({
+                    'raw_event': std_app_name,
+                    'score_final': score_final,
+                    'score_d': d_str,
+                    'score_e': e_str,
+                    'rank_text': rank,
+                    'bonus': bonus_str,
+                    'penalty': nd_str
+                })
+
+            extracted_results.append({
+                'raw_name': raw_name,
+                'raw_club': row.get('Club'),
+                'discipline_id': discipline_id,
+                'gender_heuristic': gender_heuristic,
+                'apparatus_results': apparatus_results,
+                'dynamic_metadata': dynamic_vals
             })
 
-        extracted_results.append({
-            'raw_name': raw_name,
-            'raw_club': row.get('Club'),
-            'discipline_id': discipline_id,
-            'gender_heuristic': gender_heuristic,
-            'apparatus_results': apparatus_results,
-            'dynamic_metadata': dynamic_vals
-        })
+        yield {
+            'source': 'ksis',
+            'source_meet_id': source_meet_id,
+            'meet_details': meet_details,
+            'results': extracted_results
+        }
 
-    return {
-        'source': 'ksis',
-        'source_meet_id': source_meet_id,
-        'meet_details': meet_details,
-        'results': extracted_results
-    }
+# ==============================================================================
+#  CHUNKED EXTRACTION
+#  iter_extract_batches streams a file as packages of at most chunk_rows rows,
+#  so a very large result file never has to be held in memory at once. Meet
+#  and header-level details come from the first chunk; concatenating the
+#  packages' results gives exactly the single package of extract_<source>_data.
+# ==============================================================================
+
+def iter_extract_batches(scraper_type, filepath, meet_details, level_alias_map=None, chunk_rows=None):
+    """Yields the extraction packages of one file (a single package if chunk_rows is None)."""
+    if scraper_type == 'kscore':
+        return iter_kscore_batches(filepath, meet_details, level_alias_map, chunk_rows)
+    if scraper_type == 'livemeet':
+        return iter_livemeet_batches(filepath, meet_details, chunk_rows)
+    if scraper_type == 'mso':
+        return iter_mso_batches(filepath, meet_details, chunk_rows)
+    if scraper_type == 'ksis':
+        return iter_ksis_batches(filepath, meet_details, chunk_rows)
+    return iter(())
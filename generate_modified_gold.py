@@ -5,6 +5,8 @@ import re
 import argparse
 import pandas as pd
 
+import db_writer
+
 DB_PATH = 'gym_data.db'
 ROSTER_PATH = 'internal_roster.json'
 ALIAS_PATH = 'person_aliases.json'
@@ -74,8 +76,6 @@ def generate_modified_gold(db_path=DB_PATH):
     # 4. Filter for L1 (Athletes in Roster)
     print("Creating Gold_Results_MAG_Filtered_L1...")
     l1_df = df[df['athlete_name'].isin(target_names)]
-    l1_df.to_sql("Gold_Results_MAG_Filtered_L1", conn, if_exists="replace", index=False)
-    print(f"L1 created with {len(l1_df)} rows.")
 
     # 5. Filter for L2 (Roster athletes + their session peers)
     print("Creating Gold_Results_MAG_Filtered_L2...")
@@ -98,10 +98,19 @@ def generate_modified_gold(db_path=DB_PATH):
     # Cleanup extra columns from merge
     l2_df = l2_df[df.columns]
     
-    l2_df.to_sql("Gold_Results_MAG_Filtered_L2", conn, if_exists="replace", index=False)
+    # 6. Write both tables: one acknowledged batch through the writer service, or directly if none is running
+    writer = db_writer.connect(db_path)
+    if writer is not None:
+        writer.batch(db_writer.table_replace_statements(l1_df, "Gold_Results_MAG_Filtered_L1") +
+                     db_writer.table_replace_statements(l2_df, "Gold_Results_MAG_Filtered_L2"))
+        writer.close()
+    else:
+        l1_df.to_sql("Gold_Results_MAG_Filtered_L1", conn, if_exists="replace", index=False)
+        l2_df.to_sql("Gold_Results_MAG_Filtered_L2", conn, if_exists="replace", index=False)
+        conn.commit()
+    print(f"L1 created with {len(l1_df)} rows.")
     print(f"L2 created with {len(l2_df)} rows.")
 
-    conn.commit()
     conn.close()
     print("Done!")
 
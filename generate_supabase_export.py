@@ -2,6 +2,8 @@ import sqlite3
 import os
 import argparse
 
+from etl_functions import normalize_dates
+
 LOCAL_DB_PATH = "gym_data.db"
 
 TABLE_MAP = {
@@ -92,9 +94,17 @@ def generate_export(level, target_table, db_path=LOCAL_DB_PATH):
 
         print(f"Found {len(rows)} results. Cleaning and de-duplicating...")
 
+        # Parse the date column to ISO format once per distinct value, as sync_to_supabase_robust does
+        dates = None
+        if 'date' in columns:
+            date_idx = columns.index('date')
+            dates = normalize_dates([row[date_idx] for row in rows]).tolist()
+
         unique_results = {}
-        for row in rows:
+        for i, row in enumerate(rows):
             record = dict(zip(columns, row))
+            if dates is not None:
+                record['date'] = dates[i]
             record = clean_record(record)
 
             # Unique key: (athlete_name, meet_name, year, level, age)
@@ -0,0 +1,18 @@
+# golden_compare.py
+
+import math
+
+# Shared by the golden extraction tests (test_kscore_extraction.py, test_livemeet_extraction.py):
+# a rewritten extractor must return exactly the package its reference implementation returned.
+
+def same_package(a, b):
+    """Structural equality where NaN equals NaN (dict key order and value types included)."""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a.keys()) == list(b.keys()) and all(same_package(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_package(x, y) for x, y in zip(a, b))
+    return a == b
@@ -9,17 +9,22 @@ import json
 import re
 import argparse
 
+import event_registry
+import entity_cache
+
 # --- Import shared functions from our new ETL library ---
 from etl_functions import (
     setup_database,
     load_club_aliases,
     standardize_club_name,
-    standardize_athlete_name,
+    standardize_athlete_names,
     detect_discipline,
     get_or_create_person,
     get_or_create_club,
     get_or_create_athlete_link,
     get_or_create_meet,
+    ensure_meet_name_key,
+    ensure_meet_classification,
     calculate_file_hash,
     is_file_processed,
     mark_file_processed
@@ -56,7 +61,7 @@ def load_meet_manifest(manifest_file):
         print(f"Warning: Could not load Kscore manifest. Meet details will be incomplete. Error: {e}")
         return {} 
 
-def process_kscore_files(meet_manifest, club_alias_map, level_alias_map, sample_rate=1):
+def process_kscore_files(meet_manifest, club_alias_map, level_alias_map, sample_rate=1, cache_size=entity_cache.DEFAULT_CACHE_SIZE, warm_cache=False):
     """
     Main function to find and process all Kscore result CSV files.
     """
@@ -76,10 +81,11 @@ def process_kscore_files(meet_manifest, club_alias_map, level_alias_map, sample_
     try:
         with sqlite3.connect(DB_FILE) as conn:
             # --- Caches now map to the new schema ---
-            person_cache = {row[1]: row[0] for row in conn.execute("SELECT person_id, full_name FROM Persons").fetchall()}
-            club_cache = {row[1]: row[0] for row in conn.execute("SELECT club_id, name FROM Clubs").fetchall()}
-            athlete_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT athlete_id, person_id, club_id FROM Athletes").fetchall()}
+            entities = entity_cache.open_entity_caches(conn, DB_FILE, cache_size, warm_start=warm_cache)
+            person_cache, club_cache, athlete_cache = entities['person'], entities['club'], entities['athlete']
             apparatus_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT apparatus_id, name, discipline_id FROM Apparatus").fetchall()}
+            ensure_meet_name_key(conn)  # get_or_create_meet matches meets on the indexed name_key
+            ensure_meet_classification(conn)  # ...and stores the classification it computes
             meet_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT meet_db_id, source, source_meet_id FROM Meets").fetchall()}
 
             for filepath in csv_files:
@@ -97,6 +103,11 @@ def process_kscore_files(meet_manifest, club_alias_map, level_alias_map, sample_
                 if success:
                     mark_file_processed(conn, filepath, file_hash)
 
+            # Commit before snapshotting so the cached ids match what later runs will see
+            conn.commit()
+            entity_cache.save_snapshot(entities, conn, DB_FILE)
+            print(f"Entity caches: {entity_cache.cache_stats(entities)}")
+
     except Exception as e:
         print(f"A critical error occurred during file processing: {e}")
         traceback.print_exc()
@@ -116,6 +127,7 @@ def parse_kscore_file(filepath, conn, person_cache, club_cache, athlete_cache, a
     """
     Parses a single Kscore CSV and loads its data into the database using the new schema.
     """
+    apparatus_lookup = event_registry.ApparatusLookup(apparatus_cache)
     try:
         df = pd.read_csv(filepath, keep_default_na=False, dtype=str)
         if df.empty:
@@ -188,10 +200,9 @@ def parse_kscore_file(filepath, conn, person_cache, club_cache, athlete_cache, a
     ensure_column_exists(cursor, 'Results', 'bonus', 'REAL')
     ensure_column_exists(cursor, 'Results', 'execution_bonus', 'REAL')
 
-    for index, row in df.iterrows():
+    person_names = standardize_athlete_names(df[name_col]).tolist()
+    for (index, row), person_name in zip(df.iterrows(), person_names):
         # 1. Identity
-        raw_name = row.get(name_col)
-        person_name = standardize_athlete_name(raw_name)
         if not person_name: continue
         athletes_processed += 1
         
@@ -219,25 +230,11 @@ def parse_kscore_file(filepath, conn, person_cache, club_cache, athlete_cache, a
             # Clean up event name for lookup (remove underscores for matching?)
             # K-Score typical: "Balance_Beam"
             # Apparatus Cache typical: "Balance Beam" or "Beam"
-            clean_name = raw_event.replace('_', ' ')
-            
-            # Legacy mapping support if needed, but we try to match "As Is" first
-            if clean_name == "Balance Beam": clean_name = "Beam"
-            if clean_name == "Horizontal Bar": clean_name = "High Bar"
-            if clean_name == "AllAround": clean_name = "All Around"
-            
-            app_key = (clean_name, discipline_id)
-            if app_key not in apparatus_cache:
-                 # Try strict match on raw event if simple replace didn't work
-                 app_key = (raw_event, discipline_id)
-            if app_key not in apparatus_cache: app_key = (clean_name, 99) 
-            
-            if app_key not in apparatus_cache: 
-                # print(f"Warning: Unknown apparatus {clean_name}")
+            apparatus_id = apparatus_lookup.get(raw_event, discipline_id)
+            if apparatus_id is None:
+                # print(f"Warning: Unknown apparatus {raw_event}")
                 continue
             
-            apparatus_id = apparatus_cache[app_key]
-            
             # Extract Triplet + Bonuses
             d_val = row.get(f'Result_{raw_event}_D')
             score_val = row.get(f'Result_{raw_event}_Score')
@@ -311,6 +308,8 @@ def main():
     parser = argparse.ArgumentParser(description="Load Kscore data into the database.")
     parser.add_argument("--sample", type=int, default=1, help="Process every Nth file (e.g. 10)")
     parser.add_argument("--file", type=str, help="Process a single specific file")
+    parser.add_argument("--cache-size", type=int, default=entity_cache.DEFAULT_CACHE_SIZE, help="Max entries per Person/Club/Athlete cache (0 = unbounded)")
+    parser.add_argument("--warm-cache", action="store_true", help="Start the entity caches from the snapshot saved by the last run")
     args = parser.parse_args()
 
     club_aliases = load_club_aliases()
@@ -320,14 +319,15 @@ def main():
     if args.file:
         with sqlite3.connect(DB_FILE) as conn:
             # Re-fetch caches for single file run
-            person_cache = {row[1]: row[0] for row in conn.execute("SELECT person_id, full_name FROM Persons").fetchall()}
-            club_cache = {row[1]: row[0] for row in conn.execute("SELECT club_id, name FROM Clubs").fetchall()}
-            athlete_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT athlete_id, person_id, club_id FROM Athletes").fetchall()}
+            entities = entity_cache.open_entity_caches(conn, DB_FILE, args.cache_size, warm_start=args.warm_cache)
+            person_cache, club_cache, athlete_cache = entities['person'], entities['club'], entities['athlete']
             apparatus_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT apparatus_id, name, discipline_id FROM Apparatus").fetchall()}
+            ensure_meet_name_key(conn)  # get_or_create_meet matches meets on the indexed name_key
+            ensure_meet_classification(conn)  # ...and stores the classification it computes
             meet_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT meet_db_id, source, source_meet_id FROM Meets").fetchall()}
             parse_kscore_file(args.file, conn, person_cache, club_cache, athlete_cache, apparatus_cache, meet_cache, meet_manifest, club_aliases, level_aliases)
     else:
-        process_kscore_files(meet_manifest, club_aliases, level_aliases, sample_rate=args.sample)
+        process_kscore_files(meet_manifest, club_aliases, level_aliases, sample_rate=args.sample, cache_size=args.cache_size, warm_cache=args.warm_cache)
     
     print("\n--- Kscore data loading script finished ---")
 
@@ -0,0 +1,96 @@
+# load_metrics.py
+
+import os
+import json
+import time
+from datetime import datetime
+from contextlib import contextmanager
+
+# ==============================================================================
+#  PER-STAGE LOADER METRICS
+#  Accumulates wall-clock seconds and call counts per (source, stage) so a slow
+#  run can be attributed to hashing, extraction, entity resolution, duplicate
+#  checks, batch flushes, commits or the post-load passes (heal/unify/gold).
+# ==============================================================================
+
+FILE_STAGES = ('hash', 'extract', 'resolve', 'dedup', 'enrich', 'flush', 'commit', 'mark')
+RUN_SOURCE = 'run'  # Bucket for stages that are not tied to one source type
+
+class LoadMetrics:
+    def __init__(self):
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+        self.stages = {}   # (source, stage) -> [seconds, calls]
+        self.files = {}    # source -> files written
+        self.rows = {}     # source -> result rows queued for insert
+        self.errors = {}   # source -> files that failed
+
+    def add(self, stage, seconds, source=RUN_SOURCE, calls=1):
+        entry = self.stages.setdefault((source, stage), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+
+    @contextmanager
+    def timer(self, stage, source=RUN_SOURCE):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start, source)
+
+    def count_file(self, source, rows=0, failed=False):
+        target = self.errors if failed else self.files
+        target[source] = target.get(source, 0) + 1
+        if rows:
+            self.rows[source] = self.rows.get(source, 0) + rows
+
+    def elapsed(self):
+        return time.perf_counter() - self._t0
+
+    def stage_totals(self):
+        """{stage: seconds} summed over all sources."""
+        totals = {}
+        for (_, stage), (seconds, _) in self.stages.items():
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def summary_line(self):
+        """One-line live summary: files/s, rows/s and the seconds spent per stage so far."""
+        elapsed = self.elapsed() or 1e-9
+        files = sum(self.files.values())
+        rows = sum(self.rows.values())
+        totals = self.stage_totals()
+        stages = ' '.join(f"{s}={totals[s]:.1f}s" for s in FILE_STAGES if s in totals)
+        return f"[metrics] {files / elapsed:.2f} files/s, {rows / elapsed:.0f} rows/s | {stages}"
+
+    def to_dict(self, extra=None):
+        sources = {}
+        for (source, stage), (seconds, calls) in sorted(self.stages.items()):
+            src = sources.setdefault(source, {'files': self.files.get(source, 0), 'rows': self.rows.get(source, 0),
+                                              'errors': self.errors.get(source, 0), 'stages': {}})
+            src['stages'][stage] = {'seconds': round(seconds, 4), 'calls': calls}
+        for source in set(self.files) | set(self.errors):
+            sources.setdefault(source, {'files': self.files.get(source, 0), 'rows': self.rows.get(source, 0),
+                                        'errors': self.errors.get(source, 0), 'stages': {}})
+        data = {
+            'started': self.started.isoformat(),
+            'finished': datetime.now().isoformat(),
+            'wall_seconds': round(self.elapsed(), 3),
+            'totals': {stage: round(sec, 4) for stage, sec in self.stage_totals().items()},
+            'sources': sources
+        }
+        if extra:
+            data.update(extra)
+        return data
+
+    def write(self, path, extra=None):
+        """Writes the run's metrics as JSON (parent directory created if needed)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(extra), f, indent=2)
+        return path
+
+def default_metrics_path(directory="loader_metrics"):
+    return os.path.join(directory, f"load_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
@@ -10,12 +10,19 @@ import json
 import argparse
 import traceback
 import signal
+import queue
 import logging
+import multiprocessing
 from functools import lru_cache
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 # Import extraction library
 import extraction_library
+import result_key_index
+import entity_cache
+import db_writer
+import load_metrics
+import event_registry
 
 # Import shared functions from ETL library
 from etl_functions import (
@@ -23,19 +30,24 @@ from etl_functions import (
     load_club_aliases,
     standardize_club_name,
     standardize_level_name,
-    standardize_athlete_name,
-    get_or_create_person,
-    get_or_create_club,
-    get_or_create_athlete_link,
+    LEVEL_INDEX,
+    KSCORE_LEVEL_ALIASES,
+    standardize_athlete_names,
     get_or_create_meet,
+    MeetResolver,
+    resolve_entities_bulk,
     calculate_file_hash,
     is_file_processed,
     mark_file_processed,
-    sanitize_column_name,
-    ensure_column_exists,
-    check_duplicate_result,
+    get_file_signature,
+    load_fingerprint_index,
+    save_fingerprints,
+    SchemaRegistry,
     parse_rank,
     parse_date_to_iso,
+    normalize_dates,
+    ensure_meet_classification,
+    normalize_years,
     retry_on_lock
 )
 
@@ -54,38 +66,124 @@ KSIS_MANIFEST = "discovered_meet_ids_ksis.csv"
 # --- PERFORMANCE TUNING ---
 BATCH_INSERT_SIZE = 500  # Number of rows to accumulate before batch insert
 LRU_CACHE_SIZE = 10000   # Max entries for entity caches
+CHUNK_QUEUE_BATCHES = 4  # Extracted batches a chunked reader may run ahead of the writer
 
 # ==============================================================================
 #  WORKER: READER (Parallel)
 # ==============================================================================
 
-def reader_worker(scraper_type, filepath, manifest, aliases=None):
+def reader_worker(scraper_type, filepath, manifest, aliases=None, columnar=False):
     """
     Parallel worker that reads and extracts data from a CSV.
+    With columnar=True the package's results are shipped back as a ColumnarResults.
+    The worker-side extraction time is returned in package['extract_seconds'].
     """
+    start = time.perf_counter()
     try:
+        package = None
         if scraper_type == 'kscore':
-            return extraction_library.extract_kscore_data(filepath, manifest, aliases)
+            package = extraction_library.extract_kscore_data(filepath, manifest, aliases)
         elif scraper_type == 'livemeet':
-            return extraction_library.extract_livemeet_data(filepath, manifest)
+            package = extraction_library.extract_livemeet_data(filepath, manifest)
         elif scraper_type == 'mso':
-            return extraction_library.extract_mso_data(filepath, manifest)
+            package = extraction_library.extract_mso_data(filepath, manifest)
         elif scraper_type == 'ksis':
-            return extraction_library.extract_ksis_data(filepath, manifest)
+            package = extraction_library.extract_ksis_data(filepath, manifest)
+        if columnar:
+            package = extraction_library.to_columnar(package)
+        if package:
+            package['extract_seconds'] = time.perf_counter() - start
+        return package
     except Exception as e:
-        return {'error': str(e), 'filepath': filepath}
-    return None
+        return {'error': str(e), 'filepath': filepath, 'extract_seconds': time.perf_counter() - start}
+
+# --- Pre-warmed pool: per-process context set once by the initializer ---
+_reader_context = None
+
+def init_reader_worker(context):
+    """
+    Pool initializer: keeps the manifests, the Kscore level aliases and the extraction settings
+    for the life of the worker process and imports pandas once, before the first file.
+    """
+    global _reader_context
+    import pandas  # Extractors import it lazily; pay for it at worker start instead
+    _reader_context = context
+    extraction_library.set_plan_cache_dir(context.get('plan_cache_dir'))
+
+def prewarmed_reader_worker(scraper_type, filepath):
+    """reader_worker for a pool started with init_reader_worker: the task carries only the file."""
+    context = _reader_context
+    manifest = context['manifests'][scraper_type].get(manifest_key(scraper_type, filepath), {})
+    aliases = context['level_aliases'] if scraper_type == 'kscore' else None
+    # Extractors fill in missing meet details, so each file gets its own copy of the entry
+    return reader_worker(scraper_type, filepath, dict(manifest), aliases, context['columnar'])
+
+def chunked_reader_worker(scraper_type, filepath, manifest, aliases, columnar, batch_queue, chunk_rows):
+    """
+    Reader for a very large file: extracts it in packages of at most chunk_rows athletes and hands
+    each to the writer through batch_queue as ('batch', package) as soon as it is ready, so neither
+    side holds the whole file. Ends with ('done', {'batches', 'extract_seconds'}) or ('error', {...});
+    extract_seconds leaves out the time spent waiting for the writer to make room in the queue.
+    """
+    start = time.perf_counter()
+    waited = 0.0
+    batches = 0
+    try:
+        for package in extraction_library.iter_extract_batches(scraper_type, filepath, manifest, aliases, chunk_rows):
+            if columnar:
+                package = extraction_library.to_columnar(package)
+            put_start = time.perf_counter()
+            batch_queue.put(('batch', package))
+            waited += time.perf_counter() - put_start
+            batches += 1
+        batch_queue.put(('done', {'batches': batches, 'extract_seconds': time.perf_counter() - start - waited}))
+    except Exception as e:
+        batch_queue.put(('error', {'error': str(e), 'filepath': filepath, 'batches': batches,
+                                   'extract_seconds': time.perf_counter() - start - waited}))
+
+def hash_worker(filepath):
+    """Hashes a file in a pool worker, returning (hash, seconds spent)."""
+    start = time.perf_counter()
+    return calculate_file_hash(filepath), time.perf_counter() - start
+
+def iter_bounded(executor, fn, work_items, max_inflight):
+    """
+    Streams fn(*args) over work_items [(tag, args), ...] keeping at most max_inflight futures
+    outstanding. Yields (tag, future, in_flight) as results complete; the next task is only
+    submitted once the caller has consumed a result, so extracted packages cannot pile up
+    in memory faster than the writer drains them.
+    """
+    work_iter = iter(work_items)
+    in_flight = {}
+
+    def submit_next():
+        item = next(work_iter, None)
+        if item is None:
+            return False
+        tag, args = item
+        in_flight[executor.submit(fn, *args)] = tag
+        return True
+
+    while len(in_flight) < max_inflight and submit_next():
+        pass
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            tag = in_flight.pop(future)
+            yield tag, future, len(in_flight)
+            submit_next()
 
 # ==============================================================================
 #  LOADER: WRITER (Serial)
 # ==============================================================================
 
-def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pending_inserts):
+def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pending_inserts, metrics=None):
     """
     Serial function that takes extracted data and writes it to the database.
     
-    OPTIMIZED: Uses in-memory duplicate set (existing_results) for O(1) dupe checking
-    and accumulates inserts in pending_inserts list for batch processing.
+    OPTIMIZED: Uses the compact duplicate-key index (existing_results, a ResultKeyIndex or any set-like
+    container of result keys) for dupe checking and accumulates inserts in pending_inserts for batch processing.
+    An optional LoadMetrics receives the entity-resolution and duplicate-check timings.
     """
     if not data_package or 'error' in data_package:
         if data_package and 'error' in data_package:
@@ -96,9 +194,13 @@ def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pe
     source_meet_id = data_package['source_meet_id']
     meet_details = data_package['meet_details']
     results = data_package['results']
+    resolve_start = time.perf_counter()
     
     # 1. Meet
-    meet_db_id = get_or_create_meet(conn, source, source_meet_id, meet_details, caches['meet'])
+    meet_resolver = caches.get('meet_resolver')
+    if meet_resolver is None:
+        meet_resolver = caches['meet_resolver'] = MeetResolver(conn)
+    meet_db_id = get_or_create_meet(conn, source, source_meet_id, meet_details, caches['meet'], meet_resolver)
     
     cursor = conn.cursor()
     inserted_count = 0
@@ -110,17 +212,49 @@ def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pe
             return float(str(v).replace(',', ''))
         except: return None
     
-    for athlete_res in results:
-        # 2. Athlete Identification
-        person_name = standardize_athlete_name(athlete_res['raw_name'])
+    # 2. Athlete Identification (set-based: one resolution stage per package)
+    # Columnar packages expose their identity columns without materializing each athlete
+    if isinstance(results, extraction_library.ColumnarResults):
+        identities = results.identities()
+    else:
+        identities = [(a['raw_name'], a['raw_club'], a['gender_heuristic']) for a in results]
+    
+    person_names = standardize_athlete_names([identity[0] for identity in identities]).tolist()
+    identified = []
+    for i, ((raw_name, raw_club, gender_heuristic), person_name) in enumerate(zip(identities, person_names)):
         if not person_name: continue
-        
-        person_id = get_or_create_person(conn, person_name, athlete_res['gender_heuristic'], caches['person'])
-        
-        club_name = standardize_club_name(athlete_res['raw_club'], club_alias_map)
-        club_id = get_or_create_club(conn, club_name, caches['club'])
-        
-        athlete_id = get_or_create_athlete_link(conn, person_id, club_id, caches['athlete'])
+        club_name = standardize_club_name(raw_club, club_alias_map)
+        identified.append((i, person_name, gender_heuristic, club_name))
+    
+    _, _, athlete_map = resolve_entities_bulk(
+        conn, [(p, g, c) for _, p, g, c in identified], caches
+    )
+    if metrics is not None:
+        metrics.add('resolve', time.perf_counter() - resolve_start, source)
+    dedup_seconds = 0.0
+    
+    # Plan dynamic columns once per package: one migration step, whitelist decisions from memory
+    schema = caches.get('schema')
+    if schema is None:
+        schema = caches['schema'] = SchemaRegistry(cursor)
+    if isinstance(results, extraction_library.ColumnarResults):
+        raw_cols = results.metadata_keys()
+    else:
+        raw_cols = {raw_col for a in results for raw_col in a['dynamic_metadata']}
+    schema.ensure_columns(cursor, [schema.sanitize(c) for c in raw_cols])
+    
+    # Memoized raw_event -> apparatus_id over the Apparatus cache (one dict hit per event after the first)
+    events = caches.get('events')
+    if events is None:
+        events = caches['events'] = event_registry.ApparatusLookup(caches['apparatus'])
+    
+    filepath = data_package.get('filepath', '')
+    is_detailed = "DETAILED" in filepath or "PEREVENT" in filepath
+    enrichments = {}
+    
+    for i, person_name, _, club_name in identified:
+        athlete_res = results[i]
+        athlete_id = athlete_map[(person_name, club_name)]
         
         discipline_id = athlete_res['discipline_id']
         gender = athlete_res['gender_heuristic']
@@ -128,11 +262,12 @@ def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pe
         # 3. Dynamic Metadata Handling
         dynamic_values = {}
         misc_details = {}
-        from etl_functions import METADATA_WHITELIST
         
         for raw_col, val in athlete_res['dynamic_metadata'].items():
-            safe_col = sanitize_column_name(raw_col)
-            if ensure_column_exists(cursor, 'Results', safe_col, 'TEXT'):
+            safe_col = schema.sanitize(raw_col)
+            accepted = schema.is_allowed(safe_col)
+            schema.record(safe_col, accepted)
+            if accepted:
                 if safe_col == 'level':
                     val = standardize_level_name(val)
                 dynamic_values[safe_col] = val
@@ -152,37 +287,21 @@ def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pe
                 final_details['calculated_d'] = True
             details_json = json.dumps(final_details) if final_details else None
 
-            raw_event = app_res['raw_event']
-            
-            # Normalization for apparatus mapping
-            clean_name = raw_event.replace('_', ' ')
-            if clean_name == "Balance Beam": clean_name = "Beam"
-            if clean_name == "Uneven Bars": clean_name = "Uneven Bars"
-            if clean_name == "AllAround" or clean_name == "All Around": clean_name = "All Around"
-            if clean_name == "High Bar" or clean_name == "Horizontal Bar": clean_name = "High Bar"
-            if clean_name == "Parallel Bars": clean_name = "Parallel Bars"
-            if clean_name == "Pommel Horse": clean_name = "Pommel Horse"
-            
-            app_key = (clean_name, discipline_id)
-            if app_key not in caches['apparatus']:
-                # Try raw name too
-                app_key = (raw_event, discipline_id)
-            if app_key not in caches['apparatus']:
-                app_key = (clean_name, 99) # Fallback to 'Other' discipline
-            
-            if app_key not in caches['apparatus']:
+            # Canonical apparatus via the event registry (falls back to the raw name, then 'Other')
+            apparatus_id = events.get(app_res['raw_event'], discipline_id)
+            if apparatus_id is None:
                 continue
-                
-            apparatus_id = caches['apparatus'][app_key]
             
-            # Check Session-Aware Uniqueness via IN-MEMORY SET (O(1) instead of SQL query)
+            # Check Session-Aware Uniqueness via the in-memory key index (SQL only on hash hits)
             current_session = dynamic_values.get('session') or dynamic_values.get('group')
             current_level = dynamic_values.get('level')
             session_id = dynamic_values.get('session_id')
             dup_key = (meet_db_id, athlete_id, apparatus_id, current_session, current_level, session_id)
             
             # Check if this result already exists
+            dedup_start = time.perf_counter()
             is_duplicate = dup_key in existing_results
+            dedup_seconds += time.perf_counter() - dedup_start
 
             score_raw = app_res.get('score_final')
             score_final = to_float(score_raw)
@@ -210,32 +329,10 @@ def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pe
                 details_json = json.dumps(final_details)
 
             if is_duplicate:
-                # For duplicates from DETAILED/PEREVENT files, we still want to update
-                is_detailed = "DETAILED" in data_package.get('filepath', '') or "PEREVENT" in data_package.get('filepath', '')
+                # For duplicates from DETAILED/PEREVENT files, we still want to update (merged once per package below)
                 if is_detailed:
-                    # Fall back to SQL update for detailed files (these are rare)
-                    existing_result_id = check_duplicate_result(conn, meet_db_id, athlete_id, apparatus_id, session=current_session, level=current_level)
-                    if existing_result_id:
-                        cursor.execute("SELECT score_final, score_d, score_text, rank_text, details_json FROM Results WHERE result_id = ?", (existing_result_id,))
-                        db_res = cursor.fetchone()
-                        db_final, db_d, db_text, db_rank, db_json_str = db_res if db_res else (None, None, None, None, None)
-                        db_json = json.loads(db_json_str) if db_json_str else {}
-                        
-                        new_json = json.loads(details_json) if details_json else {}
-                        merged_json = db_json.copy()
-                        merged_json.update(new_json)
-                        details_json = json.dumps(merged_json)
-                        
-                        cursor.execute("""
-                            UPDATE Results 
-                            SET score_final = COALESCE(?, score_final), 
-                                score_d = COALESCE(?, score_d), 
-                                score_text = COALESCE(?, score_text), 
-                                rank_numeric = COALESCE(?, rank_numeric), 
-                                rank_text = COALESCE(?, rank_text), 
-                                details_json = ? 
-                            WHERE result_id = ?
-                        """, (score_final, score_d, score_text, rank_numeric, rank_text, details_json, existing_result_id))
+                    stage_enrichment(enrichments, (meet_db_id, athlete_id, apparatus_id, current_session or None, current_level or None),
+                                     (score_final, score_d, score_text, rank_numeric, rank_text), details_json)
                 continue
             
             # Build row for batch insert
@@ -253,8 +350,74 @@ def write_to_db(conn, data_package, caches, club_alias_map, existing_results, pe
             existing_results.add(dup_key)
             inserted_count += 1
             
+    if enrichments:
+        enrich_start = time.perf_counter()
+        merge_enrichments(cursor, enrichments)
+        if metrics is not None:
+            metrics.add('enrich', time.perf_counter() - enrich_start, source)
+    if metrics is not None:
+        metrics.add('dedup', dedup_seconds, source)
     return inserted_count
 
+# Result columns a DETAILED/PEREVENT duplicate may fill in on the existing row (COALESCE: new non-null wins)
+ENRICH_COLUMNS = ('score_final', 'score_d', 'score_text', 'rank_numeric', 'rank_text')
+
+def stage_enrichment(enrichments, match_key, values, details_json):
+    """
+    Folds one duplicate row into enrichments[match_key] = [*ENRICH_COLUMNS values, details dict].
+    match_key is (meet_db_id, athlete_id, apparatus_id, session, level) with empty session/level as None,
+    the same row check_duplicate_result would find; later rows win, as with one UPDATE per row.
+    """
+    entry = enrichments.get(match_key)
+    if entry is None:
+        entry = enrichments[match_key] = [None] * len(ENRICH_COLUMNS) + [{}]
+    for i, val in enumerate(values):
+        if val is not None:
+            entry[i] = val
+    if details_json:
+        entry[-1].update(json.loads(details_json))
+
+def merge_enrichments(cursor, enrichments):
+    """
+    Applies staged enrichments with one UPDATE ... FROM over a temp table; details_json is merged with json_patch.
+    The target is the first matching row in idx_results_dup_check order (what check_duplicate_result returned);
+    keys with no stored row are skipped. Returns the number of rows updated.
+    """
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS enrich_stage (
+            meet_db_id INTEGER, athlete_id INTEGER, apparatus_id INTEGER, session TEXT, level TEXT,
+            score_final REAL, score_d REAL, score_text TEXT, rank_numeric INTEGER, rank_text TEXT, details_json TEXT
+        )
+    """)
+    cursor.execute("DELETE FROM enrich_stage")
+    cursor.executemany(
+        "INSERT INTO enrich_stage VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [key + tuple(entry[:-1]) + (json.dumps(entry[-1]) if entry[-1] else None,)
+         for key, entry in enrichments.items()]
+    )
+    cursor.execute("""
+        UPDATE Results
+        SET score_final = COALESCE(s.score_final, Results.score_final),
+            score_d = COALESCE(s.score_d, Results.score_d),
+            score_text = COALESCE(s.score_text, Results.score_text),
+            rank_numeric = COALESCE(s.rank_numeric, Results.rank_numeric),
+            rank_text = COALESCE(s.rank_text, Results.rank_text),
+            details_json = json_patch(COALESCE(Results.details_json, '{}'), COALESCE(s.details_json, '{}'))
+        FROM (
+            SELECT e.*, (
+                SELECT r.result_id FROM Results r
+                WHERE r.meet_db_id = e.meet_db_id AND r.athlete_id = e.athlete_id AND r.apparatus_id = e.apparatus_id
+                  AND r.session IS e.session AND r.level IS e.level
+                ORDER BY r.session_id, r.result_id LIMIT 1
+            ) AS target_id
+            FROM enrich_stage e
+        ) AS s
+        WHERE Results.result_id = s.target_id
+    """)
+    updated = cursor.rowcount
+    cursor.execute("DELETE FROM enrich_stage")
+    return updated
+
 
 def flush_pending_inserts(cursor, pending_inserts):
     """
@@ -281,6 +444,174 @@ def flush_pending_inserts(cursor, pending_inserts):
     pending_inserts.clear()
     return total_inserted
 
+# ==============================================================================
+#  GROUP COMMIT (Writer)
+# ==============================================================================
+
+class GroupCommitter:
+    """
+    Commits the writer connection every `max_files` files or `max_seconds` seconds instead of once per file.
+    Each file runs inside its own SAVEPOINT so a failing file is undone alone, and pending inserts are
+    always flushed before COMMIT: a ProcessedFiles mark only becomes durable together with its Results rows.
+    Rows queued by earlier files are flushed before the next file's SAVEPOINT opens, so rolling a file back
+    never takes rows of files already marked processed with it.
+    A crash rolls back to the last group boundary; the uncommitted files are simply re-processed next run.
+    With a db_writer client, each group holds the service's write lease from BEGIN to COMMIT.
+    """
+
+    def __init__(self, conn, pending_inserts, existing_results, max_files=1, max_seconds=0, metrics=None, writer=None):
+        self.conn = conn
+        self.pending_inserts = pending_inserts
+        self.existing_results = existing_results
+        self.max_files = max_files if max_files > 0 or max_seconds > 0 else 1
+        self.max_seconds = max_seconds
+        self.metrics = metrics or load_metrics.LoadMetrics()
+        self.files_in_group = 0
+        self.group_start = time.time()
+        self.commits = 0
+        self.writer = writer
+
+    def begin_file(self, source=load_metrics.RUN_SOURCE):
+        # Explicit BEGIN: releasing an outermost savepoint would otherwise commit the file on its own
+        if not self.conn.in_transaction:
+            if self.writer is not None:
+                with self.metrics.timer('lease'):
+                    self.writer.acquire()
+            self.conn.execute("BEGIN")
+            self.group_start = time.time()
+        if self.pending_inserts:
+            # Earlier files' rows go in before the savepoint: an abort_file() below must not undo them
+            with self.metrics.timer('flush', source):
+                flush_pending_inserts(self.conn.cursor(), self.pending_inserts)
+            self.existing_results.mark_flushed()
+        self.conn.execute("SAVEPOINT loader_file")
+        self.existing_results.checkpoint()
+
+    def end_file(self, source=load_metrics.RUN_SOURCE):
+        """Keeps the file's changes in the open group and commits the group if it is due."""
+        self.conn.execute("RELEASE SAVEPOINT loader_file")
+        self.existing_results.release_checkpoint()
+        self.files_in_group += 1
+        if (self.max_files > 0 and self.files_in_group >= self.max_files) or \
+           (self.max_seconds > 0 and time.time() - self.group_start >= self.max_seconds):
+            self.commit(source)
+
+    def flush(self):
+        """Inserts the queued rows mid-file; they stay inside the file's SAVEPOINT until end_file()."""
+        flush_pending_inserts(self.conn.cursor(), self.pending_inserts)
+        self.existing_results.mark_flushed()
+
+    def abort_file(self):
+        """Undoes the current file's rows, marks, queued inserts and index keys."""
+        self.conn.execute("ROLLBACK TO SAVEPOINT loader_file")
+        self.conn.execute("RELEASE SAVEPOINT loader_file")
+        # The queue was empty at begin_file(), so everything in it belongs to this file
+        self.pending_inserts.clear()
+        self.existing_results.rollback_to_checkpoint()
+
+    def commit(self, source=load_metrics.RUN_SOURCE):
+        """Flushes queued inserts and commits the open group. Returns the number of files committed."""
+        if not self.conn.in_transaction:
+            if self.writer is not None:
+                self.writer.release()
+            return 0
+        committed = self.files_in_group
+        try:
+            if self.pending_inserts:
+                with self.metrics.timer('flush', source):
+                    flush_pending_inserts(self.conn.cursor(), self.pending_inserts)
+                self.existing_results.mark_flushed()
+            with self.metrics.timer('commit', source):
+                self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            self.pending_inserts.clear()
+            self.existing_results.discard_pending()
+            logging.error(f"Group commit failed; {committed} file(s) rolled back and will be re-processed next run.")
+            raise
+        finally:
+            self.files_in_group = 0
+            if self.writer is not None:
+                self.writer.release()
+        self.commits += 1
+        return committed
+
+def reset_entity_caches(conn, caches):
+    """Re-syncs writer caches with the DB after a rollback discarded rows they may reference."""
+    caches['person'].clear()
+    caches['club'].clear()
+    caches['athlete'].clear()
+    caches['meet'] = {(row[1], row[2]): row[0] for row in conn.execute("SELECT meet_db_id, source, source_meet_id FROM Meets").fetchall()}
+    caches.pop('schema', None)
+    caches.pop('person_resolver', None)
+    caches.pop('meet_resolver', None)
+
+def next_batch(batch_queue, reader, poll_seconds=1.0):
+    """Next (kind, payload) from a chunked reader, failing instead of blocking if the reader died."""
+    while True:
+        try:
+            return batch_queue.get(timeout=poll_seconds)
+        except queue.Empty:
+            if reader.done():
+                reader.result()  # Re-raises the worker's crash, if any
+                raise RuntimeError("Chunked reader exited without finishing its file")
+
+def write_chunked_file(conn, batch_queue, reader, stype, fpath, fhash, committer, caches, club_aliases,
+                       existing_results, pending_inserts, metrics):
+    """
+    Writer side of chunked_reader_worker: writes each batch as it arrives, flushing past
+    BATCH_INSERT_SIZE, all inside one file SAVEPOINT that also takes the ProcessedFiles mark,
+    so the file commits or rolls back as a whole. Returns (rows inserted, batches written).
+    Rows other files left queued are flushed by begin_file() before that SAVEPOINT opens, so the
+    mid-file flushes only ever insert this file's rows.
+    A reader error undoes the file's batches and is raised; the file is re-read next run.
+    """
+    inserted = 0
+    batches = 0
+    summary = None
+    try:
+        while True:
+            kind, payload = next_batch(batch_queue, reader)
+            if kind != 'batch':
+                summary = payload
+                break
+            unparsed = payload.get('unparsed_cells')
+            if unparsed:
+                logging.warning(f"  {len(unparsed)} cells did not parse in {os.path.basename(fpath)} batch {batches + 1} (e.g. {unparsed[:3]})")
+            if not batches:
+                committer.begin_file(stype)
+            batches += 1
+            inserted += write_to_db(conn, payload, caches, club_aliases, existing_results, pending_inserts, metrics) or 0
+            del payload  # Free the batch before waiting for the next one
+            if len(pending_inserts) >= BATCH_INSERT_SIZE:
+                with metrics.timer('flush', stype):
+                    committer.flush()
+        metrics.add('extract', summary.get('extract_seconds', 0.0), stype)
+        if kind == 'error':
+            raise RuntimeError(f"Extraction Error: {summary['error']} ({fpath}, after {summary['batches']} batch(es))")
+        if batches:
+            with metrics.timer('mark', stype):
+                mark_file_processed(conn, fpath, fhash)
+    except Exception:
+        if batches:
+            committer.abort_file()
+            reset_entity_caches(conn, caches)
+        if summary is None:
+            # Let the reader run to its end so the queue is empty for the next file
+            try:
+                while next_batch(batch_queue, reader)[0] == 'batch':
+                    pass
+            except Exception:
+                pass
+        raise
+    if batches:
+        try:
+            committer.end_file(stype)
+        except Exception:
+            reset_entity_caches(conn, caches)
+            raise
+    return inserted, batches
+
 def unify_meets(conn):
     """
     Identifies logical meets (Name + Year) and merges them into canonical records.
@@ -301,20 +632,12 @@ def unify_meets(conn):
     
     conn.commit()
 
-    # 2. Identify logical duplicates by (LOWER(TRIM(name)), comp_year)
-    # Exclude "Unnamed:" placeholders from grouping to avoid incorrect merging
-    cursor.execute("""
-        SELECT name, comp_year, MIN(meet_db_id) as canonical_id, GROUP_CONCAT(meet_db_id) as all_ids
-        FROM Meets
-        WHERE name IS NOT NULL AND name != '' AND name NOT LIKE 'Unnamed:%'
-        GROUP BY LOWER(TRIM(name)), comp_year
-        HAVING COUNT(*) > 1
-    """)
-    duplicates = cursor.fetchall()
+    # 2. Identify logical duplicates by (name_key, comp_year) through the same resolver the loader uses
+    # "Unnamed:" placeholders are excluded from grouping to avoid incorrect merging
+    duplicates = MeetResolver(conn).duplicate_groups()
     
     total_unified = 0
-    for name, year, canonical_id, all_ids_str in duplicates:
-        all_ids = [int(i) for i in all_ids_str.split(',')]
+    for name, year, canonical_id, all_ids in duplicates:
         others = [i for i in all_ids if i != canonical_id]
         if not others: continue
         
@@ -331,13 +654,15 @@ def unify_meets(conn):
         
     conn.commit()
     logging.info(f"Meet unification complete. Removed {total_unified} duplicate meet records.")
+    return total_unified
 
 @retry_on_lock()
-def refresh_gold_tables(conn, db_path=DB_FILE):
+def refresh_gold_tables(conn, db_path=DB_FILE, exports=True):
     """
     Creates/Updates flattened 'Gold' tables for MAG and WAG.
     MAG: Gold_Results_MAG (7 triples)
     WAG: Gold_Results_WAG (5 triples)
+    exports=False skips the Supabase SQL export subprocesses (benchmarks, dry runs).
     """
     logging.info(f"Refreshing Gold_Results tables (MAG & WAG) in {db_path}...")
     cursor = conn.cursor()
@@ -524,8 +849,11 @@ def refresh_gold_tables(conn, db_path=DB_FILE):
     cursor.execute("DROP INDEX IF EXISTS tmp_wag_rank_match")
     conn.commit()
     logging.info("Gold tables cleaned and deduplicated successfully.")
-    
-    # Trigger SQL Export Generation
+    if exports:
+        run_gold_exports(db_path)
+
+def run_gold_exports(db_path=DB_FILE):
+    """L1/L2 tables and Supabase SQL exports. Runs outside any write lease: generate_modified_gold writes through the service itself."""
     logging.info(f"Generating SQL exports for Supabase from {db_path}...")
     try:
         import subprocess
@@ -668,41 +996,96 @@ def verify_multi_day_totals(cursor, table_name):
 #  MAIN ORCHESTRATOR
 # ==============================================================================
 
+# Normalized manifests by path, reused while the CSV is unchanged: (scraper_type, path) -> ((mtime_ns, size), manifest)
+_MANIFEST_CACHE = {}
+
 def load_manifest(scraper_type, filepath):
     if not os.path.exists(filepath):
         # Create empty manifest if missing, to prevent crash
         return {}
     
-    try:
-        df = pd.read_csv(filepath)
-    except Exception as e:
-        logging.error(f"Error reading manifest {filepath}: {e}")
-        return {}
+    stat = os.stat(filepath)
+    cache_key = (scraper_type, os.path.abspath(filepath))
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _MANIFEST_CACHE.get(cache_key)
+    if cached is None or cached[0] != signature:
+        try:
+            df = pd.read_csv(filepath)
+        except Exception as e:
+            logging.error(f"Error reading manifest {filepath}: {e}")
+            return {}
+        cached = _MANIFEST_CACHE[cache_key] = (signature, normalize_manifest(df))
+    # Extractors fill missing details in place; hand out copies so the cached entries stay clean
+    return {mid: dict(details) for mid, details in cached[1].items()}
 
+def normalize_manifest(df):
+    """
+    Manifest DataFrame -> {MeetID: details}, normalized column-wise: years lose their .0 and
+    'date_iso' holds the ISO date (each distinct Year / date string is parsed once).
+    """
+    def column(name, default=None):
+        return df[name].tolist() if name in df.columns else [default] * len(df)
+    
+    mids = [str(mid).strip() for mid in column('MeetID', '')]
+    names = column('MeetName')
+    dates = column('start_date_iso' if 'start_date_iso' in df.columns else 'Date')
+    locations = column('Location' if 'Location' in df.columns else 'State')
+    years = normalize_years(column('Year')).tolist()
+    dates_iso = normalize_dates(dates).tolist()
+    
     manifest_data = {}
-    for _, row in df.iterrows():
-        mid = str(row.get('MeetID', '')).strip()
+    for mid, name, date, location, year, date_iso in zip(mids, names, dates, locations, years, dates_iso):
         if not mid or mid == 'nan': continue
-        
-        # Helper to safely get year as string without .0
-        raw_year = row.get('Year')
-        clean_year = None
-        if pd.notnull(raw_year) and str(raw_year).strip() != '':
-            try:
-                clean_year = str(int(float(raw_year)))
-            except:
-                clean_year = str(raw_year).strip()
-        
-        details = {
-            'name': row.get('MeetName'),
-            'start_date_iso': row.get('start_date_iso') if 'start_date_iso' in row else row.get('Date'),
-            'location': row.get('Location') if 'Location' in row else row.get('State'),
-            'year': clean_year
+        manifest_data[mid] = {
+            'name': name,
+            'start_date_iso': date,
+            'location': location,
+            'year': year,
+            'date_iso': date_iso
         }
-        manifest_data[mid] = details
         
     return manifest_data
 
+def manifest_key(scraper_type, filepath):
+    """Manifest id of a result file: the file name up to the source's separator."""
+    filename = os.path.basename(filepath)
+    if scraper_type == 'kscore':
+        return filename.split('_FINAL_')[0]
+    if scraper_type == 'mso':
+        return filename.split('_mso.csv')[0]
+    # Livemeet / KSIS: first part (e.g. 9143_ksis_299177_... -> 9143)
+    return filename.split('_')[0]
+
+def find_input_files(manifests, level_aliases, root=''):
+    """
+    Lists (scraper_type, filepath, manifest_entry, aliases) for every loadable CSV under root.
+    manifests: {'kscore': {...}, 'livemeet': {...}, 'mso': {...}, 'ksis': {...}} as returned by load_manifest.
+    """
+    files = []
+    
+    # KScore
+    k_files = glob.glob(os.path.join(root, KSCORE_DIR, "*_FINAL_*.csv"))
+    for f in k_files: files.append(('kscore', f, manifests['kscore'].get(manifest_key('kscore', f), {}), level_aliases))
+    
+    # LiveMeet
+    l_files = glob.glob(os.path.join(root, LIVEMEET_DIR, "*_FINAL_*.csv"))
+    l_files += glob.glob(os.path.join(root, LIVEMEET_DIR, "*_PEREVENT_*.csv"))
+    l_files += glob.glob(os.path.join(root, LIVEMEET_DIR, "*_BYEVENT_*.csv"))
+    for f in l_files: files.append(('livemeet', f, manifests['livemeet'].get(manifest_key('livemeet', f), {}), None))
+    
+    # MSO
+    m_files = glob.glob(os.path.join(root, MSO_DIR, "*_mso.csv"))
+    for f in m_files: files.append(('mso', f, manifests['mso'].get(manifest_key('mso', f), {}), None))
+
+    # KSIS
+    ksis_files = glob.glob(os.path.join(root, KSIS_DIR, "*.csv"))
+    for f in ksis_files: 
+        files.append(('ksis', f, manifests['ksis'].get(manifest_key('ksis', f), {}), None))
+
+    # Prioritize MSO files by sorting them to the front of the queue
+    files.sort(key=lambda x: 0 if x[0] == 'mso' else 1)
+    return files
+
 def heal_meets_metadata(conn, kscore_manifest, livemeet_manifest, mso_manifest, ksis_manifest):
     """
     Backfills missing metadata (year, name, date, etc.) for all existing meets.
@@ -755,7 +1138,7 @@ def heal_meets_metadata(conn, kscore_manifest, livemeet_manifest, mso_manifest,
             updates.append("name = ?")
             params.append(str(manifest_name).strip())
             
-        manifest_date = parse_date_to_iso(details.get('start_date_iso'))
+        manifest_date = details['date_iso'] if 'date_iso' in details else parse_date_to_iso(details.get('start_date_iso'))
         if manifest_date and (not db_date or str(db_date).strip() == ''):
             updates.append("start_date_iso = ?")
             params.append(str(manifest_date))
@@ -781,10 +1164,38 @@ def main():
     parser.add_argument("--limit", type=int, default=0, help="Maximum number of files to process")
     parser.add_argument("--gold-only", action="store_true", help="Skip file processing and only refresh Gold tables")
     parser.add_argument("--db-file", type=str, default=DB_FILE, help="Path to SQLite database file")
+    parser.add_argument("--verify-all", action="store_true", help="Re-hash every file, ignoring the stat fingerprint index")
+    parser.add_argument("--rebuild-dedup-index", action="store_true", help="Rebuild the duplicate-key index from a full Results scan")
+    parser.add_argument("--max-inflight", type=int, default=0, help="Max files submitted but not yet written (default: 2x workers)")
+    parser.add_argument("--columnar", action="store_true", help="Ship extraction results from workers in the compact columnar format")
+    parser.add_argument("--metrics-file", type=str, default=None, help="Where to write the per-stage timing JSON (default: loader_metrics/load_run_<timestamp>.json)")
+    parser.add_argument("--live-metrics", action="store_true", help="Print a per-stage throughput summary with each progress update")
+    parser.add_argument("--group-commit", type=int, default=1, help="Commit every N files (0 = only on --group-commit-seconds)")
+    parser.add_argument("--group-commit-seconds", type=float, default=0, help="Also commit once the open group is this many seconds old")
+    parser.add_argument("--cache-size", type=int, default=LRU_CACHE_SIZE, help="Max entries per Person/Club/Athlete cache (0 = unbounded)")
+    parser.add_argument("--warm-cache", action="store_true", help="Start the entity caches from the snapshot saved by the last run")
+    parser.add_argument("--no-writer-service", action="store_true", help="Write directly even if a db_writer service is running")
+    parser.add_argument("--prewarm-workers", action="store_true", help="Readers load manifests, aliases and pandas once at start; tasks carry only the file path")
+    parser.add_argument("--plan-cache-dir", type=str, default=extraction_library.PLAN_CACHE_DIR, help="Where per-header-layout extraction plans are kept ('' = do not persist)")
+    parser.add_argument("--chunk-rows", type=int, default=0, help="Stream files of at least --chunk-min-mb in batches of this many rows (0 = read every file whole)")
+    parser.add_argument("--chunk-min-mb", type=float, default=50, help="Size from which a file is extracted in chunks when --chunk-rows is set")
     args = parser.parse_args()
+    metrics = load_metrics.LoadMetrics()
+    # Set before the pool starts so every reader process shares the same plan store
+    extraction_library.set_plan_cache_dir(args.plan_cache_dir)
+    stale_plans = extraction_library.prune_stale_plans()
+    if stale_plans:
+        logging.info(f"Removed {stale_plans} extraction plan store(s) of older extractor code")
+
+    # Cooperating writers (other loader runs, gold refreshes, generate_modified_gold) take turns via the service
+    writer = None if args.no_writer_service else db_writer.connect(args.db_file)
+    if writer is not None:
+        logging.info(f"Writing through DB writer service at {writer.address}")
 
     # 1. Load context
-    if not setup_database(args.db_file):
+    with db_writer.lease(writer):
+        db_ready = setup_database(args.db_file)
+    if not db_ready:
         logging.error("Database setup failed. Exiting.")
         return
         
@@ -794,43 +1205,14 @@ def main():
     mso_manifest = load_manifest('mso', MSO_MANIFEST)
     ksis_manifest = load_manifest('ksis', KSIS_MANIFEST)
     
-    # HEAL METADATA FIRST
-    with sqlite3.connect(args.db_file, timeout=30) as conn:
+    # HEAL METADATA FIRST (in a write turn, like the setup above; the connection commits before the lease is released)
+    with db_writer.lease(writer), sqlite3.connect(args.db_file, timeout=30) as conn:
         conn.execute("PRAGMA journal_mode=WAL;")
         heal_meets_metadata(conn, kscore_manifest, livemeet_manifest, mso_manifest, ksis_manifest)
 
     # 2. Find files
-    files_to_process = []
-    
-    # KScore
-    level_aliases = {}
-    if os.path.exists("kscore_level_aliases.json"):
-        with open("kscore_level_aliases.json", 'r') as f:
-            level_aliases = json.load(f)
-
-    k_files = glob.glob(os.path.join(KSCORE_DIR, "*_FINAL_*.csv"))
-    for f in k_files: files_to_process.append(('kscore', f, kscore_manifest.get(os.path.basename(f).split('_FINAL_')[0], {}), level_aliases))
-    
-    # LiveMeet
-    l_files = glob.glob(os.path.join(LIVEMEET_DIR, "*_FINAL_*.csv"))
-    l_files += glob.glob(os.path.join(LIVEMEET_DIR, "*_PEREVENT_*.csv"))
-    l_files += glob.glob(os.path.join(LIVEMEET_DIR, "*_BYEVENT_*.csv"))
-    for f in l_files: files_to_process.append(('livemeet', f, livemeet_manifest.get(os.path.basename(f).split('_')[0], {}), None))
-    
-    # MSO
-    m_files = glob.glob(os.path.join(MSO_DIR, "*_mso.csv"))
-    for f in m_files: files_to_process.append(('mso', f, mso_manifest.get(os.path.basename(f).split('_mso.csv')[0], {}), None))
-
-    # KSIS
-    ksis_files = glob.glob(os.path.join(KSIS_DIR, "*.csv"))
-    for f in ksis_files: 
-        # Filename example: 9143_ksis_299177_...
-        # Source meet ID is the first part (9143)
-        mid = os.path.basename(f).split('_')[0]
-        files_to_process.append(('ksis', f, ksis_manifest.get(mid, {}), None))
-
-    # Prioritize MSO files by sorting them to the front of the queue
-    files_to_process.sort(key=lambda x: 0 if x[0] == 'mso' else 1)
+    manifests = {'kscore': kscore_manifest, 'livemeet': livemeet_manifest, 'mso': mso_manifest, 'ksis': ksis_manifest}
+    files_to_process = find_input_files(manifests, KSCORE_LEVEL_ALIASES)
     # Note: We don't shuffle anymore to maintain this priority, 
     # but the ProcessPoolExecutor will still process files in parallel.
     if args.sample > 1: files_to_process = files_to_process[::args.sample]
@@ -840,6 +1222,7 @@ def main():
         return
 
     completed = 0
+    caches = {}
     start_time = time.time()
     
     # 3. Filter by processed state AND apply limit
@@ -848,33 +1231,61 @@ def main():
     if not args.gold_only:
         with sqlite3.connect(args.db_file) as conn:
             processed_map = {row[0]: True for row in conn.execute("SELECT file_hash FROM ProcessedFiles").fetchall()}
+            fingerprints = load_fingerprint_index(conn)
             
             print(f"Checking {len(files_to_process)} files against DB...")
-            # Parallelize hashing
-            with ProcessPoolExecutor(max_workers=args.workers) as executor:
-                # We need to map back the results to our files_to_process items
-                # Pass only filepath to hash_worker
-                future_to_file_info = {
-                    executor.submit(calculate_file_hash, item[1]): item 
-                    for item in files_to_process
-                }
-                
-                h_done = 0
-                h_total = len(files_to_process)
-                for future in as_completed(future_to_file_info):
-                    item = future_to_file_info[future]
-                    stype, fpath, manifest, aliases = item
-                    fhash = future.result()
-                    h_done += 1
-                    
+            # Reuse the stored hash when (size, mtime_ns, inode) is unchanged; only hash the rest
+            to_hash = []
+            fresh_fingerprints = []
+            for item in files_to_process:
+                stype, fpath, manifest, aliases = item
+                signature = get_file_signature(fpath)
+                if signature is None: continue
+                known = fingerprints.get(fpath)
+                if not args.verify_all and known and known[0] == signature:
+                    fhash = known[1]
                     if fhash and fhash not in processed_map:
-                         unprocessed.append((stype, fpath, fhash, manifest, aliases))
-                         if args.limit > 0 and len(unprocessed) >= args.limit:
-                             executor.shutdown(wait=False, cancel_futures=True)
-                             break
+                        unprocessed.append((stype, fpath, fhash, manifest, aliases))
+                else:
+                    to_hash.append((item, signature))
+            logging.info(f"Fingerprint index: {len(files_to_process) - len(to_hash)} unchanged, {len(to_hash)} to hash")
+            
+            if args.limit > 0 and len(unprocessed) >= args.limit:
+                unprocessed = unprocessed[:args.limit]
+                to_hash = []
+            
+            if to_hash:
+                # Parallelize hashing
+                with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                    # Pass only filepath to hash_worker
+                    future_to_file_info = {
+                        executor.submit(hash_worker, item[1]): (item, signature)
+                        for item, signature in to_hash
+                    }
                     
-                    if h_done % 5000 == 0:
-                        logging.info(f"Hashing Progress: {h_done}/{h_total}")
+                    h_done = 0
+                    h_total = len(to_hash)
+                    for future in as_completed(future_to_file_info):
+                        item, signature = future_to_file_info[future]
+                        stype, fpath, manifest, aliases = item
+                        fhash, hash_seconds = future.result()
+                        metrics.add('hash', hash_seconds, stype)
+                        h_done += 1
+                        if fhash:
+                            fresh_fingerprints.append((fpath, signature, fhash))
+                        
+                        if fhash and fhash not in processed_map:
+                             unprocessed.append((stype, fpath, fhash, manifest, aliases))
+                             if args.limit > 0 and len(unprocessed) >= args.limit:
+                                 executor.shutdown(wait=False, cancel_futures=True)
+                                 break
+                        
+                        if h_done % 5000 == 0:
+                            logging.info(f"Hashing Progress: {h_done}/{h_total}")
+            
+            if fresh_fingerprints:
+                with db_writer.lease(writer), conn:
+                    save_fingerprints(conn, fresh_fingerprints)
     
     logging.info(f"Total files found: {len(files_to_process)}. New/Changed: {len(unprocessed)}")
     print(f"Total files found: {len(files_to_process)}. New to process: {len(unprocessed)}")
@@ -886,35 +1297,24 @@ def main():
             logging.info("No unprocessed files found.")
         else:
             # 4. Process in Parallel with OPTIMIZED caching
-            caches = {}
             with sqlite3.connect(args.db_file) as conn:
                 # --- CREATE MISSING INDEX for duplicate checks (one-time operation) ---
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_results_dup_check 
-                    ON Results(meet_db_id, athlete_id, apparatus_id, session, level, session_id)
-                """)
-                conn.commit()
+                with db_writer.lease(writer):
+                    conn.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_results_dup_check 
+                        ON Results(meet_db_id, athlete_id, apparatus_id, session, level, session_id)
+                    """)
+                    conn.commit()
                 
                 # --- LRU BOUNDED CACHES ---
                 # Only load small, static tables fully (apparatus ~50 rows, meets ~1.4K rows)
-                # Person, Club, Athlete use LRU caches populated on-demand by etl_functions
-                caches['person'] = {}  # Start empty, filled on-demand with LRU_CACHE_SIZE limit
-                caches['club'] = {}    # Start empty, filled on-demand
-                caches['athlete'] = {} # Start empty, filled on-demand
+                # Person, Club, Athlete use LRU caches (--cache-size entries each) populated on-demand
+                caches.update(entity_cache.open_entity_caches(conn, args.db_file, args.cache_size, warm_start=args.warm_cache))
                 caches['apparatus'] = {(row[1], row[2]): row[0] for row in conn.execute("SELECT apparatus_id, name, discipline_id FROM Apparatus").fetchall()}
                 caches['meet'] = {(row[1], row[2]): row[0] for row in conn.execute("SELECT meet_db_id, source, source_meet_id FROM Meets").fetchall()}
                 
-                # --- BUILD IN-MEMORY DUPLICATE SET (O(1) lookup instead of per-row SQL) ---
-                logging.info("Building in-memory duplicate check set...")
-                existing_results = set()
-                cursor = conn.cursor()
-                cursor.execute("SELECT meet_db_id, athlete_id, apparatus_id, session, level, session_id FROM Results")
-                while True:
-                    rows = cursor.fetchmany(50000)  # Fetch in batches to reduce memory spikes
-                    if not rows:
-                        break
-                    for row in rows:
-                        existing_results.add(tuple(row))
+                # --- COMPACT DUPLICATE-KEY INDEX (snapshot + catch-up instead of a full set build) ---
+                existing_results = result_key_index.ResultKeyIndex.load(conn, args.db_file, rebuild=args.rebuild_dedup_index)
                 logging.info(f"Loaded {len(existing_results)} existing result keys for duplicate checking.")
 
             total = len(unprocessed)
@@ -934,19 +1334,46 @@ def main():
                 
                 # --- BATCH INSERT ACCUMULATOR ---
                 pending_inserts = []
+                existing_results.attach(conn)
                 
-                with ProcessPoolExecutor(max_workers=args.workers) as executor:
-                    future_to_file = {
-                        executor.submit(reader_worker, stype, fpath, manifest, aliases): (stype, fpath, fhash) 
+                # --- GROUP COMMIT: one COMMIT per N files / T seconds, one SAVEPOINT per file ---
+                committer = GroupCommitter(conn, pending_inserts, existing_results,
+                                           max_files=args.group_commit, max_seconds=args.group_commit_seconds,
+                                           metrics=metrics, writer=writer)
+                
+                # --- BOUNDED STREAMING: only max_inflight extractions outstanding at once ---
+                max_inflight = args.max_inflight if args.max_inflight > 0 else args.workers * 2
+                # --- CHUNKED FILES: very large files are streamed batch by batch after the others ---
+                chunked = []
+                if args.chunk_rows > 0:
+                    min_bytes = args.chunk_min_mb * 1024 * 1024
+                    chunked = [item for item in unprocessed if os.path.getsize(item[1]) >= min_bytes]
+                    if chunked:
+                        chunked_paths = {item[1] for item in chunked}
+                        unprocessed = [item for item in unprocessed if item[1] not in chunked_paths]
+                        logging.info(f"{len(chunked)} file(s) of {args.chunk_min_mb} MB or more will be extracted in batches of {args.chunk_rows} rows")
+
+                if args.prewarm_workers:
+                    # Manifests and aliases reach each worker once (initializer), not with every task
+                    context = {'manifests': manifests, 'level_aliases': KSCORE_LEVEL_ALIASES,
+                               'columnar': args.columnar, 'plan_cache_dir': extraction_library.PLAN_CACHE_DIR}
+                    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=init_reader_worker, initargs=(context,))
+                    worker_fn = prewarmed_reader_worker
+                    work_items = (((stype, fpath, fhash), (stype, fpath)) for stype, fpath, fhash, _, _ in unprocessed)
+                else:
+                    pool = ProcessPoolExecutor(max_workers=args.workers)
+                    worker_fn = reader_worker
+                    work_items = (
+                        ((stype, fpath, fhash), (stype, fpath, manifest, aliases, args.columnar))
                         for stype, fpath, fhash, manifest, aliases in unprocessed
-                    }
-                    
-                    for future in as_completed(future_to_file):
+                    )
+                
+                with pool as executor:
+                    for (stype, fpath, fhash), future, in_flight in iter_bounded(executor, worker_fn, work_items, max_inflight):
                         if stop_requested:
                             executor.shutdown(wait=False, cancel_futures=True)
                             break
 
-                        stype, fpath, fhash = future_to_file[future]
                         completed += 1
                         
                         print(f"[{stype} {completed}/{total}] {os.path.basename(fpath)}")
@@ -954,17 +1381,36 @@ def main():
                         try:
                             data_package = future.result()
                             if data_package:
-                                # ATOMIC TRANSACTION: Ensure file data AND "processed" mark are committed together
-                                with conn:
-                                    write_to_db(conn, data_package, caches, club_aliases, existing_results, pending_inserts)
+                                metrics.add('extract', data_package.get('extract_seconds', 0.0), stype)
+                                unparsed = data_package.get('unparsed_cells')
+                                if unparsed:
+                                    logging.warning(f"  {len(unparsed)} cells did not parse in {os.path.basename(fpath)} (e.g. {unparsed[:3]})")
+                                # ATOMIC PER FILE: file data AND "processed" mark commit together (in the file's group)
+                                committer.begin_file(stype)
+                                try:
+                                    inserted = write_to_db(conn, data_package, caches, club_aliases, existing_results, pending_inserts, metrics)
                                     
                                     # Flush batch when threshold reached
                                     if len(pending_inserts) >= BATCH_INSERT_SIZE:
-                                        cursor = conn.cursor()
-                                        flush_pending_inserts(cursor, pending_inserts)
+                                        with metrics.timer('flush', stype):
+                                            cursor = conn.cursor()
+                                            flush_pending_inserts(cursor, pending_inserts)
+                                            existing_results.mark_flushed()
                                     
-                                    mark_file_processed(conn, fpath, fhash)
+                                    with metrics.timer('mark', stype):
+                                        mark_file_processed(conn, fpath, fhash)
+                                except Exception:
+                                    committer.abort_file()
+                                    reset_entity_caches(conn, caches)
+                                    raise
+                                try:
+                                    committer.end_file(stype)
+                                except Exception:
+                                    reset_entity_caches(conn, caches)
+                                    raise
+                                metrics.count_file(stype, rows=inserted or 0, failed='error' in data_package)
                         except Exception as e:
+                            metrics.count_file(stype, failed=True)
                             logging.error(f"Error processing {fpath}: {e}")
                             import traceback
                             logging.error(traceback.format_exc())
@@ -973,33 +1419,94 @@ def main():
                             elapsed = time.time() - start_time
                             rate = completed / elapsed
                             remaining = (total - completed) / rate if rate > 0 else 0
-                            logging.info(f"Progress: [{completed}/{total}] ({rate:.2f} files/s, ETA: {remaining/60:.1f}m)")
+                            logging.info(f"Progress: [{completed}/{total}] ({rate:.2f} files/s, ETA: {remaining/60:.1f}m, in-flight: {in_flight}/{max_inflight}, queued: {total - completed - in_flight})")
+                            if args.live_metrics:
+                                summary = metrics.summary_line()
+                                print(summary)
+                                logging.info(summary)
+                    
+                    if chunked and not stop_requested:
+                        # One chunked file at a time: its reader holds a pool slot, the bounded queue caps its lead
+                        with multiprocessing.Manager() as manager:
+                            batch_queue = manager.Queue(maxsize=CHUNK_QUEUE_BATCHES)
+                            for stype, fpath, fhash, manifest, aliases in chunked:
+                                if stop_requested:
+                                    break
+                                completed += 1
+                                print(f"[{stype} {completed}/{total}] {os.path.basename(fpath)} (chunked)")
+                                reader = executor.submit(chunked_reader_worker, stype, fpath, dict(manifest), aliases,
+                                                         args.columnar, batch_queue, args.chunk_rows)
+                                try:
+                                    inserted, batches = write_chunked_file(conn, batch_queue, reader, stype, fpath, fhash, committer,
+                                                                           caches, club_aliases, existing_results, pending_inserts, metrics)
+                                    logging.info(f"  {os.path.basename(fpath)}: {inserted} rows from {batches} batch(es)")
+                                    if batches:
+                                        metrics.count_file(stype, rows=inserted)
+                                except Exception as e:
+                                    metrics.count_file(stype, failed=True)
+                                    logging.error(f"Error processing {fpath}: {e}")
+                                    import traceback
+                                    logging.error(traceback.format_exc())
                 
-                # Flush any remaining pending inserts
-                if pending_inserts:
-                    cursor = conn.cursor()
-                    flushed = flush_pending_inserts(cursor, pending_inserts)
-                    logging.info(f"Final batch flush: {flushed} results inserted.")
-                    conn.commit()
+                # Flush and commit the last open group
+                final_files = committer.commit()
+                logging.info(f"Final group commit: {final_files} file(s); {committer.commits} commits this run.")
+                
+                existing_results.save(args.db_file, conn)
+                logging.info(f"Duplicate-key index saved ({len(existing_results)} keys, stats: {existing_results.stats}).")
+                
+                entity_cache.save_snapshot(caches, conn, args.db_file)
+                logging.info(f"Entity caches this run: {entity_cache.cache_stats(caches)}")
+                
+                if LEVEL_INDEX.unmatched:
+                    logging.info(f"Levels with no alias this run (add to level_aliases.json): {dict(LEVEL_INDEX.unmatched.most_common(30))}")
+                if 'person_resolver' in caches:
+                    logging.info(f"Person resolver this run: {caches['person_resolver'].stats}")
+                if 'schema' in caches:
+                    schema = caches['schema']
+                    logging.info(f"Dynamic column usage this run: {dict(sorted(schema.usage.items(), key=lambda kv: -kv[1]))}")
+                    logging.info(f"Metadata routed to details_json: {dict(sorted(schema.rejected.items(), key=lambda kv: -kv[1])[:20])}")
     else:
         logging.info("Skipping CSV processing due to --gold-only flag.")
 
-    # 5. Autonomous Cleanup & Unification
-    with sqlite3.connect(args.db_file, timeout=60) as conn:
+    # 5. Autonomous Cleanup & Unification (one write turn; the connection commits before the lease is released)
+    with db_writer.lease(writer), sqlite3.connect(args.db_file, timeout=60) as conn:
         conn.execute("PRAGMA journal_mode=WAL;")
         
         logging.info("Running Metadata Healing Pass...")
-        heal_meets_metadata(conn, kscore_manifest, livemeet_manifest, mso_manifest, ksis_manifest)
+        with metrics.timer('heal'):
+            heal_meets_metadata(conn, kscore_manifest, livemeet_manifest, mso_manifest, ksis_manifest)
+        
+        with metrics.timer('unify'):
+            unified = unify_meets(conn)
+        if unified:
+            # Merged meets rewrite Results.meet_db_id, so the key snapshot no longer matches
+            result_key_index.invalidate_snapshot(args.db_file)
         
-        unify_meets(conn)
+        # Healed names/locations cleared their classifier_version; classify them again
+        reclassified = ensure_meet_classification(conn)
+        if reclassified:
+            logging.info(f"Re-classified {reclassified} meets (country / competition type).")
         
-        refresh_gold_tables(conn, args.db_file)
+        with metrics.timer('gold_refresh'):
+            refresh_gold_tables(conn, args.db_file, exports=False)
+    
+    with metrics.timer('gold_exports'):
+        run_gold_exports(args.db_file)
+    if writer is not None:
+        writer.close()
 
     if not args.gold_only:
         logging.info(f"Finished! Processed {completed} files in {time.time() - start_time:.2f}s.")
     else:
         logging.info(f"Gold table refresh complete in {time.time() - start_time:.2f}s.")
 
+    metrics_path = metrics.write(args.metrics_file or load_metrics.default_metrics_path(),
+                                 extra={'db_file': args.db_file, 'workers': args.workers, 'files_completed': completed,
+                                        'unmatched_levels': dict(LEVEL_INDEX.unmatched.most_common()),
+                                        'entity_caches': entity_cache.cache_stats(caches)})
+    logging.info(f"Load metrics written to {metrics_path}")
+
 if __name__ == "__main__":
     logging.basicConfig(
         filename='loader_orchestrator.log',
@@ -8,17 +8,25 @@ import re
 import argparse
 import gc  # Explicit garbage collection
 
+import pandas as pd
+
+import event_registry
+import entity_cache
+from extraction_library import parse_mso_cells
+
 # --- Import shared functions ---
 from etl_functions import (
     setup_database,
     load_club_aliases,
     standardize_club_name,
-    standardize_athlete_name,
+    standardize_athlete_names,
     detect_discipline,
     get_or_create_person,
     get_or_create_club,
     get_or_create_athlete_link,
     get_or_create_meet,
+    ensure_meet_name_key,
+    ensure_meet_classification,
     calculate_file_hash,
     is_file_processed,
     mark_file_processed,
@@ -35,24 +43,6 @@ DB_FILE = "gym_data.db"
 MSO_CSVS_DIR = "CSVs_mso_final" 
 MSO_MANIFEST_FILE = "discovered_meet_ids_mso.csv"
 
-# --- MSO Column Mappings ---
-COLUMN_MAP = {
-    'Gymnast': 'Name',
-    'Team': 'Club',
-    'Sess': 'Session',
-    'Lvl': 'Level',
-    'Div': 'Age_Group',
-    'VT': 'Vault', 'VAULT': 'Vault',
-    'UB': 'Uneven Bars', 'BARS': 'Uneven Bars', 'UNEVEN BARS': 'Uneven Bars',
-    'BB': 'Beam', 'BEAM': 'Beam', 'Balance Beam': 'Beam',
-    'FX': 'Floor', 'FLR': 'Floor', 'FLOOR': 'Floor',
-    'AA': 'All Around', 'ALL AROUND': 'All Around',
-    'PH': 'Pommel Horse', 'POMMEL HORSE': 'Pommel Horse', 'POMML': 'Pommel Horse',
-    'SR': 'Rings', 'RINGS': 'Rings',
-    'PB': 'Parallel Bars', 'PBARS': 'Parallel Bars', 'PARALLEL BARS': 'Parallel Bars',
-    'HB': 'High Bar', 'HIBAR': 'High Bar', 'HIGH BAR': 'High Bar'
-}
-
 def load_meet_manifest(manifest_file):
     print(f"--- Loading MSO meet manifest from '{manifest_file}' ---")
     try:
@@ -138,7 +128,7 @@ def parse_cell_value(cell_str):
     
     return score_final, None, rank_numeric, rank_text, None
 
-def process_mso_files(meet_manifest, club_alias_map, sample_rate=1):
+def process_mso_files(meet_manifest, club_alias_map, sample_rate=1, cache_size=entity_cache.DEFAULT_CACHE_SIZE, warm_cache=False):
     print(f"\n--- Starting to process MSO result files (Sample Rate: {sample_rate}) ---")
     search_pattern = os.path.join(MSO_CSVS_DIR, "*_mso.csv")
     csv_files = glob.glob(search_pattern)
@@ -153,10 +143,11 @@ def process_mso_files(meet_manifest, club_alias_map, sample_rate=1):
     try:
         with sqlite3.connect(DB_FILE) as conn:
             # Initial Caches
-            person_cache = {row[1]: row[0] for row in conn.execute("SELECT person_id, full_name FROM Persons").fetchall()}
-            club_cache = {row[1]: row[0] for row in conn.execute("SELECT club_id, name FROM Clubs").fetchall()}
-            athlete_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT athlete_id, person_id, club_id FROM Athletes").fetchall()}
+            entities = entity_cache.open_entity_caches(conn, DB_FILE, cache_size, warm_start=warm_cache)
+            person_cache, club_cache, athlete_cache = entities['person'], entities['club'], entities['athlete']
             apparatus_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT apparatus_id, name, discipline_id FROM Apparatus").fetchall()}
+            ensure_meet_name_key(conn)  # get_or_create_meet matches meets on the indexed name_key
+            ensure_meet_classification(conn)  # ...and stores the classification it computes
             meet_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT meet_db_id, source, source_meet_id FROM Meets").fetchall()}
 
             for i, filepath in enumerate(csv_files):
@@ -173,14 +164,15 @@ def process_mso_files(meet_manifest, club_alias_map, sample_rate=1):
                 if success:
                     mark_file_processed(conn, filepath, file_hash)
                 
-                # Periodically clear caches if they get too large (every 500 files)
+                # Entity caches are size-bounded; only collect parse garbage periodically (every 500 files)
                 if i > 0 and i % 500 == 0:
-                    print("  -> Periodic cache refresh to manage memory...")
-                    person_cache = {row[1]: row[0] for row in conn.execute("SELECT person_id, full_name FROM Persons").fetchall()}
-                    club_cache = {row[1]: row[0] for row in conn.execute("SELECT club_id, name FROM Clubs").fetchall()}
-                    athlete_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT athlete_id, person_id, club_id FROM Athletes").fetchall()}
                     gc.collect()
 
+            # Commit before snapshotting so the cached ids match what later runs will see
+            conn.commit()
+            entity_cache.save_snapshot(entities, conn, DB_FILE)
+            print(f"Entity caches: {entity_cache.cache_stats(entities)}")
+
     except Exception as e:
         print(f"Critical error: {e}")
         traceback.print_exc()
@@ -224,17 +216,15 @@ def parse_mso_file(filepath, conn, person_cache, club_cache, athlete_cache, appa
 
     apparatus_cols = []
     dynamic_metadata_cols = []
-    known_apparatus_keys = ['Vault', 'Uneven Bars', 'Beam', 'Floor', 'All Around', 'Pommel Horse', 'Rings', 'Parallel Bars', 'High Bar']
     
     for col in headers:
-        norm_key = COLUMN_MAP.get(col.strip(), col)
-        if norm_key in known_apparatus_keys:
+        if event_registry.mso_event(col):
             apparatus_cols.append(col)
         elif col not in [name_col, club_col]:
              dynamic_metadata_cols.append(col)
 
-    detected_apparatus_names = [COLUMN_MAP.get(c.strip(), c) for c in apparatus_cols]
-    if any(x in ['Pommel Horse', 'Rings', 'Parallel Bars', 'High Bar'] for x in detected_apparatus_names):
+    detected_apparatus_names = [event_registry.mso_event(c) for c in apparatus_cols]
+    if any(x in event_registry.MAG_ONLY_EVENTS for x in detected_apparatus_names):
         discipline_id = 2 # MAG
         gender_heuristic = 'M'
     else:
@@ -251,10 +241,22 @@ def parse_mso_file(filepath, conn, person_cache, club_cache, athlete_cache, appa
     ensure_column_exists(cursor, 'Results', 'bonus', 'REAL')
     ensure_column_exists(cursor, 'Results', 'execution_bonus', 'REAL')
 
+    # All apparatus cells of the file parsed at once (same results as parse_cell_value per cell)
+    cells = pd.DataFrame([[row.get(c) for c in apparatus_cols] for row in rows], columns=apparatus_cols, dtype=object)
+    parsed = parse_mso_cells(cells, parse_cell=parse_cell_value)
+    score_rows = parsed['score_final'].to_numpy().tolist()
+    d_rows = parsed['score_d'].to_numpy().tolist()
+    rank_numeric_rows = parsed['rank_numeric'].to_numpy().tolist()
+    rank_text_rows = parsed['rank_text'].to_numpy().tolist()
+    bonus_rows = parsed['bonus'].to_numpy().tolist()
+    parsed_rows = parsed['parsed'].to_numpy().tolist()
+    unparsed = [(rows[r].get(name_col), apparatus_cols[c]) for r, c in zip(*parsed['unparsed'].to_numpy().nonzero())]
+    if unparsed:
+        print(f"  {filename}: {len(unparsed)} cells did not parse (e.g. {unparsed[:3]})")
+
     results_inserted = 0
-    for row in rows:
-        raw_name = row.get(name_col)
-        person_name = standardize_athlete_name(raw_name)
+    person_names = standardize_athlete_names([row.get(name_col) for row in rows]).tolist()
+    for r, (row, person_name) in enumerate(zip(rows, person_names)):
         if not person_name: continue
         
         person_id = get_or_create_person(conn, person_name, gender_heuristic, person_cache)
@@ -268,21 +270,24 @@ def parse_mso_file(filepath, conn, person_cache, club_cache, athlete_cache, appa
             val = row.get(r_col)
             if val: dynamic_vals[s_col] = str(val)
             
-        for raw_app_col in apparatus_cols:
+        for c, raw_app_col in enumerate(apparatus_cols):
             cell_value = row.get(raw_app_col)
             if not cell_value: continue
             
-            clean_app_name = COLUMN_MAP.get(raw_app_col.strip(), raw_app_col)
+            clean_app_name = event_registry.mso_event(raw_app_col)
             app_key = (clean_app_name, discipline_id)
             if app_key not in apparatus_cache: app_key = (clean_app_name, 99)
             if app_key not in apparatus_cache: continue
             
             apparatus_id = apparatus_cache[app_key]
-            mso_vals = parse_cell_value(cell_value)
-            score_final, d_score, rank_numeric_mso, rank_text, bonus = mso_vals
+            if not parsed_rows[r][c]: continue
+            score_final = score_rows[r][c]
+            d_score = None if d_rows[r][c] != d_rows[r][c] else d_rows[r][c]
+            rank_text = rank_text_rows[r][c]
+            bonus = None if bonus_rows[r][c] != bonus_rows[r][c] else bonus_rows[r][c]
+            rank_numeric_mso = rank_numeric_rows[r][c]
             
             rank_numeric = rank_numeric_mso if rank_numeric_mso is not None else parse_rank(rank_text)
-            if score_final is None and d_score is None: continue
             if check_duplicate_result(conn, meet_db_id, athlete_id, apparatus_id): continue
             
             cols = ['meet_db_id', 'athlete_id', 'apparatus_id', 'gender', 'score_final', 'score_d', 'rank_numeric', 'rank_text', 'score_text']
@@ -314,6 +319,8 @@ def main():
     parser = argparse.ArgumentParser(description="Load MSO data into the database.")
     parser.add_argument("--sample", type=int, default=1, help="Process every Nth file (e.g. 10)")
     parser.add_argument("--file", type=str, help="Process a single specific file")
+    parser.add_argument("--cache-size", type=int, default=entity_cache.DEFAULT_CACHE_SIZE, help="Max entries per Person/Club/Athlete cache (0 = unbounded)")
+    parser.add_argument("--warm-cache", action="store_true", help="Start the entity caches from the snapshot saved by the last run")
     args = parser.parse_args()
 
     club_aliases = load_club_aliases()
@@ -321,14 +328,15 @@ def main():
     
     if args.file:
         with sqlite3.connect(DB_FILE) as conn:
-            person_cache = {row[1]: row[0] for row in conn.execute("SELECT person_id, full_name FROM Persons").fetchall()}
-            club_cache = {row[1]: row[0] for row in conn.execute("SELECT club_id, name FROM Clubs").fetchall()}
-            athlete_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT athlete_id, person_id, club_id FROM Athletes").fetchall()}
+            entities = entity_cache.open_entity_caches(conn, DB_FILE, args.cache_size, warm_start=args.warm_cache)
+            person_cache, club_cache, athlete_cache = entities['person'], entities['club'], entities['athlete']
             apparatus_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT apparatus_id, name, discipline_id FROM Apparatus").fetchall()}
+            ensure_meet_name_key(conn)  # get_or_create_meet matches meets on the indexed name_key
+            ensure_meet_classification(conn)  # ...and stores the classification it computes
             meet_cache = {(row[1], row[2]): row[0] for row in conn.execute("SELECT meet_db_id, source, source_meet_id FROM Meets").fetchall()}
             parse_mso_file(args.file, conn, person_cache, club_cache, athlete_cache, apparatus_cache, meet_cache, meet_manifest, club_aliases)
     else:
-        process_mso_files(meet_manifest, club_aliases, sample_rate=args.sample)
+        process_mso_files(meet_manifest, club_aliases, sample_rate=args.sample, cache_size=args.cache_size, warm_cache=args.warm_cache)
         
     print("\n--- MSO data loading finished ---")
 
@@ -16,6 +16,7 @@ from webdriver_manager.chrome import ChromeDriverManager
 import threading
 import sqlite3
 import argparse
+import atexit
 import etl_functions # for hash calculation
 
 # Import Scrapers
@@ -180,6 +181,10 @@ def livemeet_task(meet_id, meet_name, driver_path=None):
         meet_url = f"https://www.sportzsoft.com/meet/meetWeb.dll/MeetResults?Id={meet_id}"
         
         success, count, file_base_id = livemeet_scraper.scrape_raw_data_to_separate_files(meet_url, str(meet_id), LIVEMEET_MESSY_DIR, driver_path=driver_path)
+        if success == 'TNT_SKIP':
+            # Remembered so the next load_all_tasks drops it before opening a browser
+            livemeet_scraper.mark_meet_as_tnt(meet_id)
+            return f"DONE: {meet_id}:0"
             
         if success:
             # Process messy files
@@ -350,6 +355,40 @@ class GoldRefresher:
                 logging.error(f"Failed to launch gold refresher: {e}")
         return False
 
+class WriterService:
+    """Runs db_writer.py so the background loader, gold refresher and export scripts take turns writing."""
+    def __init__(self, db_file="gym_data.db"):
+        self.db_file = db_file
+        self.process = None
+
+    def is_running(self):
+        if self.process is None:
+            return False
+        return self.process.poll() is None
+
+    def start(self):
+        if self.is_running():
+            return
+        print(">>> Starting DB writer service... <<<")
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "db_writer.py", "--db-file", self.db_file],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.STDOUT
+            )
+        except Exception as e:
+            logging.error(f"Failed to start DB writer service (tools will write directly): {e}")
+
+    def stop(self):
+        """Graceful stop (queued batches are drained), then terminate as a fallback."""
+        if not self.is_running():
+            return
+        subprocess.run([sys.executable, "db_writer.py", "--db-file", self.db_file, "--stop"], capture_output=True)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.terminate()
+
 class StatusHeartbeat(threading.Thread):
     def __init__(self, stop_event, get_remaining_meets, get_pending_csvs, loader=None, gold_refresher=None, interval=30):
         super().__init__()
@@ -451,7 +490,38 @@ def load_all_tasks(days_cutoff=None, days_arg=None, priority_only=False, priorit
             else: skipped += 1
     if days_cutoff is not None:
         print(f"  [FILTER] Skipped {skipped} meets outside the {days_arg}-day window.")
-    return tasks
+    return skip_tt_meets(tasks)
+
+def load_known_tt_meets(db_file="gym_data.db"):
+    """(source, meet_id) of meets already known to be T&T: classified in Meets, or skipped by the LiveMeet scraper."""
+    known = set(('livemeet', mid) for mid in livemeet_scraper.load_tnt_skipped_meets())
+    if os.path.exists(db_file):
+        try:
+            with sqlite3.connect(db_file, timeout=10) as conn:
+                cols = {row[1] for row in conn.execute("PRAGMA table_info(Meets)")}
+                if 'classifier_version' in cols:
+                    rows = conn.execute("SELECT source, source_meet_id FROM Meets WHERE competition_type = ?",
+                                        (etl_functions.COMPETITION_TT,)).fetchall()
+                    known.update((source, str(mid)) for source, mid in rows)
+        except sqlite3.Error as e:
+            print(f"  Warning: Could not read meet classifications: {e}")
+    return known
+
+def skip_tt_meets(tasks, db_file="gym_data.db"):
+    """Drops T&T meets (stored classification, scraper skip list or meet name) before any browser work."""
+    known = load_known_tt_meets(db_file)
+    kept = []
+    for t in tasks:
+        m_type, m_id, m_name = t[0], str(t[1]), t[2]
+        source_meet_id = m_id.replace('kscore_', '', 1) if m_type == 'kscore' else m_id
+        m_loc = t[3] if len(t) == 4 else None
+        if (m_type, source_meet_id) in known or \
+           etl_functions.classify_meet(m_name, m_loc, m_type)[1] == etl_functions.COMPETITION_TT:
+            continue
+        kept.append(t)
+    if len(kept) < len(tasks):
+        print(f"  [FILTER] Skipped {len(tasks) - len(kept)} T&T meets.")
+    return kept
 
 def build_queue(all_tasks, status_manifest, priority_only=False, priority_keys=None):
     if priority_only:
@@ -511,6 +581,8 @@ def main():
     if not os.path.exists("gym_data.db"):
         try: subprocess.run([sys.executable, "load_orchestrator.py"], check=False)
         except: pass
+    writer_service = WriterService(); writer_service.start()
+    atexit.register(writer_service.stop)
     all_tasks = load_all_tasks(days_cutoff, args.days, args.priority_only, priority_keys)
     queue, get_status_simple = build_queue(all_tasks, status_manifest, args.priority_only, priority_keys)
     logging.info(f"Loaded: {len(all_tasks)}. Remaining: {len(queue)}")
@@ -0,0 +1,205 @@
+# result_key_index.py
+
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+
+# ==============================================================================
+#  COMPACT DUPLICATE-KEY INDEX FOR Results
+#  Stores the session-aware uniqueness key of every result
+#  (meet_db_id, athlete_id, apparatus_id, session, level, session_id)
+#  as a 64-bit hash in a sorted NumPy array (8 bytes/row instead of a tuple set).
+#  Hash hits are confirmed against SQL, so collisions or stale entries never
+#  drop a row. The array is snapshotted next to the DB and caught up from
+#  result_id > watermark on the next run instead of re-scanning Results.
+# ==============================================================================
+
+SNAPSHOT_VERSION = 1
+MERGE_THRESHOLD = 200000  # Fold recent hashes into the sorted array past this size
+SCAN_BATCH_SIZE = 50000
+
+KEY_COLUMNS = "meet_db_id, athlete_id, apparatus_id, session, level, session_id"
+
+def key_hash(key):
+    """Stable 64-bit hash of a result key tuple (repr keeps '1' and 1 distinct, like tuple equality)."""
+    return int.from_bytes(hashlib.blake2b(repr(tuple(key)).encode('utf-8'), digest_size=8).digest(), 'little')
+
+def snapshot_paths(db_path):
+    return f"{db_path}.result_keys.npy", f"{db_path}.result_keys.json"
+
+def invalidate_snapshot(db_path):
+    """Deletes the on-disk snapshot. Call after rewriting key columns of existing Results rows."""
+    for path in snapshot_paths(db_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+def _results_sequence(conn):
+    """Current AUTOINCREMENT high-water mark of Results (0 if the table is empty)."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'Results'").fetchone()
+    return row[0] if row else 0
+
+def _hash_rows(cursor):
+    """Drains a cursor of key rows into a sorted, de-duplicated uint64 array."""
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(SCAN_BATCH_SIZE)
+        if not rows:
+            break
+        chunks.append(np.fromiter((key_hash(r) for r in rows), dtype=np.uint64, count=len(rows)))
+    if not chunks:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.concatenate(chunks))
+
+class ResultKeyIndex:
+    """
+    Drop-in replacement for the existing_results set used by write_to_db.
+    - `key in index`  -> exact for keys added this run and not yet flushed,
+                         hash lookup + SQL confirmation for everything else.
+    - `index.add(key)` -> registers a key queued in pending_inserts.
+    - `index.mark_flushed()` -> call after flush_pending_inserts() so queued keys
+                         are folded into the compact hash storage.
+    - `index.checkpoint()` / `index.rollback_to_checkpoint()` -> forget keys added since
+                         the checkpoint when the writer rolls a file back.
+    """
+
+    def __init__(self, hashes=None, watermark=0):
+        self._base = hashes if hashes is not None else np.empty(0, dtype=np.uint64)
+        self._recent = set()
+        self._pending = set()
+        self.watermark = watermark
+        self.conn = None
+        self._journal = None  # Keys added since the last checkpoint (None = no checkpoint)
+        self.stats = {'hash_hits': 0, 'sql_confirmed': 0, 'stale_or_collision': 0}
+
+    # --- Construction / persistence ---
+
+    @classmethod
+    def load(cls, conn, db_path, rebuild=False):
+        """Loads the snapshot next to db_path and catches up on newer rows, or builds from a full scan."""
+        npy_path, meta_path = snapshot_paths(db_path)
+        sequence = _results_sequence(conn)
+        if not rebuild and os.path.exists(npy_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                watermark = int(meta.get('watermark', -1))
+                # A sequence below the watermark means the DB was recreated
+                if meta.get('version') == SNAPSHOT_VERSION and 0 <= watermark <= sequence:
+                    index = cls(np.load(npy_path), watermark)
+                    cursor = conn.execute(f"SELECT {KEY_COLUMNS} FROM Results WHERE result_id > ?", (watermark,))
+                    newer = _hash_rows(cursor)
+                    if len(newer):
+                        index._base = np.union1d(index._base, newer)
+                    index.watermark = sequence
+                    logging.info(f"Result key index: loaded {len(index._base)} keys from snapshot (+{len(newer)} newer rows).")
+                    return index
+            except (OSError, ValueError) as e:
+                logging.warning(f"Result key index snapshot unreadable, rebuilding: {e}")
+
+        logging.info("Result key index: building from a full Results scan...")
+        cursor = conn.execute(f"SELECT {KEY_COLUMNS} FROM Results")
+        index = cls(_hash_rows(cursor), sequence)
+        logging.info(f"Result key index: built with {len(index._base)} keys.")
+        return index
+
+    def save(self, db_path, conn=None):
+        """
+        Writes the snapshot atomically. Pass conn to advance the watermark to the current Results
+        sequence: rows up to it that this index never saw (other writers during the run) are hashed first.
+        """
+        self._merge(include_pending=True)
+        if conn is not None:
+            sequence = _results_sequence(conn)
+            if sequence > self.watermark:
+                cursor = conn.execute(f"SELECT {KEY_COLUMNS} FROM Results WHERE result_id > ? AND result_id <= ?",
+                                      (self.watermark, sequence))
+                self._base = np.union1d(self._base, _hash_rows(cursor))
+            self.watermark = sequence
+        npy_path, meta_path = snapshot_paths(db_path)
+        tmp_npy = npy_path + ".tmp.npy"
+        np.save(tmp_npy, self._base)
+        os.replace(tmp_npy, npy_path)
+        with open(meta_path + ".tmp", 'w') as f:
+            json.dump({'version': SNAPSHOT_VERSION, 'watermark': self.watermark, 'count': int(len(self._base))}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    # --- Set-like interface used by write_to_db ---
+
+    def attach(self, conn):
+        """Binds the connection used to confirm hash hits (the writer connection)."""
+        self.conn = conn
+
+    def add(self, key):
+        self._pending.add(key)
+        if self._journal is not None:
+            self._journal.append(key)
+
+    def checkpoint(self):
+        """Starts journaling added keys so they can be discarded if the caller rolls back."""
+        self._journal = []
+
+    def release_checkpoint(self):
+        self._journal = None
+
+    def rollback_to_checkpoint(self):
+        """
+        Drops keys added since checkpoint(). Keys already folded into hashes by mark_flushed()
+        stay behind as stale hashes; SQL confirmation rejects them, so they cost a lookup, not a row.
+        """
+        for key in self._journal or ():
+            self._pending.discard(key)
+        self._journal = None
+
+    def discard_pending(self):
+        """Forgets keys whose queued rows were dropped unwritten (a failed group commit rolled back)."""
+        self._pending.clear()
+        self._journal = None
+
+    def mark_flushed(self):
+        """Pending keys are now rows in Results; keep only their hashes."""
+        self._recent.update(key_hash(k) for k in self._pending)
+        self._pending.clear()
+        if len(self._recent) >= MERGE_THRESHOLD:
+            self._merge()
+
+    def __contains__(self, key):
+        if key in self._pending:
+            return True
+        h = key_hash(key)
+        if h not in self._recent:
+            pos = np.searchsorted(self._base, np.uint64(h))
+            if pos >= len(self._base) or self._base[pos] != h:
+                return False
+        self.stats['hash_hits'] += 1
+        if self.conn is None:
+            return True
+        if self._confirm(key):
+            self.stats['sql_confirmed'] += 1
+            return True
+        self.stats['stale_or_collision'] += 1
+        return False
+
+    def __len__(self):
+        return len(self._base) + len(self._recent) + len(self._pending)
+
+    # --- Internals ---
+
+    def _confirm(self, key):
+        row = self.conn.execute("""
+            SELECT 1 FROM Results
+            WHERE meet_db_id = ? AND athlete_id = ? AND apparatus_id = ?
+              AND session IS ? AND level IS ? AND session_id IS ?
+            LIMIT 1
+        """, tuple(key)).fetchone()
+        return row is not None
+
+    def _merge(self, include_pending=False):
+        if include_pending and self._pending:
+            self._recent.update(key_hash(k) for k in self._pending)
+            self._pending.clear()
+        if self._recent:
+            recent = np.fromiter(self._recent, dtype=np.uint64, count=len(self._recent))
+            self._base = np.union1d(self._base, recent)
+            self._recent.clear()
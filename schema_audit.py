@@ -1,5 +1,6 @@
 import sqlite3
 import pandas as pd
+from etl_functions import SchemaRegistry
 
 DB_FILE = "gym_data.db"
 
@@ -29,8 +30,12 @@ def inspect_schema():
         
         print(f"\n✨ DYNAMIC ('WEIRD') COLUMNS ({len(dynamic_columns)} found):")
         if dynamic_columns:
-            for col in sorted(dynamic_columns):
-                print(f"  - {col}")
+            # Non-null counts for every dynamic column in one scan (sparse columns bloat the table)
+            usage = SchemaRegistry(cursor).table_usage(cursor, dynamic_columns)
+            cursor.execute("SELECT COUNT(*) FROM Results")
+            total_rows = cursor.fetchone()[0] or 1
+            for col in sorted(dynamic_columns, key=lambda c: usage.get(c, 0)):
+                print(f"  - {col} ({usage.get(col, 0)} non-null, {100.0 * usage.get(col, 0) / total_rows:.2f}%)")
                 
             # Show a sample of data for these columns
             print("\n--- DATA SAMPLE (First 5 Non-Null Rows) ---")
@@ -3,51 +3,8 @@ import os
 import requests
 import json
 import argparse
-import re
-from datetime import datetime
-
-def parse_date_to_iso(date_str):
-    """
-    Parse various date formats and return ISO format (YYYY-MM-DD).
-    Handles:
-    - Already valid ISO dates: "2025-01-26"
-    - Date ranges: "Jan 24, 2025 - Jan 26, 2025" (uses the last date)
-    - Single text dates: "Jan 26, 2025"
-    """
-    if not date_str or not isinstance(date_str, str):
-        return date_str
-    
-    date_str = date_str.strip()
-    
-    # Already in ISO format (YYYY-MM-DD)
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        return date_str
-    
-    # Check if it's a date range (contains " - " separator)
-    if ' - ' in date_str:
-        # Take the last date in the range
-        parts = date_str.split(' - ')
-        date_str = parts[-1].strip()
-    
-    # Try parsing various text date formats
-    date_formats = [
-        '%b %d, %Y',   # "Jan 26, 2025"
-        '%B %d, %Y',   # "January 26, 2025"
-        '%d %b %Y',    # "26 Jan 2025"
-        '%d %B %Y',    # "26 January 2025"
-        '%m/%d/%Y',    # "01/26/2025"
-        '%d/%m/%Y',    # "26/01/2025"
-    ]
-    
-    for fmt in date_formats:
-        try:
-            parsed = datetime.strptime(date_str, fmt)
-            return parsed.strftime('%Y-%m-%d')
-        except ValueError:
-            continue
-    
-    # Return original if we can't parse it
-    return date_str
+
+from etl_functions import normalize_dates
 
 # Manual .env loading
 def load_env_manual():
@@ -77,10 +34,6 @@ def clean_record(record):
     if 'source' in record:
         del record['source']
     
-    # Parse date field to ISO format (handles date ranges like "Jan 24, 2025 - Jan 26, 2025")
-    if 'date' in record:
-        record['date'] = parse_date_to_iso(record['date'])
-    
     # Numerics cleanup
     numeric_keys = [
         'fx_score', 'fx_d', 'ph_score', 'ph_d', 'sr_score', 'sr_d', 
@@ -153,9 +106,17 @@ def sync_results(level, target_table, format='api'):
 
         print(f"Found {len(rows)} results. Cleaning and de-duplicating...")
 
+        # Parse the date column to ISO format once per distinct value (handles ranges like "Jan 24, 2025 - Jan 26, 2025")
+        dates = None
+        if 'date' in columns:
+            date_idx = columns.index('date')
+            dates = normalize_dates([row[date_idx] for row in rows]).tolist()
+
         unique_results = {}
-        for row in rows:
+        for i, row in enumerate(rows):
             record = dict(zip(columns, row))
+            if dates is not None:
+                record['date'] = dates[i]
             record = clean_record(record)
 
             # Unique key: (athlete_name, meet_name, year, level, age)
@@ -0,0 +1,267 @@
+# synthetic_corpus.py
+
+import os
+import csv
+import random
+import argparse
+
+from load_orchestrator import (
+    KSCORE_DIR, LIVEMEET_DIR, MSO_DIR, KSIS_DIR,
+    KSCORE_MANIFEST, LIVEMEET_MANIFEST, MSO_MANIFEST, KSIS_MANIFEST
+)
+
+# ==============================================================================
+#  SYNTHETIC CORPUS GENERATOR
+#  Emits realistic CSVs in the four on-disk formats the loader reads
+#  (kscore _FINAL_, livemeet _FINAL_/_PEREVENT_/_BYEVENT_, _mso.csv, ksis)
+#  plus their discovery manifests, laid out exactly like the production tree
+#  (CSVs_*_final/ + discovered_meet_ids_*.csv) so load_orchestrator and
+#  benchmark_loader.py can run against it without the private scraped corpus.
+# ==============================================================================
+
+FORMATS = ('kscore', 'livemeet', 'mso', 'ksis')
+EVENT_MIXES = ('wag', 'mag', 'mixed')
+
+OUTPUT_DIRS = {'kscore': KSCORE_DIR, 'livemeet': LIVEMEET_DIR, 'mso': MSO_DIR, 'ksis': KSIS_DIR}
+MANIFESTS = {'kscore': KSCORE_MANIFEST, 'livemeet': LIVEMEET_MANIFEST, 'mso': MSO_MANIFEST, 'ksis': KSIS_MANIFEST}
+
+FIRST_NAMES_F = ['Ava', 'Chloe', 'Emma', 'Olivia', 'Mia', 'Sophie', 'Lily', 'Zoe', 'Hannah', 'Ella',
+                 'Grace', 'Maya', 'Nora', 'Leah', 'Aria', 'Claire', 'Julia', 'Sarah', 'Megan', 'Anna']
+FIRST_NAMES_M = ['Liam', 'Noah', 'Ethan', 'Lucas', 'Owen', 'Jacob', 'Ryan', 'Nathan', 'Adam', 'Evan',
+                 'Felix', 'Leo', 'Max', 'Samuel', 'Daniel', 'Isaac', 'Connor', 'Aiden', 'Gabriel', 'Ivan']
+LAST_NAMES = ['Smith', 'Tremblay', 'Martin', 'Roy', 'Gagnon', 'Lee', 'Wilson', 'Johnson', 'MacDonald', 'Taylor',
+              'Campbell', 'Anderson', 'Leblanc', 'Wong', 'Brown', 'Nguyen', 'Singh', 'Kowalski', 'Petrov', "O'Neil",
+              'Chen', 'Fraser', 'Morin', 'Bouchard', 'Walker', 'Young', 'Scott', 'Clarke', 'Hughes', 'Murphy']
+CLUBS = ['Flicka Gymnastics Club', 'Omega Gymnastics', 'Calgary Gymnastics Centre', 'Capital Gymnastics', 'Dynamo Gym',
+         'Gemini Gymnastics', 'Kips Gymnastics', 'Winnipeg Gymnastics Centre', 'Ottawa Gymnastics Centre', 'Perfect 10',
+         'Saskatoon Gymnastics', 'Airdrie Edge', 'Taiso Gymnastics', 'Mount Royal Gymnastics', 'Halifax Alta']
+PROVINCES = ['AB', 'BC', 'ON', 'QC', 'SK', 'MB', 'NS']
+
+# Event columns per source, in the order each format lists them
+KSCORE_EVENTS = {1: ['Vault', 'Uneven_Bars', 'Beam', 'Floor', 'AllAround'],
+                 2: ['Floor', 'Pommel_Horse', 'Rings', 'Vault', 'Parallel_Bars', 'High_Bar', 'AllAround']}
+LIVEMEET_EVENTS = KSCORE_EVENTS
+MSO_EVENTS = {1: ['VT', 'UB', 'BB', 'FX', 'AA'], 2: ['FX', 'PH', 'SR', 'VT', 'PB', 'HB', 'AA']}
+KSIS_EVENTS = {1: ['wvault', 'ubars', 'beam', 'wfloor'], 2: ['mfloor', 'horse', 'rings', 'mvault', 'pbars', 'hbar']}
+
+LEVELS = {
+    'kscore': {1: ['CCP 6', 'CCP 7', 'CCP 8', 'Novice', 'Junior', 'Senior'], 2: ['P1', 'P2', 'P3', 'Aspire', 'Novice', 'Junior']},
+    'livemeet': {1: ['Level 6', 'Level 7', 'NOV', 'Xcel Gold'], 2: ['MNov', 'Open', 'Junior', 'P2']},
+    'mso': {1: ['XG', 'XS', 'XP', 'CCP6'], 2: ['P1', 'P2', 'B3', 'J1']},
+}
+NON_NUMERIC = ['DNS', 'DNF', 'Scratch']
+
+# ==============================================================================
+#  ROSTERS AND SCORES
+# ==============================================================================
+
+def _discipline_for(rng, event_mix):
+    if event_mix == 'wag': return 1
+    if event_mix == 'mag': return 2
+    return rng.choice((1, 2))
+
+def _roster(rng, size, discipline_id):
+    firsts = FIRST_NAMES_F if discipline_id == 1 else FIRST_NAMES_M
+    return [(f"{rng.choice(firsts)} {rng.choice(LAST_NAMES)}", rng.choice(CLUBS)) for _ in range(size)]
+
+def _scores(rng, roster, events, non_numeric_rate):
+    """{athlete_index: {event: (d, e, final)}} with finals as strings (some non-numeric), AA summed."""
+    table = {}
+    for i in range(len(roster)):
+        row = {}
+        total = 0.0
+        for event in events:
+            if event in ('AllAround', 'AA'): continue
+            if rng.random() < non_numeric_rate:
+                row[event] = ('', '', rng.choice(NON_NUMERIC))
+                continue
+            d = round(rng.uniform(2.5, 5.8), 1)
+            e = round(rng.uniform(6.5, 9.2), 3)
+            final = round(d + e - rng.choice((0, 0, 0, 0.1, 0.3)), 3)
+            total += final
+            row[event] = (f"{d:.1f}", f"{e:.3f}", f"{final:.3f}")
+        for event in events:
+            if event in ('AllAround', 'AA'):
+                row[event] = ('', '', f"{total:.3f}")
+        table[i] = row
+    return table
+
+def _ranks(table, event):
+    """Competition ranks (ties share a rank) for one event; non-numeric finals get ''."""
+    numeric = {}
+    for i, row in table.items():
+        try: numeric[i] = float(row[event][2])
+        except ValueError: pass
+    ordered = sorted(numeric.items(), key=lambda kv: -kv[1])
+    ranks = {}
+    for pos, (i, score) in enumerate(ordered):
+        ranks[i] = ranks[ordered[pos - 1][0]] if pos and ordered[pos - 1][1] == score else pos + 1
+    return {i: str(ranks[i]) if i in ranks else '' for i in table}
+
+# ==============================================================================
+#  FORMAT WRITERS
+# ==============================================================================
+
+def _write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def _write_kscore(rng, out_dir, meet_id, session, discipline_id, roster, non_numeric_rate):
+    events = KSCORE_EVENTS[discipline_id]
+    table = _scores(rng, roster, events, non_numeric_rate)
+    ranks = {ev: _ranks(table, ev) for ev in events}
+    header = ['Gymnast', 'Club', 'Level', 'Age']
+    for ev in events: header += [f'Result_{ev}_D', f'Result_{ev}_Score', f'Result_{ev}_Rnk']
+    level = rng.choice(LEVELS['kscore'][discipline_id])
+    rows = []
+    for i, (name, club) in enumerate(roster):
+        row = [name, club, level, str(rng.randint(9, 18))]
+        for ev in events:
+            d, _, final = table[i][ev]
+            row += [d, final, ranks[ev][i]]
+        rows.append(row)
+    path = os.path.join(out_dir, f"{meet_id}_FINAL_{session}.csv")
+    _write_csv(path, header, rows)
+    return [path]
+
+def _write_livemeet(rng, out_dir, meet_id, meet_name, session, discipline_id, roster, non_numeric_rate):
+    """One normalized FINAL file, a PEREVENT file for the same roster (with E scores) and a raw-triplet BYEVENT file."""
+    events = LIVEMEET_EVENTS[discipline_id]
+    table = _scores(rng, roster, events, non_numeric_rate)
+    ranks = {ev: _ranks(table, ev) for ev in events}
+    level = rng.choice(LEVELS['livemeet'][discipline_id])
+    prov = rng.choice(PROVINCES)
+    base = ['Name', 'Club', 'Level', 'Age', 'Prov', 'Session', 'Meet']
+    tag = 'WAG' if discipline_id == 1 else 'MAG'
+    ages = [str(rng.randint(9, 18)) for _ in roster]
+
+    final_header = base + [f'Result_{ev}_{s}' for ev in events for s in ('D', 'Score', 'Rnk')]
+    perevent_header = base + [f'Result_{ev}_{s}' for ev in events if ev != 'AllAround' for s in ('D', 'E', 'Score', 'Rnk')]
+    final_rows, perevent_rows, byevent_rows = [], [], []
+    for i, (name, club) in enumerate(roster):
+        meta = [name, club, level, ages[i], prov, f"S{session}", meet_name]
+        final_row, perevent_row, byevent_row = list(meta), list(meta), [name, club, level]
+        for ev in events:
+            d, e, final = table[i][ev]
+            final_row += [d, final, ranks[ev][i]]
+            if ev != 'AllAround':
+                perevent_row += [d, e, final, ranks[ev][i]]
+            byevent_row += [d, final, ranks[ev][i]]
+        final_rows.append(final_row); perevent_rows.append(perevent_row); byevent_rows.append(byevent_row)
+
+    # Sportzsoft-style headers: each event name repeated for its D / Score / Rnk triplet
+    byevent_header = ['Name', 'Club', 'Level'] + [ev for ev in events for _ in range(3)]
+    paths = [os.path.join(out_dir, f"{meet_id}_FINAL_{session}_{tag}.csv"),
+             os.path.join(out_dir, f"{meet_id}_PEREVENT_{session}_{tag}.csv"),
+             os.path.join(out_dir, f"{meet_id}_BYEVENT_{session}_{tag}.csv")]
+    _write_csv(paths[0], final_header, final_rows)
+    _write_csv(paths[1], perevent_header, perevent_rows)
+    _write_csv(paths[2], byevent_header, byevent_rows)
+    return paths
+
+def _write_mso(rng, out_dir, meet_id, sessions, discipline_id, roster_size, non_numeric_rate):
+    """MSO publishes one file per meet; cells are '<rank> <score>' with occasional ties and bare scores."""
+    events = MSO_EVENTS[discipline_id]
+    header = ['Gymnast', 'Team', 'Sess', 'Lvl', 'Div'] + events
+    rows = []
+    level = rng.choice(LEVELS['mso'][discipline_id])
+    for session in range(1, sessions + 1):
+        roster = _roster(rng, roster_size, discipline_id)
+        table = _scores(rng, roster, events, non_numeric_rate)
+        ranks = {ev: _ranks(table, ev) for ev in events}
+        for i, (name, club) in enumerate(roster):
+            row = [name, club, str(session), level, rng.choice(('Jr', 'Sr', 'Ch'))]
+            for ev in events:
+                final = table[i][ev][2]
+                rank = ranks[ev][i]
+                if not rank: row.append('')
+                elif rng.random() < 0.1: row.append(final)
+                else: row.append(f"{'T' if rng.random() < 0.05 else ''}{rank} {final}")
+            rows.append(row)
+    path = os.path.join(out_dir, f"{meet_id}_mso.csv")
+    _write_csv(path, header, rows)
+    return [path]
+
+def _write_ksis(rng, out_dir, meet_id, meet_name, year, session, discipline_id, roster, non_numeric_rate):
+    events = KSIS_EVENTS[discipline_id]
+    table = _scores(rng, roster, events + ['AA'], non_numeric_rate)
+    ranks = {ev: _ranks(table, ev) for ev in events + ['AA']}
+    header = ['MeetID', 'MeetYear', 'MeetName', 'Session', 'Name', 'Club', 'AA_Score', 'Place']
+    for ev in events: header += [f'{ev}_Total', f'{ev}_D', f'{ev}_E']
+    session_name = f"{'WAG' if discipline_id == 1 else 'MAG'} {rng.choice(('Junior', 'Senior', 'Novice'))}"
+    rows = []
+    for i, (name, club) in enumerate(roster):
+        row = [meet_id, str(year), meet_name, session_name, name, club, table[i]['AA'][2], ranks['AA'][i]]
+        for ev in events:
+            d, e, final = table[i][ev]
+            total = f"{final}({ranks[ev][i]})" if ranks[ev][i] else final
+            row += [total, d, e]
+        rows.append(row)
+    path = os.path.join(out_dir, f"{meet_id}_ksis_{session}.csv")
+    _write_csv(path, header, rows)
+    return [path]
+
+# ==============================================================================
+#  CORPUS
+# ==============================================================================
+
+def generate_corpus(root, meets=2, athletes_per_session=20, sessions=2, event_mix='mixed',
+                    formats=FORMATS, non_numeric_rate=0.02, seed=0):
+    """
+    Writes `meets` meets per format under root (production directory layout + manifests).
+    Returns {format: [file paths]}.
+    """
+    if event_mix not in EVENT_MIXES:
+        raise ValueError(f"event_mix must be one of {EVENT_MIXES}")
+    rng = random.Random(seed)
+    written = {}
+    for fmt in formats:
+        out_dir = os.path.join(root, OUTPUT_DIRS[fmt])
+        os.makedirs(out_dir, exist_ok=True)
+        manifest_rows = []
+        paths = []
+        for m in range(meets):
+            # Numeric ids: livemeet/ksis manifests key on the text before the first underscore
+            meet_id = str({'kscore': 100000, 'livemeet': 200000, 'mso': 300000, 'ksis': 400000}[fmt] + m)
+            year = rng.choice((2022, 2023, 2024, 2025))
+            meet_name = f"Synthetic {fmt.title()} {rng.choice(('Invitational', 'Cup', 'Classic', 'Provincials'))} {m}"
+            date = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            manifest_rows.append([meet_id, meet_name, date, rng.choice(PROVINCES), year])
+            discipline_id = _discipline_for(rng, event_mix)
+            if fmt == 'mso':
+                paths += _write_mso(rng, out_dir, meet_id, sessions, discipline_id, athletes_per_session, non_numeric_rate)
+                continue
+            for session in range(1, sessions + 1):
+                roster = _roster(rng, athletes_per_session, discipline_id)
+                if fmt == 'kscore':
+                    paths += _write_kscore(rng, out_dir, meet_id, session, discipline_id, roster, non_numeric_rate)
+                elif fmt == 'livemeet':
+                    paths += _write_livemeet(rng, out_dir, meet_id, meet_name, session, discipline_id, roster, non_numeric_rate)
+                else:
+                    paths += _write_ksis(rng, out_dir, meet_id, meet_name, year, session, discipline_id, roster, non_numeric_rate)
+        _write_csv(os.path.join(root, MANIFESTS[fmt]), ['MeetID', 'MeetName', 'start_date_iso', 'Location', 'Year'], manifest_rows)
+        written[fmt] = paths
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic scraped corpus for loader benchmarks")
+    parser.add_argument("--out", type=str, required=True, help="Root directory (CSVs_*_final/ and manifests are created inside)")
+    parser.add_argument("--meets", type=int, default=2, help="Meets per format")
+    parser.add_argument("--athletes-per-session", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=2, help="Sessions per meet")
+    parser.add_argument("--event-mix", choices=EVENT_MIXES, default='mixed', help="WAG only, MAG only, or a random mix per meet")
+    parser.add_argument("--formats", type=str, default=','.join(FORMATS), help="Comma-separated subset of kscore,livemeet,mso,ksis")
+    parser.add_argument("--non-numeric-rate", type=float, default=0.02, help="Share of DNS/DNF/Scratch cells")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    written = generate_corpus(args.out, args.meets, args.athletes_per_session, args.sessions,
+                              args.event_mix, formats, args.non_numeric_rate, args.seed)
+    for fmt, paths in written.items():
+        print(f"{fmt}: {len(paths)} files")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import queue
+import sqlite3
+import tempfile
+from concurrent.futures import Future
+
+import load_metrics
+import load_orchestrator
+import result_key_index
+from load_orchestrator import GroupCommitter, write_chunked_file
+from etl_functions import setup_database, mark_file_processed
+
+# Group commit keeps a file's Results rows and its ProcessedFiles mark together: rolling one
+# file back never removes rows of files already marked, and a failed commit leaves no stale keys.
+
+COLS = ('meet_db_id', 'athlete_id', 'apparatus_id', 'session', 'level', 'session_id')
+
+def open_db(tmp):
+    db_path = os.path.join(tmp, 'gc.db')
+    setup_database(db_path)
+    conn = sqlite3.connect(db_path)
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(Results)")}
+    if 'session_id' not in cols:
+        conn.execute("ALTER TABLE Results ADD COLUMN session_id TEXT")
+    conn.commit()
+    index = result_key_index.ResultKeyIndex.load(conn, db_path)
+    index.attach(conn)
+    return conn, index
+
+def queue_row(pending_inserts, index, key):
+    pending_inserts.append((COLS, key))
+    index.add(key)
+
+def test_abort_after_flush_keeps_earlier_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, index = open_db(tmp)
+        pending_inserts = []
+        committer = GroupCommitter(conn, pending_inserts, index, max_files=10)
+
+        committer.begin_file()
+        queue_row(pending_inserts, index, (1, 1, 1, 'S1', 'L1', None))
+        queue_row(pending_inserts, index, (1, 2, 1, 'S1', 'L1', None))
+        mark_file_processed(conn, 'A.csv', 'hash-a')
+        committer.end_file()
+
+        committer.begin_file()
+        queue_row(pending_inserts, index, (1, 3, 1, 'S1', 'L1', None))
+        committer.flush()  # Mid-file flush, then the file fails
+        committer.abort_file()
+        committer.commit()
+
+        rows = conn.execute("SELECT athlete_id FROM Results ORDER BY athlete_id").fetchall()
+        assert rows == [(1,), (2,)], rows
+        assert conn.execute("SELECT file_path FROM ProcessedFiles").fetchall() == [('A.csv',)]
+        assert (1, 3, 1, 'S1', 'L1', None) not in index
+        conn.close()
+
+def test_failed_commit_forgets_queued_keys():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, index = open_db(tmp)
+        pending_inserts = []
+        committer = GroupCommitter(conn, pending_inserts, index, max_files=10)
+        key = (1, 1, 1, 'S1', 'L1', None)
+
+        committer.begin_file()
+        queue_row(pending_inserts, index, key)
+        pending_inserts.append((('no_such_column',), (1,)))  # Makes the flush inside commit() fail
+        committer.end_file()
+        try:
+            committer.commit()
+        except sqlite3.OperationalError:
+            pass
+        else:
+            raise AssertionError("commit() should have failed")
+
+        assert conn.execute("SELECT COUNT(*) FROM Results").fetchone()[0] == 0
+        assert key not in index, "a key of a rolled-back row still counts as a duplicate"
+        conn.close()
+
+def test_chunked_abort_keeps_earlier_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, index = open_db(tmp)
+        pending_inserts = []
+        metrics = load_metrics.LoadMetrics()
+        committer = GroupCommitter(conn, pending_inserts, index, max_files=10, metrics=metrics)
+
+        committer.begin_file()
+        queue_row(pending_inserts, index, (1, 1, 1, 'S1', 'L1', None))
+        mark_file_processed(conn, 'A.csv', 'hash-a')
+        committer.end_file()  # A's row is still queued, not inserted
+
+        # Chunked file B: two batches, a flush after each, then the reader fails
+        batch_queue = queue.Queue()
+        for athlete_id in (2, 3):
+            batch_queue.put(('batch', {'keys': [(1, athlete_id, 1, 'S1', 'L1', None)]}))
+        batch_queue.put(('error', {'error': 'bad row', 'batches': 2, 'extract_seconds': 0.0}))
+        reader = Future()
+        reader.set_result(None)
+
+        def fake_write_to_db(conn, package, caches, club_aliases, existing_results, pending_inserts, metrics):
+            for key in package['keys']:
+                queue_row(pending_inserts, existing_results, key)
+            return len(package['keys'])
+
+        saved = load_orchestrator.write_to_db, load_orchestrator.BATCH_INSERT_SIZE
+        load_orchestrator.write_to_db, load_orchestrator.BATCH_INSERT_SIZE = fake_write_to_db, 1
+        try:
+            caches = {'person': {}, 'club': {}, 'athlete': {}}
+            write_chunked_file(conn, batch_queue, reader, 'livemeet', 'B.csv', 'hash-b', committer, caches, {},
+                               index, pending_inserts, metrics)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("the reader error should have been raised")
+        finally:
+            load_orchestrator.write_to_db, load_orchestrator.BATCH_INSERT_SIZE = saved
+        committer.commit()
+
+        assert conn.execute("SELECT athlete_id FROM Results").fetchall() == [(1,)]
+        assert conn.execute("SELECT file_path FROM ProcessedFiles").fetchall() == [('A.csv',)]
+        assert (1, 2, 1, 'S1', 'L1', None) not in index
+        conn.close()
+
+if __name__ == "__main__":
+    test_abort_after_flush_keeps_earlier_files()
+    test_failed_commit_forgets_queued_keys()
+    test_chunked_abort_keeps_earlier_files()
+    print("GroupCommitter keeps rows and ProcessedFiles marks together.")
@@ -0,0 +1,233 @@
+import os
+import re
+import glob
+import tempfile
+
+import pytest
+
+import synthetic_corpus
+import event_registry
+import extraction_library
+from extraction_library import extract_kscore_data
+from etl_functions import KSCORE_LEVEL_ALIASES
+from golden_compare import same_package
+
+# Golden test: the column-wise extract_kscore_data returns exactly the package the former
+# row-by-row implementation (kept below as the reference) returned, on generated meets,
+# hand-written edge cases and any real Kscore CSVs present in CSVs_kscore_final/.
+
+extraction_library.set_plan_cache_dir(None)  # Header plans stay in memory; nothing is written next to the repo
+
+def legacy_extract_kscore_data(filepath, meet_details, level_alias_map):
+    """Reference: extract_kscore_data before the column-wise rewrite (df.iterrows)."""
+    import pandas as pd
+    try:
+        df = pd.read_csv(filepath, keep_default_na=False, dtype=str)
+        if df.empty:
+            return None
+    except Exception as e:
+        print(f"Warning: Could not read CSV file '{filepath}'. Error: {e}")
+        return None
+
+    filename = os.path.basename(filepath)
+    full_source_id = filename.split('_FINAL_')[0]
+    source_meet_id = full_source_id.replace('kscore_', '', 1)
+
+    if not meet_details.get('name'):
+        meet_details['name'] = df['Raw_Meet_Name'].iloc[0] if 'Raw_Meet_Name' in df.columns else (df['Meet'].iloc[0] if 'Meet' in df.columns and not df.empty else f"Kscore {source_meet_id}")
+
+    if not meet_details.get('year'):
+        if 'Year' in df.columns and not df.empty:
+            meet_details['year'] = df['Year'].iloc[0]
+
+    discipline_id, discipline_name, gender_heuristic = event_registry.header_discipline(tuple(df.columns), kscore=True)
+
+    KEY_MAP = {'Gymnast': 'Name', 'Athlete': 'Name', 'Name': 'Name', 'Club': 'Club', 'Team': 'Club', 'Level': 'Level', 'Age': 'Age', 'Prov': 'Prov'}
+    col_map = {col: KEY_MAP.get(col, col) for col in df.columns}
+    name_col = next((c for c, v in col_map.items() if v == 'Name'), None)
+
+    if not name_col:
+        return None
+
+    result_columns = [col for col in df.columns if col.startswith('Result_')]
+    event_bases = {}
+    for col in result_columns:
+        match = re.search(r'Result_(.*)_(Score|D|Rnk)$', col)
+        if match:
+            event_bases[match.group(1)] = match.group(1)
+
+    ignore_cols = list(event_bases.keys()) + result_columns + [name_col]
+    if 'Club' in df.columns: ignore_cols.append('Club')
+
+    dynamic_cols = []
+    for col in df.columns:
+        if col not in ignore_cols and not col.startswith('Result_'):
+            dynamic_cols.append(col)
+
+    extracted_results = []
+    for _, row in df.iterrows():
+        raw_name = row.get(name_col)
+        if not raw_name: continue
+
+        raw_level = row.get('Level', '')
+        mapped_level = level_alias_map.get(raw_level, raw_level)
+
+        dynamic_values = {}
+        for col in dynamic_cols:
+            val = row.get(col)
+            if col == 'Level': val = mapped_level
+            if val: dynamic_values[col] = str(val)
+
+        apparatus_results = []
+        for raw_event in event_bases:
+            d_val = row.get(f'Result_{raw_event}_D')
+            score_val = row.get(f'Result_{raw_event}_Score')
+            rank_val = row.get(f'Result_{raw_event}_Rnk')
+            bonus_val = row.get(f'Result_{raw_event}_Bonus')
+            exec_bonus_val = row.get(f'Result_{raw_event}_Exec_Bonus') or row.get(f'Result_{raw_event}_Execution_Bonus')
+
+            if not score_val and not d_val: continue
+
+            def is_numeric(s):
+                try:
+                    float(str(s).strip().replace(',', ''))
+                    return True
+                except:
+                    return False
+
+            actual_score = score_val
+            actual_d = d_val
+            actual_rank = rank_val
+
+            scratch_markers = ['S', 'DNS', 'SCRATCH', 'SCR', 'WD', 'SC']
+            s_val_upper = str(score_val).strip().upper()
+            is_scratch = any(marker == s_val_upper for marker in scratch_markers) or s_val_upper.startswith('SCR')
+
+            if is_numeric(d_val) and not is_numeric(score_val) and not is_scratch:
+                actual_score = d_val
+                if not rank_val or str(rank_val).strip() == '':
+                    actual_rank = score_val
+            elif not is_numeric(score_val) and (score_val and str(score_val).strip() != ''):
+                if not rank_val or str(rank_val).strip() == '':
+                    actual_rank = score_val
+
+            apparatus_results.append({
+                'raw_event': raw_event,
+                'score_final': actual_score,
+                'score_d': actual_d,
+                'rank_text': actual_rank,
+                'bonus': bonus_val,
+                'execution_bonus': exec_bonus_val
+            })
+
+        extracted_results.append({
+            'raw_name': raw_name,
+            'raw_club': row.get('Club', ''),
+            'discipline_id': discipline_id,
+            'gender_heuristic': gender_heuristic,
+            'apparatus_results': apparatus_results,
+            'dynamic_metadata': dynamic_values
+        })
+
+    return {
+        'source': 'kscore',
+        'source_meet_id': source_meet_id,
+        'meet_details': meet_details,
+        'results': extracted_results
+    }
+
+# --- Hand-written edge cases (file name -> CSV text) ---
+EDGE_CASES = {
+    # Award text in Score with the numeric score in D, scratches, blank/odd cells
+    'kscore_900001_FINAL_1.csv': (
+        "Name,Club,Level,Age,Prov,Result_Vault_D,Result_Vault_Score,Result_Vault_Rnk,Result_Bars_D,Result_Bars_Score,Result_Bars_Rnk,Result_Bars_Bonus\n"
+        "Jane Doe,Club A,CCP 6,12,ON,8.5,Gold,,9.1,Silver,3,0.1\n"
+        "John Roe,Club B,L1,,BC,8.2,S,,2.0,DNS,, \n"
+        "Ann Poe,Club A,CCP 6,11,ON, ,  ,4,8.0,Scratched,,\n"
+        ",Club C,CCP 7,10,AB,9.0,9.0,1,9.0,9.0,1,\n"
+        "Bo Li,,Interclub, ,QC,1 234,WD, , ,Bronze,,\n"
+        "Cy Yu,Club D,CCP 6,13,MB,,,,,,,\n"
+        "Di Wu,Club D,L2,13,MB,nan,inf,2,abc,SC,,x\n"
+    ),
+    # Ragged rows (short rows read as NaN), Exec_Bonus vs Execution_Bonus, no D column for Floor
+    'kscore_900002_FINAL_1.csv': (
+        "Gymnast,Team,Level,Result_Floor_Score,Result_Floor_Rnk,Result_Floor_Exec_Bonus,Result_Floor_Execution_Bonus,Result_Beam_D,Result_Beam_Score\n"
+        "Eve Ng,Club E,CCP 8,12.5,1,,0.3,4.0,11.2\n"
+        "Fay Ko,Club E,CCP 8,Gold,,0.2,0.3\n"
+        "Gus Oh,Club F\n"
+        "Hal Ip,Club F,Level 9,,,,,5.0,Silver\n"
+    ),
+    # No Result_* columns at all
+    'kscore_900003_FINAL_1.csv': (
+        "Athlete,Club,Level,Year\n"
+        "Ida Mo,Club G,Xcel Gold,2024\n"
+        "Jo Te,,,\n"
+    ),
+    # Header only
+    'kscore_900004_FINAL_1.csv': "Name,Club,Result_Vault_Score\n",
+}
+
+def check_file(path, meet_details=None):
+    aliases = dict(KSCORE_LEVEL_ALIASES, **{'L1': 'Level 1', 'Interclub': 'IC'})
+    expected = legacy_extract_kscore_data(path, dict(meet_details or {}), aliases)
+    actual = extract_kscore_data(path, dict(meet_details or {}), aliases)
+    assert same_package(expected, actual), f"{path}: column-wise package differs from the row-by-row reference"
+    return len(expected['results']) if expected else 0
+
+def test_edge_cases():
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, text in EDGE_CASES.items():
+            path = os.path.join(tmp, name)
+            with open(path, 'w') as f:
+                f.write(text)
+            check_file(path)
+            check_file(path, {'name': 'Given Meet', 'year': 2023})
+
+def test_synthetic_corpus():
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed, mix in enumerate(synthetic_corpus.EVENT_MIXES):
+            root = os.path.join(tmp, mix)
+            written = synthetic_corpus.generate_corpus(root, meets=3, athletes_per_session=25, event_mix=mix,
+                                                       formats=('kscore',), non_numeric_rate=0.2, seed=seed)
+            for path in written['kscore']:
+                check_file(path)
+
+def test_chunked_batches():
+    # Batches of any size concatenate to the single package (meet details come from the first chunk)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name, text in EDGE_CASES.items():
+            paths.append(os.path.join(tmp, name))
+            with open(paths[-1], 'w') as f:
+                f.write(text)
+        paths += synthetic_corpus.generate_corpus(os.path.join(tmp, 'corpus'), meets=2, athletes_per_session=25,
+                                                  formats=('kscore',), non_numeric_rate=0.2, seed=7)['kscore']
+        for path in paths:
+            expected = extract_kscore_data(path, {}, KSCORE_LEVEL_ALIASES)
+            for chunk_rows in (1, 3, 10):
+                batches = list(extraction_library.iter_kscore_batches(path, {}, KSCORE_LEVEL_ALIASES, chunk_rows))
+                assert all(len(b['results']) <= chunk_rows for b in batches)
+                actual = dict(batches[0], results=[r for b in batches for r in b['results']]) if batches else None
+                assert same_package(expected, actual), f"{path}: {chunk_rows}-row batches differ from the single package"
+
+REAL_FILES_DIR = 'CSVs_kscore_final'  # Scraper output; not part of the repository
+
+def real_files(limit=200):
+    return sorted(glob.glob(os.path.join(REAL_FILES_DIR, '*_FINAL_*.csv')))[:limit]
+
+def test_real_files(limit=200):
+    paths = real_files(limit)
+    if not paths:
+        pytest.skip(f"no scraped Kscore CSVs in {REAL_FILES_DIR}/ to compare against")
+    for path in paths:
+        check_file(path)
+
+if __name__ == "__main__":
+    test_edge_cases()
+    test_synthetic_corpus()
+    test_chunked_batches()
+    if real_files():
+        test_real_files()
+    else:
+        print(f"Skipped real files: no scraped Kscore CSVs in {REAL_FILES_DIR}/")
+    print("extract_kscore_data matches the row-by-row reference on all files.")
@@ -0,0 +1,323 @@
+import os
+import re
+import tempfile
+
+import synthetic_corpus
+import event_registry
+import extraction_library
+from extraction_library import extract_livemeet_data
+from golden_compare import same_package
+
+# Golden test: the streaming extract_livemeet_data returns exactly the package the former
+# DictReader implementation (kept below as the reference) returned, on generated meets and
+# hand-written edge cases. The one intended difference, quoted commas in header cells, is
+# checked on its own in test_quoted_comma_header.
+
+extraction_library.set_plan_cache_dir(None)  # Header plans stay in memory; nothing is written next to the repo
+
+def legacy_extract_livemeet_data(filepath, meet_details):
+    """Reference: extract_livemeet_data before the streaming rewrite (readlines + csv.DictReader)."""
+    import csv
+    
+    try:
+        # We read the file twice: once to find the header row, then to parse
+        with open(filepath, 'r', encoding='utf-8-sig', errors='replace') as f:
+            lines = f.readlines()
+            
+        if not lines:
+            return None
+            
+        # Find header row index
+        header_idx = -1
+        for i, line in enumerate(lines[:10]):
+            parts = [p.strip() for p in line.split(',')]
+            if 'Name' in parts and 'Club' in parts:
+                header_idx = i
+                break
+        
+        if header_idx == -1:
+            # Fallback: assume first line is header if it has 'Name' or '@' (some Sportzsoft)
+            header_idx = 0
+            
+        headers = [p.strip() for p in lines[header_idx].split(',')]
+        
+        # Deduplicate headers if Sportzsoft triplet logic is not yet applied
+        seen_cols = {}
+        seen_counts = {}
+        deduped_headers = []
+        is_normalized = any(h.startswith('Result_') for h in headers)
+        
+        if is_normalized:
+            deduped_headers = headers
+        else:
+            for col in headers:
+                base = col.split('.')[0]
+                if base in event_registry.LIVEMEET_EVENT_HEADERS:
+                    count = seen_counts.get(base, 0)
+                    seen_counts[base] = count + 1
+                    triplet_pos = count % 3
+                    triplet_num = count // 3
+                    suffix = ['D', 'Score', 'Rnk'][triplet_pos]
+                    proposed_name = f"Result_{base}_{suffix}" if triplet_num == 0 else f"EXTRA_{base}_{triplet_num}_{suffix}"
+                    deduped_headers.append(proposed_name)
+                else:
+                    deduped_headers.append(col)
+
+        # Parse data rows
+        import io
+        content = "".join(lines[header_idx:])
+        
+        filename = os.path.basename(filepath)
+        source_meet_id = filename.split('_FINAL_')[0]
+        if '_PEREVENT_' in source_meet_id: source_meet_id = source_meet_id.split('_PEREVENT_')[0]
+        if '_BYEVENT_' in source_meet_id: source_meet_id = source_meet_id.split('_BYEVENT_')[0]
+
+        # Fetch basic meet info
+        if not meet_details.get('name'):
+            # Try to get from first data row 'Meet' column
+            pass 
+
+        # Event identification
+        result_columns = [h for h in deduped_headers if h.startswith('Result_')]
+        event_bases = {}
+        for col in result_columns:
+            match = re.search(r'Result_(.*)_(Score|D|E|Rnk|Total)$', col)
+            if match: 
+                base_name = match.group(1)
+                # EXPLICITLY IGNORE PHYSICAL PREPARATION
+                if 'physical' in base_name.lower():
+                    continue
+                event_bases[base_name] = base_name
+
+        # Discipline Detection
+        mag_score, wag_score = event_registry.indicator_counts(tuple(deduped_headers))
+        
+        discipline_id = 2 if mag_score >= wag_score and mag_score > 0 else 1
+        gender_heuristic = 'M' if discipline_id == 2 else 'F'
+
+        ignore_cols = list(event_bases.keys()) + result_columns + ['Name', 'Club']
+        dynamic_cols = [h for h in deduped_headers if h not in ignore_cols and not h.startswith('Result_')]
+
+        extracted_results = []
+        
+        f_stream = io.StringIO(content)
+        reader = csv.DictReader(f_stream)
+        
+        for row in reader:
+            raw_name = row.get('Name')
+            if not raw_name: continue
+            
+            # Basic normalization for meet name if missing
+            if not meet_details.get('name') and row.get('Meet'):
+                meet_details['name'] = row.get('Meet')
+
+            dynamic_values = {}
+            session_markers = ['Day', 'Session', 'Flight', 'Combined', 'Finals', 'Apparatus Final']
+            for col in dynamic_cols:
+                val = row.get(col)
+                if not val or str(val).strip() == '': continue
+                safe_key = str(col).strip()
+                if "unnamed" in safe_key.lower(): continue
+                if len(safe_key) > 60: continue # Some are long but we need them
+                
+                # Heuristic: if column header looks like a session and we don't have one yet
+                if any(m.lower() in safe_key.lower() for m in session_markers):
+                    if 'session' not in dynamic_values:
+                        dynamic_values['session'] = str(val).strip()
+                
+                if safe_key.count(' ') > 4 and safe_key not in dynamic_values.get('session', ''): continue
+                dynamic_values[safe_key] = str(val).strip()
+
+            apparatus_results = []
+            for raw_event in event_bases:
+                # Prioritize 'Total' column over 'Score' column if it exists. 
+                # This is crucial for multi-day 'Combined' DETAILED files where 'Score' is often Day 1.
+                score_val = row.get(f'Result_{raw_event}_Total') or row.get(f'Result_{raw_event}_Score')
+                d_val = row.get(f'Result_{raw_event}_D')
+                sv_val = row.get(f'Result_{raw_event}_SV')
+                e_val = row.get(f'Result_{raw_event}_E')
+                bonus_val = row.get(f'Result_{raw_event}_Bonus')
+                penalty_val = row.get(f'Result_{raw_event}_Penalty')
+                rank_val = row.get(f'Result_{raw_event}_Rnk')
+                exec_bonus_val = row.get(f'Result_{raw_event}_Exec_Bonus') or row.get(f'Result_{raw_event}_Execution_Bonus')
+                
+                if (not score_val or str(score_val).strip() == '') and \
+                   (not d_val or str(d_val).strip() == '') and \
+                   (not sv_val or str(sv_val).strip() == ''):
+                    continue
+                
+                # Fallback: SV is often used for Difficulty
+                if (not d_val or str(d_val).strip() == '') and (sv_val and str(sv_val).strip() != ''):
+                    d_val = sv_val
+
+                app_res = {
+                    'raw_event': raw_event,
+                    'score_final': score_val,
+                    'score_d': d_val,
+                    'score_sv': sv_val,
+                    'score_e': e_val,
+                    'bonus': bonus_val,
+                    'penalty': penalty_val,
+                    'rank_text': rank_val,
+                    'execution_bonus': exec_bonus_val
+                }
+                
+                # Score Swap Logic (For Level 1/Awards)
+                def is_numeric(s):
+                    try:
+                        if not s: return False
+                        float(str(s).strip().replace(',', ''))
+                        return True
+                    except: return False
+                
+                # Define scratch markers
+                scratch_markers = ['S', 'DNS', 'SCRATCH', 'SCR', 'WD', 'SC']
+                s_val_upper = str(app_res['score_final']).strip().upper()
+                is_scratch = any(marker == s_val_upper for marker in scratch_markers) or s_val_upper.startswith('SCR')
+
+                if is_numeric(app_res['score_d']) and not is_numeric(app_res['score_final']) and not is_scratch:
+                    app_res['score_final'] = app_res['score_d']
+                
+                apparatus_results.append(app_res)
+
+            extracted_results.append({
+                'raw_name': raw_name,
+                'raw_club': row.get('Club', ''),
+                'discipline_id': discipline_id,
+                'gender_heuristic': gender_heuristic,
+                'apparatus_results': apparatus_results,
+                'dynamic_metadata': dynamic_values
+            })
+
+            # AA Enrichement
+            aa_record = next((r for r in apparatus_results if r['raw_event'] in event_registry.AA_EVENT_TOKENS), None)
+            valid_sum = 0.0; valid_d_sum = 0.0; valid_app_count = 0
+            
+            for res in apparatus_results:
+                if res['raw_event'] in event_registry.AA_EVENT_TOKENS or res['raw_event'] == 'Team': continue
+                try:
+                    s = float(str(res['score_final']).replace(',', ''))
+                    valid_sum += s; valid_app_count += 1
+                except: pass
+                try:
+                    d = float(str(res['score_d']).replace(',', ''))
+                    valid_d_sum += d
+                except: pass
+            
+            if not aa_record:
+                if valid_app_count > 0:
+                    apparatus_results.append({
+                        'raw_event': 'All Around',
+                        'score_final': f"{valid_sum:.3f}", 
+                        'score_d': f"{valid_d_sum:.3f}" if valid_d_sum > 0 else '',
+                        'calculated': True
+                    })
+            else:
+                if (not aa_record.get('score_d') or str(aa_record['score_d']).strip() == '') and valid_d_sum > 0:
+                    aa_record['score_d'] = f"{valid_d_sum:.3f}"
+                    aa_record['calculated_d'] = True
+
+        return {
+            'source': 'livemeet',
+            'source_meet_id': source_meet_id,
+            'meet_details': meet_details,
+            'results': extracted_results
+        }
+    except Exception as e:
+        print(f"Error in extract_livemeet_data: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+    return {
+        'source': 'livemeet',
+        'source_meet_id': source_meet_id,
+        'meet_details': meet_details,
+        'results': extracted_results
+    }
+
+
+EDGE_CASES = {
+    # Header below a preamble, quoted commas in data cells, session/unnamed/long dynamic columns,
+    # SV standing in for D, award text in Score, blank line, short and long (ragged) rows
+    '900001_FINAL_1.csv': (
+        "Meet info line,,\n"
+        ",,\n"
+        "Name,Club,Level,Session Day 1,Unnamed: 9,Result_Vault_D,Result_Vault_SV,Result_Vault_Score,Result_Vault_Total,"
+        "Result_Vault_Rnk,Result_Vault_Exec_Bonus,Result_Vault_Execution_Bonus,Result_AllAround_Score,Result_Physical_Prep_Score,"
+        "Result_Bars_E,Result_Bars_Penalty,Result_Bars_Bonus,A very long column name with many spaces in it\n"
+        "Jane,\"Club, A\",L1,Sat,x,,4.0,Gold,,,,0.2,,5,8.1,0.1,0.3,foo\n"
+        "Joe,B,L2,,,3.1,,S,,,0.1,,, ,,,\n"
+        "\n"
+        "Ann,C\n"
+        ",D,L3\n"
+        "Bo,E,L4,Sun,,2.0,,9.1,18.2,1,,,27.3,,7.0,,,bar,extra,extra\n"
+    ),
+    # Duplicate Result_ header (last one wins) and a short row
+    '900002_PEREVENT_2.csv': "Name,Club,Result_Floor_D,Result_Floor_Score,Result_Floor_D\n Zed ,Q,1,2,3\nYo,W,1\n",
+    # Sportzsoft triplet headers (D, Score, Rnk per event; a repeated triplet becomes EXTRA_)
+    '900003_BYEVENT_1.csv': (
+        "Name,Club,Vault,Vault,Vault,Bars,Bars,Bars,Vault,Vault,Vault,Floor.1,Floor.2\n"
+        "A,B,1,9,1,2,8,2,3,7,3,4,9.5\n"
+        "C,\"D, E\",,Gold,2,1.5,S,,,,\n"
+    ),
+    # No Name/Club header: the first line is taken as the header
+    '900004_FINAL_x.csv': "Gymnast,Team,Result_Vault_Score\nA,B,9\n",
+    'empty_FINAL_1.csv': "",
+    'header_only_FINAL_1.csv': "Name,Club,Result_Vault_Score\n",
+    # Padded header names (the padded cells never match), Meet column, a thousands comma splitting a row
+    '900005_FINAL_1.csv': "Name , Club,Meet,Result_Vault_Score\nA,B,My Meet,9.5\nC,D,Other,1,000.5\n",
+    # BOM, session-like columns, non-numeric scores and scratches
+    '900006_FINAL_1.csv': "\ufeffName,Club,Flight,Combined Total,Result_Vault_D,Result_Vault_Score\nA,B,F1,T,4.5,nan\nC,D,F2,,abc,SCR x\n",
+    # Quoted header names without commas, and a quoted line break before the header row
+    '900008_FINAL_1.csv': "\"Name\",\"Club\",Level,Result_Vault_Score\nA,B,L1,9.1\n",
+    '900009_FINAL_1.csv': "x,\"a\nb\"\nName,Club,Result_Vault_Score\nA,B,9\n",
+}
+
+def check_file(path, meet_details=None):
+    expected = legacy_extract_livemeet_data(path, dict(meet_details or {}))
+    actual = extract_livemeet_data(path, dict(meet_details or {}))
+    assert same_package(expected, actual), f"{path}: streaming package differs from the DictReader reference"
+
+def write_files(tmp, files):
+    paths = []
+    for name, text in files.items():
+        paths.append(os.path.join(tmp, name))
+        with open(paths[-1], 'w', encoding='utf-8') as f:
+            f.write(text)
+    return paths
+
+def test_edge_cases():
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in write_files(tmp, EDGE_CASES):
+            check_file(path)
+            check_file(path, {'name': 'Given Meet'})
+
+def test_synthetic_corpus():
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed, mix in enumerate(synthetic_corpus.EVENT_MIXES):
+            root = os.path.join(tmp, mix)
+            written = synthetic_corpus.generate_corpus(root, meets=3, athletes_per_session=25, event_mix=mix,
+                                                       formats=('livemeet',), non_numeric_rate=0.2, seed=seed)
+            for path in written['livemeet']:
+                check_file(path)
+
+def test_quoted_comma_header():
+    # The DictReader reference named columns by a plain split of the header line, so a quoted
+    # comma in a header cell shifted the names against the cells and the column was dropped
+    files = {
+        'q1_FINAL_1.csv': (
+            "\"Results, 2024\",x\n"
+            "Name,Club,\"Level, Age\",Vault,Vault,Vault\n"
+            "Ann,\"Club, A\",\"L1, 12\",4.0,9.1,1\n"
+        ),
+        'q2_FINAL_1.csv': "\"Gymnast, Name\",Name,Club,Level,Result_Vault_Score\nx,Bo,C,L2,8.5\n",
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = write_files(tmp, files)
+        (row,) = extract_livemeet_data(first, {})['results']
+        assert (row['raw_name'], row['raw_club']) == ('Ann', 'Club, A')
+        assert row['dynamic_metadata'] == {'Level, Age': 'L1, 12'}
+        (row,) = extract_livemeet_data(second, {})['results']
+        assert row['dynamic_metadata'] == {'Gymnast, Name': 'x', 'Level': 'L2'}
+        assert [(r['raw_event'], r['score_final']) for r in row['apparatus_results']] == [('Vault', '8.5'), ('All Around', '8.500')]
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+
+import etl_functions
+from etl_functions import PersonResolver, setup_database
+
+# PersonResolver resolves from an index loaded once per run; rows other writers add in the
+# meantime are neither claimed as new nor self-aliased.
+
+def open_db(tmp):
+    db_path = os.path.join(tmp, 'persons.db')
+    setup_database(db_path)
+    return db_path, sqlite3.connect(db_path)
+
+def test_other_writers_rows_are_not_claimed():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, conn = open_db(tmp)
+        conn.execute("INSERT INTO Persons (full_name, gender) VALUES ('Known Person', 'F')")
+        conn.commit()
+        resolver = PersonResolver(conn)
+
+        other = sqlite3.connect(db_path)
+        other.executemany("INSERT INTO Persons (full_name, gender) VALUES (?, 'M')", [('Other One',), ('Other Two',)])
+        other.commit()
+        other.close()
+
+        person_ids = resolver.resolve(conn, {'Known Person': 'F', 'New Person': 'F', 'Other One': 'M'})
+        conn.commit()
+
+        persons = dict(conn.execute("SELECT full_name, person_id FROM Persons"))
+        assert person_ids == {name: persons[name] for name in ('Known Person', 'New Person', 'Other One')}
+        assert resolver.stats == {'hits': 0, 'misses': 3, 'new': 1}
+        aliases = {name for (name,) in conn.execute("SELECT alias_name FROM PersonAliases")}
+        assert 'Other Two' not in aliases, "a row another writer inserted was self-aliased"
+        assert resolver.resolve(conn, {'New Person': 'F'}) == {'New Person': persons['New Person']}
+        assert resolver.stats['hits'] == 1
+        conn.close()
+
+def test_index_merges_and_separates_equal_hashes():
+    def weak_hashes(names):
+        # Every name shares the first half: lookups must fall back to the check half
+        checks = np.array([sum(str(n).encode()) for n in names], dtype=np.uint64)
+        return np.zeros(len(names), dtype=np.uint64), checks
+
+    saved = etl_functions._name_hashes, etl_functions.NAME_INDEX_MERGE_THRESHOLD
+    etl_functions._name_hashes, etl_functions.NAME_INDEX_MERGE_THRESHOLD = weak_hashes, 3
+    try:
+        rows = sqlite3.connect(':memory:').execute("SELECT 'ab', 1 UNION ALL SELECT 'cd', 2")
+        index = etl_functions._NameIdIndex.load(rows)
+        for i, name in enumerate(('ef', 'gh', 'ij', 'kl'), start=3):
+            index.add(name, i)
+        assert len(index.recent) == 1 and len(index) == 6
+        assert index.get_many(['ab', 'cd', 'ef', 'gh', 'ij', 'kl', 'zz']) == {'ab': 1, 'cd': 2, 'ef': 3, 'gh': 4, 'ij': 5, 'kl': 6}
+    finally:
+        etl_functions._name_hashes, etl_functions.NAME_INDEX_MERGE_THRESHOLD = saved
+
+if __name__ == "__main__":
+    test_other_writers_rows_are_not_claimed()
+    test_index_merges_and_separates_equal_hashes()
+    print("PersonResolver resolves from its run index and claims only its own rows.")